@@ -1,23 +1,100 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, AsyncIterator, Literal, Optional, Tuple, Union
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from pydantic import BaseModel
-from typing import List, Dict, Any
 
-from models.growth import forecast_growth
-from models.jobs import predict_jobs
+from models import telemetry
+from models.dashboard import run_dashboard
+from models.economy import STORE
+from models.execution import EXECUTOR, Overloaded
+from models.growth import forecast_growth, shutdown_pool
+from models.jobs import project_jobs
+from models.scenarios import ScenarioSpec, simulate_jobs
 from models.sentiment import analyze_sentiment
 
-app = FastAPI(title="Zero-Gravity ML Service", version="0.1.0")
+
+# Largest Monte Carlo sample count accepted by /jobs/scenarios
+_MAX_SCENARIO_SAMPLES = int(os.getenv("SCENARIO_MAX_SAMPLES", "20000"))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # warm start from util/train.py output; stale or missing artifacts fit online
+    app.state.warmup = asyncio.create_task(EXECUTOR.warmup()) if EXECUTOR.warm else None
+    yield
+    if app.state.warmup is not None:
+        app.state.warmup.cancel()
+    EXECUTOR.shutdown()
+    shutdown_pool()
+
+
+app = FastAPI(title="Zero-Gravity ML Service", version="0.1.0", lifespan=lifespan)
+
+
+# Per-request stage breakdown is opt-in: send `X-Server-Timing: 1`
+TIMING_HEADER = "x-server-timing"
+
+
+@app.middleware("http")
+async def timing(request: Request, call_next: Any) -> Response:
+    started = time.perf_counter()
+    with telemetry.request_spans() as spans:
+        response = await call_next(request)
+    elapsed = time.perf_counter() - started
+    # route templates, not raw paths, keep the label set bounded
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    telemetry.REQUESTS.observe(f"{request.method} {route}", elapsed)
+    if request.headers.get(TIMING_HEADER):
+        response.headers["Server-Timing"] = telemetry.server_timing(spans, elapsed)
+    return response
+
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded) -> JSONResponse:
+    return JSONResponse(
+        {"detail": "Model workers are busy, retry later"},
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
 class GrowthRequest(BaseModel):
     industry_ids: List[str]
     horizon_years: int = 7
+    # None uses GROWTH_TIER (default "full")
+    tier: Optional[Literal["full", "fast"]] = None
+
+
+# Opt-in /jobs response shapes; the default "records" JSON is unchanged
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+COLUMNAR_JSON = "application/vnd.zero-gravity.columnar+json"
+JobsFormat = Literal["records", "columnar", "arrow"]
 
 
 class JobsRequest(BaseModel):
     industry_ids: List[str]
     horizon_years: int = 7
     productivity_growth: float = 0.02
+    format: Optional[JobsFormat] = None
+
+
+class ScenarioRequest(BaseModel):
+    industry_ids: List[str]
+    horizon_years: int = 7
+    samples: int = 2000
+    seed: int = 0
+    # normal distributions around the /jobs defaults; sd 0 pins a parameter
+    productivity_growth: float = 0.02
+    productivity_sd: float = 0.01
+    ratio_sd: float = 0.03
+    indirect_sd: float = 0.05
+    induced_sd: float = 0.05
+    quantiles: List[float] = [0.05, 0.5, 0.95]
 
 
 class SentimentRequest(BaseModel):
@@ -26,23 +103,180 @@ class SentimentRequest(BaseModel):
     lag_max: int = 8
 
 
+class BatchRequest(BaseModel):
+    growth: Optional[GrowthRequest] = None
+    jobs: Optional[JobsRequest] = None
+    sentiment: Optional[SentimentRequest] = None
+
+
 @app.get("/health")
 def health() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/ready", response_model=None)
+def ready(request: Request) -> Union[Dict[str, Any], JSONResponse]:
+    task = getattr(request.app.state, "warmup", None)
+    if task is not None and not task.done():
+        return JSONResponse({"status": "warming"}, status_code=503)
+    workers: Any = None
+    if task is not None and not task.cancelled():
+        # a failed warmup is not fatal: backends still load on first use
+        workers = repr(task.exception()) if task.exception() else task.result()
+    # backends as loaded in the processes that serve compute, not this one
+    return {"status": "ready", "backends": _per_process("backends"), "workers": workers}
+
+
+def _per_process(section: str) -> Dict[str, Any]:
+    """``section`` of the process state: this process in-process, else one entry per pool worker."""
+    snapshots = EXECUTOR.snapshots()
+    if EXECUTOR.workers == 0:
+        return snapshots[0][section]
+    return {"workers": [{"pid": s["pid"], **s[section]} for s in snapshots]}
+
+
+@app.get("/admin/economy")
+def economy_stats() -> Dict[str, Any]:
+    return _per_process("economy")
+
+
+@app.get("/admin/cache")
+def forecast_cache_stats() -> Dict[str, Any]:
+    return _per_process("cache")
+
+
+@app.get("/admin/compute")
+def compute_stats() -> Dict[str, Any]:
+    return EXECUTOR.stats()
+
+
+def _hit_ratio(caches: List[Dict[str, Any]]) -> float:
+    hits = sum(c["hits"] for c in caches)
+    lookups = hits + sum(c["misses"] for c in caches)
+    return hits / lookups if lookups else 0.0
+
+
+def _counters() -> List[Tuple[str, str, Dict[str, str], float]]:
+    compute = EXECUTOR.stats()
+    return [
+        ("zg_compute_coalesced_total", "Requests served by joining an identical in-flight computation.", {}, compute["coalesced"]),
+        ("zg_compute_rejected_total", "Requests rejected with 429 since start.", {}, compute["rejected"]),
+    ]
+
+
+def _gauges() -> List[Tuple[str, str, Dict[str, str], float]]:
+    # summed over the compute workers (or this process when in-process)
+    snapshots = EXECUTOR.snapshots()
+    models = [s["cache"]["models"] for s in snapshots]
+    forecasts = [s["cache"]["forecasts"] for s in snapshots]
+    scores = [s["cache"]["sentiment"]["scoreCache"] for s in snapshots]
+    score_hits = sum(c["memory"]["hits"] + c["diskHits"] for c in scores)
+    score_lookups = score_hits + sum(c["misses"] for c in scores)
+    compute = EXECUTOR.stats()
+    # the oldest dataset any process is still serving
+    economy = min((s["economy"] for s in snapshots), key=lambda e: e["version"], default=None)
+    ratio = "zg_cache_hit_ratio", "Cache hit ratio across the compute processes."
+    entries = "zg_cache_entries", "Entries held by each in-memory cache, summed across the compute processes."
+    gauges = [
+        (*ratio, {"cache": "growth_models"}, _hit_ratio(models)),
+        (*ratio, {"cache": "growth_forecasts"}, _hit_ratio(forecasts)),
+        (*ratio, {"cache": "sentiment_scores"}, score_hits / score_lookups if score_lookups else 0.0),
+        (*entries, {"cache": "growth_models"}, sum(c["size"] for c in models)),
+        (*entries, {"cache": "growth_forecasts"}, sum(c["size"] for c in forecasts)),
+        (*entries, {"cache": "sentiment_scores"}, sum(c["memory"]["size"] for c in scores)),
+        ("zg_compute_workers", "Compute pool size (0 = in-process).", {}, compute["workers"]),
+        ("zg_compute_reporting", "Compute processes included in the cache and economy gauges.", {}, len(snapshots)),
+        ("zg_compute_active", "Admitted computations, running or queued.", {}, compute["active"]),
+        ("zg_compute_queue_depth", "Admitted computations waiting for a worker.", {}, compute["queued"]),
+    ]
+    if economy is not None:
+        gauges += [
+            ("zg_economy_version", "Dataset reload counter (lowest across the compute processes).", {}, economy["version"]),
+            ("zg_economy_rows", "Rows in the loaded economy dataset.", {}, economy["rows"]),
+        ]
+    return gauges
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(telemetry.exposition(_gauges(), _counters()), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/admin/reload")
+def economy_reload() -> Dict[str, Any]:
+    if EXECUTOR.workers == 0:
+        return STORE.reload()
+    # only the workers hold the dataset; fresh ones load it on first use
+    EXECUTOR.recycle()
+    return {"recycled": True, "workers": EXECUTOR.workers}
+
+
 @app.post("/forecast/growth")
-def growth(req: GrowthRequest) -> Dict[str, Any]:
-    return forecast_growth(req.industry_ids, req.horizon_years)
+async def growth(req: GrowthRequest) -> Dict[str, Any]:
+    key = ("growth", tuple(req.industry_ids), req.horizon_years, req.tier)
+    return await EXECUTOR.run(key, forecast_growth, req.industry_ids, req.horizon_years, None, req.tier)
+
+
+def _jobs_format(req: JobsRequest, accept: str) -> str:
+    if req.format:
+        return req.format
+    if ARROW_STREAM in accept:
+        return "arrow"
+    if COLUMNAR_JSON in accept:
+        return "columnar"
+    return "records"
+
+
+@app.post("/jobs", response_model=None)
+async def jobs(req: JobsRequest, request: Request) -> Union[Dict[str, Any], Response]:
+    """Jobs projection as records (default), columnar JSON or Arrow.
+
+    The Arrow body is two IPC streams back to back, ``items`` then ``geo``
+    (named in each schema's ``table`` metadata): a client must call
+    ``pyarrow.ipc.open_stream`` twice on the same reader, since a single
+    ``read_all()`` only returns ``items``.
+    """
+    # the response format is applied afterwards, so every format shares one computation
+    key = ("jobs", tuple(req.industry_ids), req.horizon_years, req.productivity_growth)
+    projection = await EXECUTOR.run(
+        key, project_jobs, req.industry_ids, req.horizon_years, req.productivity_growth
+    )
+    fmt = _jobs_format(req, request.headers.get("accept", ""))
+    with telemetry.span("jobs.serialize"):
+        if fmt == "columnar":
+            return JSONResponse(projection.to_columnar())
+        if fmt == "arrow":
+            try:
+                body = projection.to_arrow()
+            except ImportError:
+                raise HTTPException(status_code=406, detail="Arrow output requires pyarrow")
+            return Response(content=body, media_type=ARROW_STREAM)
+        return Response(content=projection.to_json(), media_type="application/json")
 
 
-@app.post("/jobs")
-def jobs(req: JobsRequest) -> Dict[str, Any]:
-    return predict_jobs(req.industry_ids, req.horizon_years, req.productivity_growth)
+@app.post("/jobs/scenarios")
+async def jobs_scenarios(req: ScenarioRequest) -> Dict[str, Any]:
+    if not 1 <= req.samples <= _MAX_SCENARIO_SAMPLES:
+        raise HTTPException(status_code=422, detail=f"samples must be between 1 and {_MAX_SCENARIO_SAMPLES}")
+    if not req.quantiles or any(not 0.0 <= q <= 1.0 for q in req.quantiles):
+        raise HTTPException(status_code=422, detail="quantiles must be within [0, 1]")
+    if min(req.productivity_sd, req.ratio_sd, req.indirect_sd, req.induced_sd) < 0:
+        raise HTTPException(status_code=422, detail="standard deviations must be non-negative")
+    spec = ScenarioSpec(**req.model_dump(exclude={"industry_ids", "horizon_years", "quantiles"}),
+                        quantiles=tuple(req.quantiles))
+    key = ("scenarios", tuple(req.industry_ids), req.horizon_years, spec)
+    return await EXECUTOR.run(key, simulate_jobs, req.industry_ids, req.horizon_years, spec)
 
 
 @app.post("/sentiment")
-def sentiment(req: SentimentRequest) -> Dict[str, Any]:
-    return analyze_sentiment(req.industry_ids, req.window, req.lag_max)
+async def sentiment(req: SentimentRequest) -> Dict[str, Any]:
+    key = ("sentiment", tuple(req.industry_ids), req.window, req.lag_max)
+    return await EXECUTOR.run(key, analyze_sentiment, req.industry_ids, req.window, req.lag_max)
 
 
+@app.post("/batch")
+async def batch(req: BatchRequest) -> Dict[str, Any]:
+    if req.jobs is not None and req.jobs.format == "arrow":
+        raise HTTPException(status_code=422, detail="Arrow output is only available from /jobs")
+    sections = [None if part is None else part.model_dump() for part in (req.growth, req.jobs, req.sentiment)]
+    return await EXECUTOR.run(("batch", req.model_dump_json()), run_dashboard, *sections)
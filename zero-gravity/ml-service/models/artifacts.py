@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+from importlib.metadata import PackageNotFoundError, version as package_version
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from models.cache import MISSING
+from models.economy import DATA_DIR
+
+ARTIFACT_DIR = Path(os.getenv("MODEL_ARTIFACT_DIR", str(DATA_DIR / "models")))
+LATEST = "LATEST"
+MANIFEST = "manifest.json"
+SCHEMA_VERSION = 1
+
+
+def _sklearn_version() -> Optional[str]:
+    # read from package metadata so checking a manifest does not import sklearn
+    try:
+        return package_version("scikit-learn")
+    except PackageNotFoundError:
+        return None
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_artifacts(
+    models: Dict[Tuple[str, str], Any],
+    series_digests: Dict[str, str],
+    data_digest: str,
+    root: Path = ARTIFACT_DIR,
+) -> Path:
+    """Persist fitted models under ``root/<data digest>/`` and point LATEST at it.
+
+    ``models`` maps (industry key, model kind) to the fitted estimator and
+    ``series_digests`` maps each industry key to the hash of the series it
+    was fitted on.
+    """
+    import joblib
+
+    version = data_digest[:16]
+    out_dir = root / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+    industries: Dict[str, Dict[str, Any]] = {}
+    for (key, kind), model in sorted(models.items()):
+        # the series digest covers the industry key, so names are unique
+        fname = f"{kind}__{series_digests[key][:16]}.joblib"
+        joblib.dump(model, out_dir / fname)
+        entry = industries.setdefault(key, {"seriesDigest": series_digests[key], "files": {}})
+        entry["files"][kind] = fname
+    manifest = {
+        "schemaVersion": SCHEMA_VERSION,
+        "version": version,
+        "dataDigest": data_digest,
+        "createdAt": time.time(),
+        "sklearnVersion": _sklearn_version(),
+        "industries": industries,
+    }
+    _atomic_write(out_dir / MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+    _atomic_write(root / LATEST, version)
+    return out_dir
+
+
+class ArtifactRegistry:
+    """Read side of the artifact directory written by ``util/train.py``.
+
+    The manifest is re-read when LATEST changes. An artifact is only handed
+    out when the caller's series digest matches the one it was trained on,
+    so stale industries transparently fall back to online fitting.
+    """
+
+    def __init__(self, root: Path = ARTIFACT_DIR) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._manifest: Optional[Dict[str, Any]] = None
+        self.loads = 0
+        self.stale = 0
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        latest = self.root / LATEST
+        try:
+            st = latest.stat()
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self._manifest = None
+                try:
+                    version = latest.read_text(encoding="utf-8").strip()
+                    with open(self.root / version / MANIFEST, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    # pickled estimators are only safe to load into the same sklearn
+                    if (
+                        manifest.get("schemaVersion") == SCHEMA_VERSION
+                        and manifest.get("sklearnVersion") == _sklearn_version()
+                    ):
+                        self._manifest = manifest
+                except (OSError, ValueError):
+                    pass
+            return self._manifest
+
+    def load(self, key: str, kind: str, series_digest: str) -> Any:
+        """Fitted model for (key, kind), or ``MISSING`` if absent or stale."""
+        manifest = self.manifest()
+        if manifest is None:
+            return MISSING
+        entry = manifest["industries"].get(key)
+        if entry is None or kind not in entry["files"]:
+            return MISSING
+        if entry["seriesDigest"] != series_digest:
+            self.stale += 1
+            return MISSING
+        try:
+            import joblib
+
+            model = joblib.load(self.root / manifest["version"] / entry["files"][kind], mmap_mode="r")
+        except Exception:
+            return MISSING
+        self.loads += 1
+        return model
+
+    def stats(self) -> Dict[str, Any]:
+        manifest = self.manifest()
+        return {
+            "root": str(self.root),
+            "version": None if manifest is None else manifest["version"],
+            "dataDigest": None if manifest is None else manifest["dataDigest"],
+            "loads": self.loads,
+            "stale": self.stale,
+        }
+
+
+ARTIFACTS = ArtifactRegistry()
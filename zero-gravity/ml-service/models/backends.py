@@ -0,0 +1,101 @@
+import importlib
+import importlib.util
+import os
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+
+def _flag(name: str) -> bool:
+    return bool(os.getenv(name, ""))
+
+
+class Backend:
+    """A heavy optional dependency imported on first use.
+
+    ``available`` only consults the import system's finders, so checking
+    whether a backend could be used costs nothing until it is needed.
+    """
+
+    def __init__(self, name: str, module: str, enabled: bool = True) -> None:
+        self.name = name
+        self.module = module
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._module: Optional[ModuleType] = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+
+    def available(self) -> bool:
+        if not self.enabled or self.error is not None:
+            return False
+        if self._module is not None:
+            return True
+        try:
+            return importlib.util.find_spec(self.module.split(".", 1)[0]) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def load(self) -> ModuleType:
+        """The imported module; raises ImportError if it cannot be loaded."""
+        if self._module is not None:
+            return self._module
+        with self._lock:
+            if self._module is None:
+                if self.error is not None:
+                    raise ImportError(self.error)
+                started = time.perf_counter()
+                try:
+                    self._module = importlib.import_module(self.module)
+                except Exception as exc:
+                    # remembered so a broken install is not retried on every request
+                    self.error = f"{type(exc).__name__}: {exc}"
+                    raise ImportError(self.error) from exc
+                self.load_seconds = time.perf_counter() - started
+            return self._module
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "module": self.module,
+            "enabled": self.enabled,
+            "loaded": self._module is not None,
+            "loadSeconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+BACKENDS: Dict[str, Backend] = {
+    b.name: b
+    for b in (
+        Backend("sklearn", "sklearn.ensemble"),
+        Backend("prophet", "prophet", enabled=_flag("ENABLE_PROPHET")),
+        Backend("statsmodels", "statsmodels.tsa.arima.model", enabled=_flag("ENABLE_ARIMA")),
+        Backend("transformers", "transformers", enabled=_flag("ENABLE_HF")),
+        Backend("torch", "torch", enabled=_flag("ENABLE_HF")),
+    )
+}
+
+
+def backend(name: str) -> ModuleType:
+    return BACKENDS[name].load()
+
+
+def available(name: str) -> bool:
+    return BACKENDS[name].available()
+
+
+def warmup(names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Import every enabled (or every named) backend now; failures are recorded, not raised."""
+    for name in names or list(BACKENDS):
+        b = BACKENDS[name]
+        if b.available():
+            try:
+                b.load()
+            except ImportError:
+                pass
+    return stats()
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {name: b.stats() for name, b in BACKENDS.items()}
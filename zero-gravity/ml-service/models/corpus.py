@@ -0,0 +1,342 @@
+import csv
+import io
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from models.backends import available
+from models.sentiment_engine import ENGINE
+from models.telemetry import span
+
+# A .jsonl/.csv file or a directory of them; empty keeps the template texts
+_CORPUS_PATH = os.getenv("SENTIMENT_CORPUS", "")
+# Documents handed to the scorer at a time
+_BATCH_SIZE = int(os.getenv("SENTIMENT_CORPUS_BATCH", "256"))
+
+_INDUSTRY_FIELDS = ("industry_id", "industry")
+_DATE_FIELDS = ("date", "published_at", "published")
+_TEXT_FIELDS = ("text", "body", "title")
+_DATE = re.compile(r"^(\d{4})-(\d{2})")
+
+# Heuristic scorer used when transformers is not enabled
+_POSITIVE = frozenset(
+    "growth expansion funding milestone record success successful profit profitable award awarded "
+    "contract contracts win wins strong gain gains launch launched approve approved beat exceeds".split()
+)
+_NEGATIVE = frozenset(
+    "delay delayed delays loss losses failure failed anomaly cancel cancelled canceled cut cuts "
+    "layoff layoffs decline declines weak lawsuit scrub scrubbed explosion shortfall miss missed".split()
+)
+_WORD = re.compile(r"[a-z]+")
+
+
+class Document(NamedTuple):
+    industry_id: str
+    month: str  # "2023-04", as pandas prints a monthly Period
+    quarter: str  # "2023Q2"
+    text: str
+
+
+def _lexicon_score(text: str) -> float:
+    words = _WORD.findall(text.lower())
+    pos = sum(w in _POSITIVE for w in words)
+    neg = sum(w in _NEGATIVE for w in words)
+    return (pos - neg) / (pos + neg) if pos + neg else 0.0
+
+
+def score_texts(texts: List[str]) -> np.ndarray:
+    """Per-document sentiment in [-1, 1] from the engine, or the lexicon without it."""
+    if available("transformers"):
+        try:
+            return np.clip(ENGINE.score(texts), -1.0, 1.0)
+        except Exception:
+            pass
+    return np.array([_lexicon_score(t) for t in texts], dtype=np.float64)
+
+
+def _field(row: Dict[str, Any], names: Tuple[str, ...]) -> Optional[str]:
+    for name in names:
+        value = row.get(name)
+        if value:
+            return str(value)
+    return None
+
+
+def _industry_key(value: str) -> str:
+    # the normalization util/ingest.py applies to industry_id
+    return value.strip().replace(" ", "_").lower()
+
+
+def _document(row: Dict[str, Any]) -> Optional[Document]:
+    industry = _industry_key(_field(row, _INDUSTRY_FIELDS) or "")
+    date = _field(row, _DATE_FIELDS)
+    text = _field(row, _TEXT_FIELDS)
+    m = _DATE.match(date or "")
+    if not industry or not text or m is None or not 1 <= int(m.group(2)) <= 12:
+        return None
+    year, month = m.group(1), int(m.group(2))
+    return Document(industry, f"{year}-{month:02d}", f"{year}Q{(month - 1) // 3 + 1}", text)
+
+
+def _lines(f: io.BufferedReader, progress: List[int], tail: bool) -> Iterator[str]:
+    """Lines from the current position; ``progress[0]`` counts consumed bytes.
+
+    A last line without a newline is only yielded when ``tail`` is set, since
+    a writer may still be appending it.
+    """
+    for raw in f:
+        if not raw.endswith(b"\n") and not tail:
+            return
+        progress[0] += len(raw)
+        yield raw.decode("utf-8", errors="replace")
+
+
+class _FileState:
+    __slots__ = ("offset", "size", "mtime_ns", "inode", "header")
+
+    def __init__(self, inode: int) -> None:
+        self.offset = 0
+        self.size = 0
+        self.mtime_ns = 0
+        self.inode = inode
+        self.header: Optional[List[str]] = None
+
+
+def read_documents(path: Path, state: _FileState, tail: bool = True) -> Iterator[Tuple[Optional[Document], int]]:
+    """Stream records appended to ``path`` since ``state.offset``.
+
+    Yields each record's document (None for rows without an industry, a
+    parseable date or text) with the offset just past it; the caller moves
+    ``state.offset`` once it has used them. JSONL is read line by line; CSV
+    through ``csv.reader`` so quoted multi-line fields work. A last record
+    without a newline is read at EOF: in JSONL once it parses (a half
+    written line does not), in CSV only with ``tail``.
+    """
+    csv_file = path.suffix.lower() == ".csv"
+    with path.open("rb") as f:
+        start = state.offset
+        f.seek(start)
+        progress = [0]
+        if csv_file:
+            reader = csv.reader(_lines(f, progress, tail))
+            if state.header is None:
+                state.header = next(reader, None)
+                if state.header is None:
+                    return
+                state.offset = start = start + progress[0]
+                progress[0] = 0
+            for values in reader:
+                # csv.reader pulls exactly the lines of one record, so this is a record boundary
+                yield _document(dict(zip(state.header, values))), start + progress[0]
+        else:
+            for line in _lines(f, progress, True):
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    if not line.endswith("\n"):
+                        return
+                    row = None
+                yield (_document(row) if isinstance(row, dict) else None), start + progress[0]
+
+
+class _Moments:
+    """Running count / mean / sum of squared deviations (Welford, merged per batch)."""
+
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge(self, count: int, mean: float, m2: float) -> None:
+        # Chan et al. pairwise combination of two partial aggregates
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class Corpus:
+    """Per-industry, per-period sentiment aggregates over a text corpus.
+
+    ``refresh`` streams only what was appended to each file since the last
+    call and folds the scores into running per-(window, industry, period)
+    moments, so new documents update sentiment without a full recompute.
+    Files are expected to be append-only: one that shrinks, disappears or is
+    replaced (a new inode) resets the aggregates and everything is read
+    again. Every process keeps its own aggregates, primed by the compute
+    warmup so requests only fold in what arrived since. Industry ids are
+    normalized the way util/ingest.py normalizes them, on both the documents
+    and the lookups.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        batch_size: int = _BATCH_SIZE,
+        scorer: Callable[[List[str]], np.ndarray] = score_texts,
+    ) -> None:
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.scorer = scorer
+        self._lock = threading.Lock()
+        self._files: Dict[Path, _FileState] = {}
+        self._moments: Dict[Tuple[str, str, str], _Moments] = {}
+        self.documents = 0
+        self.rebuilds = 0
+
+    def _paths(self) -> List[Path]:
+        if self.path.is_dir():
+            return sorted(p for p in self.path.iterdir() if p.suffix.lower() in (".jsonl", ".csv"))
+        return [self.path] if self.path.exists() else []
+
+    def _reset(self) -> None:
+        self._files.clear()
+        self._moments.clear()
+        self.documents = 0
+        self.rebuilds += 1
+
+    def _pending(self) -> Iterator[Tuple[_FileState, Optional[Document], int]]:
+        for path in self._paths():
+            stat = path.stat()
+            state = self._files.get(path)
+            idle = state is not None and stat.st_size == state.size and stat.st_mtime_ns == state.mtime_ns
+            if idle and state.offset >= stat.st_size:
+                continue
+            if state is None:
+                state = self._files[path] = _FileState(stat.st_ino)
+            # an unterminated CSV record is taken once the file has stopped changing
+            for doc, offset in read_documents(path, state, tail=idle):
+                yield state, doc, offset
+            state.size, state.mtime_ns = stat.st_size, stat.st_mtime_ns
+
+    def _changed_in_place(self) -> bool:
+        paths = set(self._paths())
+        for path, state in self._files.items():
+            if path not in paths:
+                return True
+            stat = path.stat()
+            if stat.st_ino != state.inode or stat.st_size < state.offset:
+                return True
+        return False
+
+    def _fold(self, docs: List[Document]) -> None:
+        scores = np.asarray(self.scorer([d.text for d in docs]), dtype=np.float64)
+        groups: Dict[Tuple[str, str, str], List[float]] = {}
+        for doc, score in zip(docs, scores.tolist()):
+            groups.setdefault(("monthly", doc.industry_id, doc.month), []).append(score)
+            groups.setdefault(("quarterly", doc.industry_id, doc.quarter), []).append(score)
+        for key, values in groups.items():
+            arr = np.asarray(values)
+            mean = float(arr.mean())
+            moments = self._moments.get(key)
+            if moments is None:
+                moments = self._moments[key] = _Moments()
+            moments.merge(len(arr), mean, float(((arr - mean) ** 2).sum()))
+        self.documents += len(docs)
+
+    def refresh(self) -> int:
+        """Score and fold in documents added since the last refresh; returns how many.
+
+        File offsets only move past documents once they are folded in, so if
+        the scorer raises, the next refresh reads them again.
+        """
+        with self._lock:
+            before = self.documents
+            if self._changed_in_place():
+                self._reset()
+                before = 0
+            batch: List[Document] = []
+            read: Dict[_FileState, int] = {}
+            for state, doc, offset in self._pending():
+                read[state] = offset
+                if doc is not None:
+                    batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    self._fold(batch)
+                    batch = []
+                    self._commit(read)
+            if batch:
+                self._fold(batch)
+            self._commit(read)
+            return self.documents - before
+
+    @staticmethod
+    def _commit(read: Dict[_FileState, int]) -> None:
+        for state, offset in read.items():
+            state.offset = offset
+        read.clear()
+
+    def periods(self, industry_ids: List[str], window: str) -> List[str]:
+        """Every period from the first to the last one with documents for these industries."""
+        wanted = {_industry_key(ind) for ind in industry_ids}
+        with self._lock:
+            seen = [p for (w, ind, p) in self._moments if w == window and ind in wanted]
+        if not seen:
+            return []
+        first, last = min(seen), max(seen)
+        if window == "monthly":
+            y, m = int(first[:4]), int(first[5:7])
+            end = (int(last[:4]), int(last[5:7]))
+            out = []
+            while (y, m) <= end:
+                out.append(f"{y}-{m:02d}")
+                y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+            return out
+        y, q = int(first[:4]), int(first[5])
+        end = (int(last[:4]), int(last[5]))
+        out = []
+        while (y, q) <= end:
+            out.append(f"{y}Q{q}")
+            y, q = (y + 1, 1) if q == 4 else (y, q + 1)
+        return out
+
+    def series(self, industry_id: str, window: str, periods: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Mean, standard deviation and document count per period (NaN mean where empty)."""
+        mean = np.full(len(periods), np.nan)
+        std = np.zeros(len(periods))
+        count = np.zeros(len(periods), dtype=np.int64)
+        key = _industry_key(industry_id)
+        with self._lock:
+            for i, p in enumerate(periods):
+                moments = self._moments.get((window, key, p))
+                if moments is not None:
+                    mean[i], std[i], count[i] = moments.mean, np.sqrt(moments.variance), moments.count
+        return mean, std, count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "files": len(self._files),
+                "documents": self.documents,
+                "buckets": len(self._moments),
+                "rebuilds": self.rebuilds,
+            }
+
+
+_CORPUS: Optional[Corpus] = Corpus(Path(_CORPUS_PATH)) if _CORPUS_PATH else None
+
+
+def corpus() -> Optional[Corpus]:
+    """The configured corpus, brought up to date; None when SENTIMENT_CORPUS is unset."""
+    if _CORPUS is None:
+        return None
+    with span("sentiment.corpus"):
+        _CORPUS.refresh()
+    return _CORPUS
+
+
+def corpus_stats() -> Optional[Dict[str, Any]]:
+    return None if _CORPUS is None else _CORPUS.stats()
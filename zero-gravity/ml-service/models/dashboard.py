@@ -0,0 +1,70 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from models.economy import EconomyIndex, economy_index
+from models.growth import forecast_growth
+from models.jobs import project_jobs
+from models.sentiment import analyze_sentiment
+from models.telemetry import span
+
+
+def growth_ratios(items: List[Dict[str, Any]], index: EconomyIndex) -> Dict[str, np.ndarray]:
+    """Forecast value added over the last observed value, per industry and year."""
+    ratios: Dict[str, np.ndarray] = {}
+    for item in items:
+        series = index.get(item["industry_id"])
+        if series is None or len(series.years) == 0:
+            continue
+        last = float(series.value_added[-1])
+        prediction = np.asarray(item["prediction"], dtype=np.float64)
+        if last > 0 and np.all(np.isfinite(prediction)):
+            ratios[item["industry_id"]] = prediction / last
+    return ratios
+
+
+def run_dashboard(
+    growth: Optional[Dict[str, Any]] = None,
+    jobs: Optional[Dict[str, Any]] = None,
+    sentiment: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Growth, jobs and sentiment sections against one snapshot of the data.
+
+    Each section takes the same fields as its standalone endpoint and is
+    skipped when ``None``. Jobs are driven by the growth forecast (in the
+    growth section's tier), reusing its items where the horizon matches.
+    """
+    with span("batch.load"):
+        index = economy_index()
+    out: Dict[str, Any] = {}
+
+    forecast: List[Dict[str, Any]] = []
+    if growth is not None:
+        result = forecast_growth(growth["industry_ids"], growth["horizon_years"], index, growth.get("tier"))
+        forecast = result["items"]
+        out["growth"] = result
+
+    if jobs is not None:
+        horizon = jobs["horizon_years"]
+        items = forecast if growth is not None and growth["horizon_years"] == horizon else []
+        have = {item["industry_id"] for item in items}
+        todo = [ind for ind in dict.fromkeys(jobs["industry_ids"]) if ind not in have]
+        if todo:
+            tier = None if growth is None else growth.get("tier")
+            items = items + forecast_growth(todo, horizon, index, tier)["items"]
+        projection = project_jobs(
+            jobs["industry_ids"],
+            horizon,
+            jobs["productivity_growth"],
+            growth_ratios(items, index),
+            index,
+        )
+        with span("jobs.serialize"):
+            out["jobs"] = projection.to_columnar() if jobs.get("format") == "columnar" else projection.to_dict()
+
+    if sentiment is not None:
+        out["sentiment"] = analyze_sentiment(
+            sentiment["industry_ids"], sentiment["window"], sentiment["lag_max"], index
+        )
+
+    return out
@@ -0,0 +1,398 @@
+import bisect
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.telemetry import span
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ECONOMY_JSON = Path(os.getenv("ECONOMY_PATH", str(DATA_DIR / "space_economy.json")))
+ECONOMY_ARROW = Path(os.getenv("ECONOMY_ARROW_PATH", str(DATA_DIR / "space_economy.arrow")))
+XLSX_PATH = DATA_DIR / "Business.xlsx"
+
+# Columnar (Arrow IPC / Feather v2) layout written by util/ingest.py. Bump the
+# version when the layout changes; files without one are migrated on read.
+SCHEMA_VERSION = 1
+SCHEMA_KEY = b"zg.schema_version"
+
+SYNTHETIC_INDUSTRIES = ["manufacturing", "space_vehicles", "information", "professional_rd"]
+
+_Signature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _synthetic_economy(
+    industries: Optional[List[str]] = None, years: Optional[List[int]] = None
+) -> pd.DataFrame:
+    # Final fallback: tiny synthetic data to keep service responsive.
+    # util/bench.py scales the same generator up to more industries and years.
+    industries = SYNTHETIC_INDUSTRIES if industries is None else industries
+    year_arr = np.array(list(range(2012, 2024)) if years is None else years, dtype=np.int64)
+    # crc32 rather than hash(): stable across processes and PYTHONHASHSEED
+    base = 20000.0 + np.array([zlib.crc32(ind.encode("utf-8")) % 7000 for ind in industries], dtype=np.float64)
+    steps = (year_arr - year_arr[0] + 1).astype(np.float64)
+    vals = steps[None, :] * (base[:, None] / len(year_arr))
+    emp = 10000 + (year_arr - year_arr[0]) * 120
+    return pd.DataFrame({
+        "year": np.tile(year_arr, len(industries)),
+        "industry_id": np.repeat(np.array(industries, dtype=object), len(year_arr)),
+        "valueAddedCurrentUSD": vals.ravel(),
+        "employment": np.tile(emp, len(industries)).astype(np.float64),
+    })
+
+
+def _read_workbook(xls_path: Path) -> pd.DataFrame:
+    # Attempt to read the first sheet and infer columns
+    df = pd.read_excel(xls_path, engine="openpyxl")
+    # Heuristic normalization - expect columns Year, Industry, ValueAdded, Employment
+    columns_lower = {c: str(c).strip().lower() for c in df.columns}
+    df.columns = list(columns_lower.values())
+    # Rename commonly seen headers
+    renames = {
+        "year": "year",
+        "industry": "industry_id",
+        "value added": "valueAddedCurrentUSD",
+        "valueadded": "valueAddedCurrentUSD",
+        "employment": "employment",
+    }
+    for old, new in renames.items():
+        if old in df.columns:
+            df[new] = df[old]
+    return df[["year", "industry_id", "valueAddedCurrentUSD", "employment"]].dropna()
+
+
+def write_economy_arrow(frame: pd.DataFrame, path: Path = ECONOMY_ARROW) -> Path:
+    """Write the dataset as an uncompressed Arrow IPC file (memory-mappable).
+
+    industry_id is dictionary-encoded, year is int16 and the schema carries
+    ``zg.schema_version``. Requires pyarrow.
+    """
+    import pyarrow as pa
+
+    columns = {
+        "year": pa.array(frame["year"].to_numpy(dtype=np.int16)),
+        "industry_id": pa.array(frame["industry_id"].astype(str).to_numpy(dtype=object)).dictionary_encode(),
+        "valueAddedCurrentUSD": pa.array(frame["valueAddedCurrentUSD"].to_numpy(dtype=np.float64)),
+    }
+    if "employment" in frame:
+        columns["employment"] = pa.array(frame["employment"].to_numpy(dtype=np.float64))
+    table = pa.table(columns).replace_schema_metadata({SCHEMA_KEY: str(SCHEMA_VERSION).encode()})
+    tmp = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+    return path
+
+
+def _column_values(column: Any) -> np.ndarray:
+    # a single null-free chunk is viewed in place; anything else is copied
+    if column.num_chunks == 1 and column.null_count == 0:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+    return column.to_numpy()
+
+
+def _read_arrow(path: Path) -> pd.DataFrame:
+    """Memory-mapped read of the columnar file; raises on unknown layouts.
+
+    Numeric columns are views into the mapped file and industry_id becomes
+    a Categorical over the file's dictionary, so no per-row objects are
+    built; EconomyIndex copies only what it reorders.
+    """
+    import pyarrow as pa
+
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    meta = table.schema.metadata or {}
+    version = int(meta.get(SCHEMA_KEY, b"0"))
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"{path} has schema version {version}; this build reads <= {SCHEMA_VERSION}")
+    if version < 1:
+        # v0: plain Feather (e.g. DataFrame.to_feather) - coerce to the v1 types
+        table = table.set_column(
+            table.schema.get_field_index("year"), "year", table.column("year").cast(pa.int16())
+        )
+        if not pa.types.is_dictionary(table.schema.field("industry_id").type):
+            table = table.set_column(
+                table.schema.get_field_index("industry_id"),
+                "industry_id",
+                table.column("industry_id").cast(pa.string()).dictionary_encode(),
+            )
+    industry = table.column("industry_id").combine_chunks()
+    columns: Dict[str, Any] = {
+        "year": _column_values(table.column("year")),
+        "industry_id": pd.Categorical.from_codes(
+            industry.indices.to_numpy(zero_copy_only=False), industry.dictionary.to_pylist()
+        ),
+    }
+    for name in ("valueAddedCurrentUSD", "employment"):
+        if name in table.column_names:
+            columns[name] = _column_values(table.column(name))
+    return pd.DataFrame(columns, copy=False)
+
+
+def _read_economy(arrow_path: Path, json_path: Path, xlsx_path: Path) -> Tuple[pd.DataFrame, str]:
+    arrow_sig, json_sig = _file_signature(arrow_path), _file_signature(json_path)
+    # prefer the columnar file unless an older ingest left it behind the JSON
+    if arrow_sig is not None and (json_sig is None or arrow_sig[0] >= json_sig[0]):
+        try:
+            return _read_arrow(arrow_path), "arrow"
+        except Exception:
+            pass
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return pd.DataFrame(data), "json"
+    except (FileNotFoundError, ValueError):
+        # Fallback: parse minimal columns from Business.xlsx if present
+        try:
+            return _read_workbook(xlsx_path), "xlsx"
+        except Exception:
+            return _synthetic_economy(), "synthetic"
+
+
+class IndustrySeries(NamedTuple):
+    key: str
+    years: np.ndarray
+    value_added: np.ndarray
+    employment: Optional[np.ndarray]
+
+    def digest(self) -> str:
+        """Content hash of the series, used to match persisted artifacts."""
+        h = hashlib.sha256(self.key.encode("utf-8"))
+        h.update(np.ascontiguousarray(self.years, dtype=np.int64).tobytes())
+        h.update(np.ascontiguousarray(self.value_added, dtype=np.float64).tobytes())
+        return h.hexdigest()
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+class EconomyIndex:
+    """Per-industry, year-sorted NumPy views over the economy frame.
+
+    Rows are sorted once by (normalized industry_id, year) into contiguous
+    arrays; every lookup returns read-only slices of them. Industry keys are
+    also joined into a single newline-separated haystack so the substring
+    fallback is a C-level ``str.find`` over the keys rather than a frame scan.
+    """
+
+    _FUZZY_MEMO_SIZE = 1024
+
+    def __init__(self, frame: pd.DataFrame, version: int = 0) -> None:
+        self.version = version
+        industry = frame["industry_id"]
+        if isinstance(industry.dtype, pd.CategoricalDtype):
+            # lowercase the dictionary rather than every row
+            lowered = np.array([str(c).lower() for c in industry.cat.categories], dtype=object)
+            uniq, remap = np.unique(lowered, return_inverse=True)
+            codes = remap[industry.cat.codes.to_numpy()]
+        else:
+            keys = industry.astype(str).str.lower().to_numpy(dtype=object)
+            uniq, codes = np.unique(keys, return_inverse=True)
+        years = frame["year"].to_numpy(dtype=np.int64)
+        order = np.lexsort((years, codes))
+        self.years = _readonly(years[order])
+        # frame row of each sorted row, to reproduce frame-order operations
+        self._positions = _readonly(order)
+        self.value_added = _readonly(frame["valueAddedCurrentUSD"].to_numpy(dtype=np.float64)[order])
+        self.employment = (
+            _readonly(frame["employment"].to_numpy(dtype=np.float64)[order]) if "employment" in frame else None
+        )
+        bounds = np.searchsorted(codes[order], np.arange(len(uniq) + 1))
+        self.keys: List[str] = [str(k) for k in uniq]
+        self._slices: Dict[str, slice] = {
+            k: slice(int(bounds[i]), int(bounds[i + 1])) for i, k in enumerate(self.keys)
+        }
+        self._haystack = "\n".join(self.keys)
+        self._starts: List[int] = []
+        pos = 0
+        for k in self.keys:
+            self._starts.append(pos)
+            pos += len(k) + 1
+        self._fuzzy: Dict[str, Tuple[str, ...]] = {}
+        h = hashlib.sha256("\n".join(self.keys).encode("utf-8"))
+        h.update(bounds.astype(np.int64).tobytes())
+        h.update(self.years.tobytes())
+        h.update(self.value_added.tobytes())
+        if self.employment is not None:
+            h.update(self.employment.tobytes())
+        self.digest = h.hexdigest()
+
+    def __contains__(self, industry_id: str) -> bool:
+        return industry_id.lower() in self._slices
+
+    def get(self, industry_id: str) -> Optional[IndustrySeries]:
+        """Exact (case-insensitive) lookup."""
+        key = industry_id.lower()
+        sl = self._slices.get(key)
+        if sl is None:
+            return None
+        emp = self.employment[sl] if self.employment is not None else None
+        return IndustrySeries(key, self.years[sl], self.value_added[sl], emp)
+
+    def containing(self, fragment: str) -> Tuple[str, ...]:
+        """Keys containing ``fragment`` (case-insensitive, literal match)."""
+        frag = fragment.lower()
+        hit = self._fuzzy.get(frag)
+        if hit is not None:
+            return hit
+        found: List[str] = []
+        if "\n" not in frag:
+            pos = self._haystack.find(frag)
+            while pos != -1:
+                i = bisect.bisect_right(self._starts, pos) - 1
+                found.append(self.keys[i])
+                nxt = self._starts[i + 1] if i + 1 < len(self._starts) else len(self._haystack)
+                pos = self._haystack.find(frag, nxt)
+        hit = tuple(found)
+        if len(self._fuzzy) >= self._FUZZY_MEMO_SIZE:
+            self._fuzzy.clear()
+        self._fuzzy[frag] = hit
+        return hit
+
+    def lookup(self, industry_id: str) -> Optional[IndustrySeries]:
+        """Exact lookup, falling back to every industry containing the id."""
+        series = self.get(industry_id)
+        if series is not None:
+            return series
+        keys = self.containing(industry_id)
+        if not keys:
+            return None
+        if len(keys) == 1:
+            return self.get(keys[0])
+        parts = [self.get(k) for k in keys]
+        # the matching rows in frame order (a boolean mask over the frame), then
+        # sorted by year with sort_values' default quicksort so ties land alike
+        in_frame = np.argsort(np.concatenate([self._positions[self._slices[k]] for k in keys]), kind="stable")
+        years = np.concatenate([p.years for p in parts])
+        order = in_frame[np.argsort(years[in_frame], kind="quicksort")]
+        emp = (
+            np.concatenate([p.employment for p in parts])[order] if self.employment is not None else None
+        )
+        return IndustrySeries(
+            "|".join(keys),
+            years[order],
+            np.concatenate([p.value_added for p in parts])[order],
+            emp,
+        )
+
+
+class EconomyStore:
+    """Loaded-once view of the economy dataset.
+
+    The frame is parsed on first use and then served from memory until the
+    backing file's mtime/size changes or ``reload()`` is called. Each uvicorn
+    worker process holds its own store; the stat check keeps them consistent
+    after a re-ingest. The returned frame is shared and must not be mutated.
+    """
+
+    def __init__(
+        self, json_path: Path = ECONOMY_JSON, xlsx_path: Path = XLSX_PATH, arrow_path: Path = ECONOMY_ARROW
+    ) -> None:
+        self.json_path = Path(json_path)
+        self.xlsx_path = Path(xlsx_path)
+        self.arrow_path = Path(arrow_path)
+        self._lock = threading.Lock()
+        self._frame: Optional[pd.DataFrame] = None
+        self._index: Optional[EconomyIndex] = None
+        self._signature: Optional[_Signature] = None
+        self._source = ""
+        self._loaded_at = 0.0
+        self._listeners: List[Callable[[], None]] = []
+        self.version = 0
+        self.hits = 0
+        self.reloads = 0
+
+    def _stat(self) -> _Signature:
+        return (
+            _file_signature(self.arrow_path),
+            _file_signature(self.json_path),
+            _file_signature(self.xlsx_path),
+        )
+
+    def _load(self, signature: _Signature) -> None:
+        with span("economy.load"):
+            frame, source = _read_economy(self.arrow_path, self.json_path, self.xlsx_path)
+        self._frame = frame
+        self._index = None
+        self._signature = signature
+        self._source = source
+        self._loaded_at = time.time()
+        self.version += 1
+        self.reloads += 1
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Register a callback run after every (re)load, e.g. to drop caches."""
+        self._listeners.append(listener)
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
+
+    def frame(self) -> pd.DataFrame:
+        signature = self._stat()
+        with self._lock:
+            reloaded = self._frame is None or signature != self._signature
+            if reloaded:
+                self._load(signature)
+            else:
+                self.hits += 1
+            frame = self._frame
+        if reloaded:
+            self._notify()
+        return frame
+
+    def index(self) -> EconomyIndex:
+        self.frame()
+        with self._lock:
+            if self._index is None:
+                self._index = EconomyIndex(self._frame, self.version)
+            return self._index
+
+    def reload(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load(self._stat())
+        self._notify()
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "digest": None if self._index is None else self._index.digest,
+                "source": self._source,
+                "path": str(self.arrow_path if self._source == "arrow" else self.json_path),
+                "rows": 0 if self._frame is None else int(len(self._frame)),
+                "loadedAt": self._loaded_at,
+                "hits": self.hits,
+                "reloads": self.reloads,
+            }
+
+
+STORE = EconomyStore()
+
+
+def load_economy() -> pd.DataFrame:
+    return STORE.frame()
+
+
+def economy_index() -> EconomyIndex:
+    return STORE.index()
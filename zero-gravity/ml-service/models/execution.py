@@ -0,0 +1,268 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from models import telemetry
+
+# CPU-bound request work (fits, inference) runs in its own process pool so it
+# never competes with the event loop. 0 workers runs it in the default thread
+# pool instead. Either way /admin and /metrics report the processes that
+# actually hold the data and caches (see ComputeExecutor.snapshots).
+_WORKERS = int(os.getenv("COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Requests allowed to wait for a worker before new ones are turned away
+_MAX_QUEUE = int(os.getenv("COMPUTE_MAX_QUEUE", "16"))
+# Heavy backends load lazily; by default every compute process imports them
+# (and seeds trained models and scores the sentiment corpus) as it starts, and /ready reports 503 until the
+# first set of workers is up.
+_WARMUP = os.getenv("BACKEND_WARMUP", "1") not in ("", "0")
+
+
+class Overloaded(Exception):
+    """Raised when the compute queue is full; ``retry_after`` is in seconds."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"compute queue full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _warm() -> Dict[str, Any]:
+    """Import the enabled backends, seed trained models and score the sentiment corpus in this process."""
+    from models import backends
+    from models.corpus import corpus
+    from models.growth import preload_artifacts
+
+    loaded = backends.warmup()
+    artifacts = preload_artifacts()
+    # otherwise the first /sentiment request scores the whole corpus inline
+    source = corpus()
+    return {
+        "pid": os.getpid(),
+        "backends": loaded,
+        "artifacts": artifacts,
+        "corpusDocuments": None if source is None else source.documents,
+    }
+
+
+# What _init_worker's warmup reported in this worker process
+_WARMED: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(warm: bool) -> None:
+    from models import growth
+
+    global _WARMED
+    # a worker is already one slot of the pool; no nested fan-out
+    growth._PARALLEL = False
+    if warm:
+        # runs before the worker takes its first task, so every worker is warm,
+        # including the ones a recycled pool starts later
+        try:
+            _WARMED = _warm()
+        except Exception as exc:
+            # an initializer failure would break the pool; backends still load on first use
+            _WARMED = {"pid": os.getpid(), "error": repr(exc)}
+
+
+def _warmed() -> Dict[str, Any]:
+    return _WARMED or {"pid": os.getpid()}
+
+
+def _snapshot() -> Dict[str, Any]:
+    """Dataset, cache and backend state of this process, as the admin endpoints report it."""
+    from models import backends
+    from models.corpus import corpus_stats
+    from models.economy import STORE
+    from models.growth import cache_stats
+    from models.sentiment_engine import ENGINE
+
+    return {
+        "pid": os.getpid(),
+        "economy": STORE.stats(),
+        "cache": {**cache_stats(), "sentiment": ENGINE.stats(), "corpus": corpus_stats()},
+        "backends": backends.stats(),
+    }
+
+
+def _call(fn: Callable[..., Any], *args: Any) -> Tuple[Any, List[telemetry.Span], Dict[str, Any]]:
+    # a worker's caches only change while it runs a task, so the snapshot
+    # taken at the end of its last task is its current state
+    result, spans = telemetry.collect(fn, *args)
+    return result, spans, _snapshot()
+
+
+class ComputeExecutor:
+    """Admission-controlled, single-flight front for the compute pool.
+
+    Identical concurrent calls (same ``key``) share one computation. At most
+    ``workers + max_queue`` distinct computations are admitted at a time;
+    beyond that ``run`` raises ``Overloaded`` with a Retry-After estimate
+    derived from the recent task duration. Must be driven from one event loop.
+
+    Pool workers are separate processes with their own dataset and caches;
+    every task returns a snapshot of its worker's state, kept per pid for
+    ``snapshots``, and ``recycle`` replaces the workers so they reload.
+    """
+
+    def __init__(self, workers: int = _WORKERS, max_queue: int = _MAX_QUEUE, warm: bool = _WARMUP) -> None:
+        self.workers = max(0, workers)
+        self.max_queue = max(0, max_queue)
+        self.warm = warm
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._snapshots: Dict[int, Dict[str, Any]] = {}
+        self.active = 0
+        self.avg_seconds = 1.0
+        self.completed = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        return max(1, self.workers) + self.max_queue
+
+    def _executor(self) -> Optional[Executor]:
+        if self.workers == 0:
+            return None
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a threaded server process is not safe
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.warm,),
+                )
+            return self._pool
+
+    async def warmup(self) -> List[Dict[str, Any]]:
+        """Start and warm every worker (or warm this process when running in-process).
+
+        Returns each worker's warmup report once all of them have finished
+        their initializer.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._executor()
+        if pool is None:
+            return [await loop.run_in_executor(None, _warm)]
+        reports: Dict[int, Dict[str, Any]] = {}
+        while len(reports) < self.workers:
+            # the pool spawns a worker per task it cannot hand to an idle one; a
+            # worker only takes tasks after its initializer, so a round that
+            # comes back from the warm workers alone is retried
+            jobs = [loop.run_in_executor(pool, _call, _warmed) for _ in range(self.workers - len(reports))]
+            before = len(reports)
+            for result, _, snapshot in await asyncio.gather(*jobs):
+                self._record(pool, snapshot)
+                reports[result["pid"]] = result
+            if len(reports) == before:
+                await asyncio.sleep(0.05)
+        return [reports[pid] for pid in sorted(reports)]
+
+    def _record(self, pool: Executor, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            # a recycled pool's workers no longer serve requests
+            if pool is self._pool:
+                self._snapshots[snapshot["pid"]] = snapshot
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        """Per-process state: this process when in-process, else each pool worker as of its last task.
+
+        Workers that have not run a task yet are not listed.
+        """
+        if self.workers == 0:
+            return [_snapshot()]
+        with self._lock:
+            return [self._snapshots[pid] for pid in sorted(self._snapshots)]
+
+    def recycle(self) -> None:
+        """Start fresh workers for new work; running and queued tasks finish on the old ones.
+
+        This is how a reload reaches the workers: new processes read the
+        dataset and artifacts again and start with empty caches.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._snapshots.clear()
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            self._snapshots.clear()
+
+    def retry_after(self) -> int:
+        slots = max(1, self.workers)
+        return max(1, math.ceil(self.avg_seconds * math.ceil(self.active / slots)))
+
+    async def _compute(self, fn: Callable[..., Any], args: tuple) -> Tuple[Any, List[telemetry.Span]]:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        pool = self._executor()
+        try:
+            if pool is None:
+                result, spans = await loop.run_in_executor(None, telemetry.collect, fn, *args)
+            else:
+                result, spans, snapshot = await loop.run_in_executor(pool, _call, fn, *args)
+                self._record(pool, snapshot)
+            # observed once here, however many coalesced callers share the result
+            telemetry.observe(spans)
+            wall = time.perf_counter() - started
+            telemetry.STAGES.observe("compute", wall)
+            return result, spans + [("compute", wall)]
+        except BrokenProcessPool:
+            # a crashed worker takes the whole pool down; the next call gets a fresh one
+            if pool is self._pool:
+                self.shutdown()
+            raise
+        finally:
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.perf_counter() - started)
+
+    def _done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        self._inflight.pop(key, None)
+        self.active -= 1
+        self.completed += 1
+        if not task.cancelled():
+            task.exception()  # retrieved here so an abandoned failure is not logged as lost
+
+    async def run(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Result of ``fn(*args)`` computed in the pool, shared by concurrent callers of ``key``."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            if self.active >= self.capacity:
+                self.rejected += 1
+                raise Overloaded(self.retry_after())
+            task = asyncio.ensure_future(self._compute(fn, args))
+            self._inflight[key] = task
+            self.active += 1
+            task.add_done_callback(lambda t, k=key: self._done(k, t))
+        # a caller that disconnects must not cancel the work others are waiting on
+        result, spans = await asyncio.shield(task)
+        telemetry.attach(spans)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "maxQueue": self.max_queue,
+            "active": self.active,
+            "queued": max(0, self.active - max(1, self.workers)),
+            "avgSeconds": self.avg_seconds,
+            "completed": self.completed,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+        }
+
+
+EXECUTOR = ComputeExecutor()
@@ -0,0 +1,385 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.economy import EconomyIndex, IndustrySeries
+
+# Fast tier: damped-trend Holt, log-linear trend and AR(1) on first differences,
+# all closed-form / recursive and vectorized over industries. These are prior
+# weights; once a series has enough one-step errors each model is re-weighted
+# by the inverse of its mean squared relative error.
+FAST_WEIGHTS: Dict[str, float] = {"holt": 0.4, "loglinear": 0.3, "ar": 0.3}
+KINDS = tuple(FAST_WEIGHTS)
+
+# Holt (alpha, beta, phi) grid, chosen per series by one-step squared error
+_GRID = np.array(
+    np.meshgrid([0.2, 0.4, 0.6, 0.8, 1.0], [0.05, 0.1, 0.2, 0.4], [0.8, 0.9, 0.98, 1.0], indexing="ij")
+).reshape(3, -1)
+_DEFAULT_HOLT = (0.8, 0.2, 0.98)
+_PHI_CLIP = 0.95
+# Empirical band from one-step relative errors; below _MIN_RESIDUALS the old fixed band is used
+_QUANTILES = (0.05, 0.95)
+_MIN_RESIDUALS = 4
+_FALLBACK_BAND = 0.15
+
+_STATE_FIELDS = (
+    "n", "last_year", "last_value",
+    "alpha", "beta", "phi", "level", "trend",
+    "t0", "ok", "s0", "s1", "s2", "sz", "stz",
+    "last_diff", "dn", "dsum", "pn", "pu", "pv", "puu", "puv",
+    "nres", "e_holt", "e_loglinear", "e_ar",
+)
+
+
+def _empty_state(m: int) -> Dict[str, np.ndarray]:
+    state = {name: np.zeros(m, dtype=np.float64) for name in _STATE_FIELDS}
+    state["ok"] = np.ones(m, dtype=bool)
+    return state
+
+
+def _loglinear_coef(st: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    den = st["s0"] * st["s2"] - st["s1"] ** 2
+    usable = st["ok"] & (st["s0"] >= 2) & (den > 0)
+    safe = np.where(usable, den, 1.0)
+    slope = np.where(usable, (st["s0"] * st["stz"] - st["s1"] * st["sz"]) / safe, 0.0)
+    intercept = np.where(usable, (st["sz"] - slope * st["s1"]) / np.maximum(st["s0"], 1.0), 0.0)
+    return intercept, slope, usable
+
+
+def _ar_coef(st: Dict[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(intercept, phi, usable) of d_t = c + phi * d_{t-1}; drift-only where not usable."""
+    pn = np.maximum(st["pn"], 1.0)
+    var = st["puu"] / pn - (st["pu"] / pn) ** 2
+    usable = (st["pn"] >= 2) & (var > 1e-12 * np.maximum(st["puu"] / pn, 1e-300))
+    cov = st["puv"] / pn - (st["pu"] / pn) * (st["pv"] / pn)
+    phi = np.clip(np.where(usable, cov / np.where(usable, var, 1.0), 0.0), -_PHI_CLIP, _PHI_CLIP)
+    c = np.where(usable, st["pv"] / pn - phi * st["pu"] / pn, 0.0)
+    drift = np.where(st["dn"] > 0, st["dsum"] / np.maximum(st["dn"], 1.0), 0.0)
+    return np.where(usable, c, drift), phi, usable
+
+
+def _weights(st: Dict[str, np.ndarray]) -> np.ndarray:
+    """(rows, kinds) ensemble weights; log-linear drops out for non-positive series."""
+    _, _, loglin = _loglinear_coef(st)
+    w = np.tile(np.array([FAST_WEIGHTS[k] for k in KINDS]), (len(st["n"]), 1))
+    w[:, KINDS.index("loglinear")] *= loglin
+    scored = st["nres"] >= _MIN_RESIDUALS
+    if scored.any():
+        mse = np.stack([st[f"e_{k}"] for k in KINDS], axis=1) / np.maximum(st["nres"], 1.0)[:, None]
+        w = np.where(scored[:, None], w / (mse + 1e-8), w)
+    return w / w.sum(axis=1, keepdims=True)
+
+
+def _components(st: Dict[str, np.ndarray], year: np.ndarray) -> np.ndarray:
+    """(rows, kinds) one-step forecasts of the observation at ``year``."""
+    naive = st["last_value"]
+    holt = np.where(st["n"] >= 2, st["level"] + st["phi"] * st["trend"], naive)
+    a, b, loglin = _loglinear_coef(st)
+    with np.errstate(over="ignore"):
+        loglinear = np.where(loglin, np.exp(a + b * (year - st["t0"])), naive)
+    c, phi, _ = _ar_coef(st)
+    ar = naive + c + phi * st["last_diff"] * (st["dn"] > 0)
+    return np.stack([holt, loglinear, ar], axis=1)
+
+
+def _observe(st: Dict[str, np.ndarray], year: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Fold one new observation per row into the state.
+
+    Returns (rows, kinds + 1): each model's one-step error followed by the
+    observed value, NaN while the models are still warming up.
+
+    Both the batch fit and incremental updates go through here, so appending
+    a year gives the same state as refitting the longer series with the same
+    Holt parameters (the grid search runs at fit time only).
+    """
+    first = st["n"] == 0
+    err = np.full((len(y), len(KINDS) + 1), np.nan)
+    scored = st["n"] >= 3  # every model is past its warm-up
+    if scored.any():
+        parts = _components(st, year)
+        err = np.where(scored[:, None], np.column_stack([y[:, None] - parts, y]), np.nan)
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            rel = np.where(parts != 0, (y[:, None] - parts) / np.abs(parts), 0.0)
+        for j, k in enumerate(KINDS):
+            st[f"e_{k}"] += np.where(scored, np.minimum(rel[:, j] ** 2, 1e6), 0.0)
+        st["nres"] += scored
+
+    # Holt: trend initialized from the first difference, damped updates afterwards
+    second = st["n"] == 1
+    f_h = st["level"] + st["phi"] * st["trend"]
+    level = st["alpha"] * y + (1.0 - st["alpha"]) * f_h
+    trend = st["beta"] * (level - st["level"]) + (1.0 - st["beta"]) * st["phi"] * st["trend"]
+    st["trend"] = np.where(first, 0.0, np.where(second, y - st["last_value"], trend))
+    st["level"] = np.where(first | second, y, level)
+
+    # log-linear: running sums of t and log(y); any non-positive value disables it
+    st["t0"] = np.where(first, year, st["t0"])
+    positive = y > 0
+    st["ok"] &= positive
+    t = year - st["t0"]
+    z = np.log(np.where(positive, y, 1.0))
+    st["s0"] += 1.0
+    st["s1"] += t
+    st["s2"] += t * t
+    st["sz"] += z
+    st["stz"] += t * z
+
+    # AR(1) on differences: running sums of (d_{t-1}, d_t) pairs
+    d = np.where(first, 0.0, y - st["last_value"])
+    pair = st["n"] >= 2
+    st["pn"] += pair
+    st["pu"] += np.where(pair, st["last_diff"], 0.0)
+    st["pv"] += np.where(pair, d, 0.0)
+    st["puu"] += np.where(pair, st["last_diff"] ** 2, 0.0)
+    st["puv"] += np.where(pair, st["last_diff"] * d, 0.0)
+    st["dn"] += ~first
+    st["dsum"] += d
+    st["last_diff"] = d
+
+    st["last_value"] = y.astype(np.float64)
+    st["last_year"] = year.astype(np.float64)
+    st["n"] += 1.0
+    return err
+
+
+def _holt_params(values: np.ndarray) -> np.ndarray:
+    """(3, rows) alpha/beta/phi minimizing one-step SSE over the grid, per row."""
+    m, n = values.shape
+    if n < 4:
+        return np.tile(np.array(_DEFAULT_HOLT)[:, None], (1, m))
+    alpha, beta, phi = (g[:, None] for g in _GRID)  # (G, 1)
+    level = np.broadcast_to(values[:, 1], (len(_GRID[0]), m)).copy()
+    trend = np.broadcast_to(values[:, 1] - values[:, 0], (len(_GRID[0]), m)).copy()
+    sse = np.zeros_like(level)
+    for t in range(2, n):
+        f = level + phi * trend
+        y = values[:, t]
+        if t >= 3:
+            sse += (y - f) ** 2
+        new_level = alpha * y + (1.0 - alpha) * f
+        trend = beta * (new_level - level) + (1.0 - beta) * phi * trend
+        level = new_level
+    return _GRID[:, np.argmin(sse, axis=0)]
+
+
+def _row_quantiles(values: np.ndarray, qs: Tuple[float, float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-row linear-interpolated quantiles ignoring non-finite entries."""
+    values = np.where(np.isfinite(values), values, np.inf)
+    ordered = np.sort(values, axis=1)
+    count = np.isfinite(values).sum(axis=1)
+    out = []
+    for q in qs:
+        pos = np.maximum(count - 1, 0) * q
+        lo = np.floor(pos).astype(np.intp)
+        hi = np.minimum(lo + 1, np.maximum(count - 1, 0))
+        a = np.take_along_axis(ordered, lo[:, None], axis=1)[:, 0]
+        b = np.take_along_axis(ordered, hi[:, None], axis=1)[:, 0]
+        with np.errstate(invalid="ignore"):
+            out.append(np.where(count > 0, a + (b - a) * (pos - lo), 0.0))
+    return out[0], out[1], count
+
+
+class FastModels:
+    """Fast-tier state for a set of industries, one row per industry.
+
+    ``fit`` groups series by length and runs each group as one matrix
+    recursion; ``update`` appends new observations to existing rows.
+    """
+
+    def __init__(self, keys: List[str], state: Dict[str, np.ndarray], residuals: np.ndarray) -> None:
+        self.keys = keys
+        self.rows = {k: i for i, k in enumerate(keys)}
+        self.state = state
+        self.residuals = residuals
+        self.version: Optional[int] = None
+        self.updates = 0
+        self._series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    @classmethod
+    def fit(cls, series_list: List[IndustrySeries]) -> "FastModels":
+        series_list = [s for s in series_list if len(s.years) > 0]
+        m = len(series_list)
+        state = _empty_state(m)
+        # one-step errors are scored from the fourth observation on
+        width = max([len(s.years) - 3 for s in series_list] + [1])
+        residuals = np.full((m, width, len(KINDS) + 1), np.nan)
+        groups: Dict[int, List[int]] = {}
+        for i, s in enumerate(series_list):
+            groups.setdefault(len(s.years), []).append(i)
+        for n, rows in groups.items():
+            idx = np.array(rows)
+            years = np.array([series_list[i].years for i in rows], dtype=np.float64)
+            values = np.array([series_list[i].value_added for i in rows], dtype=np.float64)
+            sub = {name: arr[idx] for name, arr in state.items()}
+            sub["alpha"], sub["beta"], sub["phi"] = _holt_params(values)
+            for t in range(n):
+                err = _observe(sub, years[:, t], values[:, t])
+                if t >= 3:
+                    residuals[idx, t - 3] = err
+            for name, arr in sub.items():
+                state[name][idx] = arr
+        models = cls([s.key for s in series_list], state, residuals)
+        models._series = {s.key: (s.years, s.value_added) for s in series_list}
+        return models
+
+    def update(self, keys: List[str], years: np.ndarray, values: np.ndarray) -> None:
+        """Append one new observation per key (keys must already be fitted)."""
+        idx = np.array([self.rows[k] for k in keys], dtype=np.intp)
+        sub = {name: arr[idx] for name, arr in self.state.items()}
+        pos = sub["nres"].astype(np.intp)
+        err = _observe(sub, np.asarray(years, dtype=np.float64), np.asarray(values, dtype=np.float64))
+        # same slots as the batch fit: one per observation from the fourth on
+        scored = sub["nres"].astype(np.intp) > pos
+        for name, arr in sub.items():
+            self.state[name][idx] = arr
+        if scored.any():
+            need = int(pos[scored].max()) + 1
+            if need > self.residuals.shape[1]:
+                grow = np.full((len(self.keys), need - self.residuals.shape[1], len(KINDS) + 1), np.nan)
+                self.residuals = np.concatenate([self.residuals, grow], axis=1)
+            self.residuals[idx[scored], pos[scored]] = err[scored]
+
+    def advance(self, series_list: List[IndustrySeries]) -> "FastModels":
+        """Models for a newer dataset: appended years are folded in, anything else is refit."""
+        extend: List[Tuple[IndustrySeries, int]] = []
+        refit: List[IndustrySeries] = []
+        for s in series_list:
+            old = self._series.get(s.key)
+            n = 0 if old is None else len(old[0])
+            if (
+                old is not None
+                and len(s.years) >= n
+                and np.array_equal(s.years[:n], old[0])
+                and np.array_equal(s.value_added[:n], old[1])
+            ):
+                extend.append((s, n))
+            else:
+                refit.append(s)
+
+        kept = [self.rows[s.key] for s, _ in extend]
+        state = {name: arr[kept].copy() for name, arr in self.state.items()}
+        residuals = self.residuals[kept].copy()
+        fresh = FastModels.fit(refit)
+        if fresh.keys:
+            width = max(residuals.shape[1], fresh.residuals.shape[1])
+            pad = lambda r: np.pad(r, ((0, 0), (0, width - r.shape[1]), (0, 0)), constant_values=np.nan)  # noqa: E731
+            state = {name: np.concatenate([state[name], fresh.state[name]]) for name in state}
+            residuals = np.concatenate([pad(residuals), pad(fresh.residuals)])
+        models = FastModels([s.key for s, _ in extend] + fresh.keys, state, residuals)
+        models._series = {s.key: (s.years, s.value_added) for s, _ in extend}
+        models._series.update(fresh._series)
+
+        # fold in appended points column by column, vectorized across industries
+        step = 0
+        while True:
+            batch = [(s, n + step) for s, n in extend if n + step < len(s.years)]
+            if not batch:
+                break
+            models.update(
+                [s.key for s, _ in batch],
+                np.array([s.years[j] for s, j in batch]),
+                np.array([s.value_added[j] for s, j in batch]),
+            )
+            step += 1
+        models.updates = sum(len(s.years) - n for s, n in extend)
+        return models
+
+    def forecast(self, keys: List[str], horizon_years: int) -> Tuple[np.ndarray, ...]:
+        """(years, prediction, lower, upper, weights) arrays, one row per key."""
+        idx = np.array([self.rows[k] for k in keys], dtype=np.intp)
+        st = {name: arr[idx] for name, arr in self.state.items()}
+        steps = np.arange(1, horizon_years + 1, dtype=np.float64)
+        years = st["last_year"][:, None] + steps[None, :]
+
+        damp = np.cumsum(st["phi"][:, None] ** steps[None, :], axis=1)
+        holt = st["level"][:, None] + damp * st["trend"][:, None]
+        holt = np.where(st["n"][:, None] >= 2, holt, st["last_value"][:, None])
+
+        a, b, loglin = _loglinear_coef(st)
+        with np.errstate(over="ignore"):
+            loglinear = np.exp(a[:, None] + b[:, None] * (years - st["t0"][:, None]))
+        loglinear = np.where(loglin[:, None], loglinear, st["last_value"][:, None])
+
+        c, phi, _ = _ar_coef(st)
+        diffs = np.empty((len(idx), horizon_years))
+        d = st["last_diff"] * (st["dn"] > 0)
+        for k in range(horizon_years):
+            d = c + phi * d
+            diffs[:, k] = d
+        ar = st["last_value"][:, None] + np.cumsum(diffs, axis=1)
+
+        w = _weights(st)
+        ens = w[:, 0:1] * holt + w[:, 1:2] * loglinear + w[:, 2:3] * ar
+
+        # past one-step errors of the ensemble as it is weighted now
+        res = self.residuals[idx]
+        e = np.einsum("rtk,rk->rt", res[:, :, : len(KINDS)], w)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rel = e / np.abs(res[:, :, -1] - e)
+        q_lo, q_hi, count = _row_quantiles(rel, _QUANTILES)
+        enough = count >= _MIN_RESIDUALS
+        q_lo = np.where(enough, np.minimum(q_lo, 0.0), -_FALLBACK_BAND)
+        q_hi = np.where(enough, np.maximum(q_hi, 0.0), _FALLBACK_BAND)
+        # errors compound with the horizon; the fixed fallback band does not
+        spread = np.where(enough[:, None], np.sqrt(steps)[None, :], 1.0)
+        scale = np.abs(ens) * spread
+        lo = ens + q_lo[:, None] * scale
+        hi = ens + q_hi[:, None] * scale
+        return years.astype(np.int64), ens, lo, hi, w
+
+
+_LOCK = threading.Lock()
+_CURRENT: Optional[FastModels] = None
+_STATS = {"fits": 0, "advances": 0, "updates": 0}
+
+
+def models_for(index: EconomyIndex) -> FastModels:
+    """Fast-tier models for every industry in ``index``, advanced incrementally on reload."""
+    global _CURRENT
+    with _LOCK:
+        current = _CURRENT
+        if current is not None and current.version == index.version:
+            return current
+        series_list = [index.get(k) for k in index.keys]
+        if current is None:
+            models = FastModels.fit(series_list)
+            _STATS["fits"] += 1
+        else:
+            models = current.advance(series_list)
+            _STATS["advances"] += 1
+            _STATS["updates"] += models.updates
+        models.version = index.version
+        _CURRENT = models
+        return models
+
+
+def forecast_series(
+    series_list: List[IndustrySeries], index: EconomyIndex, horizon_years: int
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, float]]]:
+    """Fast-tier (years, prediction, lower, upper, weights) per series, in order.
+
+    Series of the index use the shared models; anything else (e.g. a fuzzy
+    match spanning several industries) is fitted on the spot.
+    """
+    models = models_for(index)
+    adhoc = [s for s in series_list if s.key not in models]
+    extra = FastModels.fit(adhoc) if adhoc else None
+    out = []
+    for s in series_list:
+        source = models if s.key in models else extra
+        years, ens, lo, hi, w = source.forecast([s.key], horizon_years)
+        out.append((years[0], ens[0], lo[0], hi[0], dict(zip(KINDS, w[0].tolist()))))
+    return out
+
+
+def stats() -> Dict[str, Any]:
+    current = _CURRENT
+    return {
+        **_STATS,
+        "version": None if current is None else current.version,
+        "industries": 0 if current is None else len(current.keys),
+    }
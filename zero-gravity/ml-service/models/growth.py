@@ -1,150 +1,375 @@
-import json
+import multiprocessing
 import os
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
 
-_ENABLE_PROPHET = bool(os.getenv("ENABLE_PROPHET", ""))
-_ENABLE_ARIMA = bool(os.getenv("ENABLE_ARIMA", ""))
-if _ENABLE_PROPHET:
+from models import fast
+from models.artifacts import ARTIFACTS
+from models.backends import available, backend
+from models.telemetry import span
+from models.cache import MISSING, LRUCache
+from models.materialized import MATERIALIZED
+from models.economy import STORE, EconomyIndex, IndustrySeries, economy_index
+
+# sklearn, Prophet (ENABLE_PROPHET) and statsmodels (ENABLE_ARIMA) are imported
+# on first fit through models.backends; a backend that fails to import drops
+# out of enabled_kinds() and its share of the ensemble uses the baseline.
+MODEL_WEIGHTS: Dict[str, float] = {"prophet": 0.4, "rf": 0.35, "arima": 0.25}
+PROPHET_PARAMS: Dict[str, Any] = {"yearly_seasonality": True}
+ARIMA_ORDER: Tuple[int, int, int] = (1, 1, 1)
+RF_PARAMS: Dict[str, Any] = {"n_estimators": 200, "random_state": 42}
+# lower/upper band as a fraction of the ensemble
+BAND: Tuple[float, float] = (0.85, 1.15)
+
+# Level 1: fitted models per (industry, model kind, data version).
+# Level 2: final ensemble arrays per (industry, horizon, data version).
+_MODEL_CACHE = LRUCache(maxsize=int(os.getenv("GROWTH_MODEL_CACHE_SIZE", "256")))
+_FORECAST_CACHE = LRUCache(
+    maxsize=int(os.getenv("GROWTH_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("GROWTH_CACHE_TTL", "3600")),
+)
+
+
+# "full" runs the Prophet/ARIMA/RF ensemble; "fast" the vectorized models in models/fast.py
+_TIER = os.getenv("GROWTH_TIER", "full")
+TIERS = ("full", "fast")
+
+# Optional fan-out of (industry x model) fits to a process pool
+_PARALLEL = bool(os.getenv("GROWTH_PARALLEL", ""))
+_MAX_WORKERS = int(os.getenv("GROWTH_MAX_WORKERS", "0")) or os.cpu_count() or 1
+_FIT_TIMEOUT = float(os.getenv("GROWTH_FIT_TIMEOUT", "0")) or None
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+# Pool fits not finished yet, per (industry, kind, version); guarded by _POOL_LOCK
+_INFLIGHT: Dict[Tuple[str, str, int], "Future[Optional[Any]]"] = {}
+
+
+def _invalidate() -> None:
+    _MODEL_CACHE.clear()
+    _FORECAST_CACHE.clear()
+
+
+STORE.subscribe(_invalidate)
+
+
+def enabled_kinds() -> List[str]:
+    kinds = ["rf"]
+    if available("prophet"):
+        kinds.append("prophet")
+    if available("statsmodels"):
+        kinds.append("arima")
+    return kinds
+
+
+def _fit_prophet(years: np.ndarray, values: np.ndarray) -> Any:
+    df_prophet = pd.DataFrame({
+        "ds": pd.to_datetime([f"{y}-12-31" for y in years]),
+        "y": values,
+    })
+    m = backend("prophet").Prophet(**PROPHET_PARAMS)
+    m.fit(df_prophet)
+    return m
+
+
+def _predict_prophet(m: Any, years: np.ndarray, values: np.ndarray, horizon_years: int) -> np.ndarray:
+    future = m.make_future_dataframe(periods=horizon_years, freq="Y")
+    return m.predict(future).tail(horizon_years)["yhat"].values
+
+
+def _fit_arima(years: np.ndarray, values: np.ndarray) -> Any:
+    return backend("statsmodels").ARIMA(values, order=ARIMA_ORDER).fit()
+
+
+def _predict_arima(arima: Any, years: np.ndarray, values: np.ndarray, horizon_years: int) -> np.ndarray:
+    return arima.forecast(horizon_years)
+
+
+def _fit_rf(years: np.ndarray, values: np.ndarray) -> Any:
+    # Random Forest with simple features
+    lag1 = pd.Series(values).shift(1).bfill().values
+    ma3 = pd.Series(values).rolling(3).mean().bfill().values
+    X = np.column_stack([years, lag1, ma3])
+    rf = backend("sklearn").RandomForestRegressor(**RF_PARAMS)
+    rf.fit(X, values)
+    return rf
+
+
+def _predict_rf(rf: Any, years: np.ndarray, values: np.ndarray, horizon_years: int) -> np.ndarray:
+    last_year = years.max()
+    fut_years = np.arange(last_year + 1, last_year + 1 + horizon_years)
+    Xf = np.column_stack([
+        fut_years,
+        np.repeat(values[-1], horizon_years),
+        np.repeat(pd.Series(values).tail(3).mean(), horizon_years),
+    ])
+    return rf.predict(Xf)
+
+
+_FITTERS = {"prophet": _fit_prophet, "arima": _fit_arima, "rf": _fit_rf}
+_PREDICTORS = {"prophet": _predict_prophet, "arima": _predict_arima, "rf": _predict_rf}
+
+
+def fit_model(kind: str, years: np.ndarray, values: np.ndarray) -> Optional[Any]:
+    """Fit one model kind on a series; ``None`` if fitting fails."""
     try:
-        from prophet import Prophet  # type: ignore
+        return _FITTERS[kind](years, values)
     except Exception:
-        _ENABLE_PROPHET = False
-if _ENABLE_ARIMA:
+        return None
+
+
+def _fit_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn: forking a threaded server process is not safe
+            _POOL = ProcessPoolExecutor(
+                max_workers=_MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _POOL
+
+
+def shutdown_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+def _store_fit(key: Tuple[str, str, int], fut: "Future[Optional[Any]]") -> None:
+    with _POOL_LOCK:
+        if _INFLIGHT.get(key) is fut:
+            del _INFLIGHT[key]
+    if not fut.cancelled() and fut.exception() is None:
+        _MODEL_CACHE.set(key, fut.result())
+
+
+def _prefit(series_list: List[IndustrySeries], version: int) -> Set[Tuple[str, str]]:
+    """Fit every missing (industry, kind) model concurrently in the pool.
+
+    Trained artifacts are used where they match, and a fit still running
+    for an earlier request is joined rather than submitted again. All fits
+    share one ``GROWTH_FIT_TIMEOUT`` deadline; the (industry, kind) pairs
+    not done by then are returned. Those fall back to the baseline for this
+    request and are cached once the fit finishes in the background.
+    """
+    pending: Dict[Tuple[str, str, int], IndustrySeries] = {}
+    for series in series_list:
+        for kind in enabled_kinds():
+            key = (series.key, kind, version)
+            if key in _MODEL_CACHE:
+                continue
+            model = ARTIFACTS.load(series.key, kind, series.digest())
+            if model is not MISSING:
+                _MODEL_CACHE.set(key, model)
+                continue
+            pending[key] = series
+
+    with _POOL_LOCK:
+        futures = {key: _INFLIGHT[key] for key in pending if key in _INFLIGHT}
+    if not futures and len(pending) < 2:
+        return set()
+
     try:
-        from statsmodels.tsa.arima.model import ARIMA  # type: ignore
+        pool = _fit_pool()
+        for key, series in pending.items():
+            if key in futures:
+                continue
+            fut = pool.submit(fit_model, key[1], np.asarray(series.years), np.asarray(series.value_added))
+            with _POOL_LOCK:
+                _INFLIGHT[key] = fut
+            futures[key] = fut
+            fut.add_done_callback(lambda f, k=key: _store_fit(k, f))
     except Exception:
-        _ENABLE_ARIMA = False
+        # broken pool etc.: whatever was not submitted is fitted in-process
+        pass
+
+    done, not_done = wait(list(futures.values()), timeout=_FIT_TIMEOUT)
+    for key, fut in futures.items():
+        if fut in done:
+            # done callbacks may still be pending when wait() returns
+            _store_fit(key, fut)
+    return {(key[0], key[1]) for key, fut in futures.items() if fut in not_done}
+
 
+def _fitted_model(kind: str, series: IndustrySeries, version: int) -> Optional[Any]:
+    """Fitted model for the series, memoized; ``None`` if fitting failed."""
+    key = (series.key, kind, version)
+    model = _MODEL_CACHE.get(key)
+    if model is MISSING:
+        with span("growth.artifact_load"):
+            model = ARTIFACTS.load(series.key, kind, series.digest())
+        if model is MISSING:
+            with span(f"growth.fit.{kind}"):
+                model = fit_model(kind, series.years, series.value_added)
+        _MODEL_CACHE.set(key, model)
+    return model
 
-def _load_economy() -> pd.DataFrame:
+
+def preload_artifacts() -> int:
+    """Seed the model memo from trained artifacts that match the current data."""
+    index = economy_index()
+    loaded = 0
+    for key in index.keys:
+        series = index.get(key)
+        digest = series.digest()
+        for kind in enabled_kinds():
+            if (key, kind, index.version) in _MODEL_CACHE:
+                continue
+            model = ARTIFACTS.load(key, kind, digest)
+            if model is not MISSING:
+                _MODEL_CACHE.set((key, kind, index.version), model)
+                loaded += 1
+    return loaded
+
+
+def _predict(
+    kind: str, series: IndustrySeries, version: int, horizon_years: int, skip: FrozenSet[str] = frozenset()
+) -> np.ndarray:
+    values = series.value_added
+    baseline = np.repeat(values[-1], horizon_years)
+    if kind not in enabled_kinds() or kind in skip:
+        return baseline
+    model = _fitted_model(kind, series, version)
+    if model is None:
+        return baseline
     try:
-        with open("data/space_economy.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return pd.DataFrame(data)
-    except FileNotFoundError:
-        # Fallback: parse minimal columns from Business.xlsx if present
-        try:
-            xls_path = "ml-service/data/Business.xlsx"
-            # Attempt to read the first sheet and infer columns
-            df = pd.read_excel(xls_path, engine="openpyxl")
-            # Heuristic normalization - expect columns Year, Industry, ValueAdded, Employment
-            columns_lower = {c: str(c).strip().lower() for c in df.columns}
-            df.columns = list(columns_lower.values())
-            # Rename commonly seen headers
-            renames = {
-                "year": "year",
-                "industry": "industry_id",
-                "value added": "valueAddedCurrentUSD",
-                "valueadded": "valueAddedCurrentUSD",
-                "employment": "employment",
-            }
-            for old, new in renames.items():
-                if old in df.columns:
-                    df[new] = df[old]
-            df = df[["year", "industry_id", "valueAddedCurrentUSD", "employment"]].dropna()
-            return df
-        except Exception:
-            # Final fallback: tiny synthetic data to keep service responsive
-            years = list(range(2012, 2024))
-            rows = []
-            for ind in ["manufacturing", "space_vehicles", "information", "professional_rd"]:
-                base = 20000.0 + (hash(ind) % 7000)
-                vals = (np.array(years) - years[0] + 1) * (base / len(years))
-                emp = 10000 + (np.array(years) - years[0]) * 120
-                for y, v, e in zip(years, vals, emp):
-                    rows.append({
-                        "year": y,
-                        "industry_id": ind,
-                        "valueAddedCurrentUSD": float(v),
-                        "employment": float(e),
-                    })
-            return pd.DataFrame(rows)
-
-
-def forecast_growth(industry_ids: List[str], horizon_years: int) -> Dict[str, Any]:
-    econ = _load_economy()
-    out: List[Dict[str, Any]] = []
+        with span(f"growth.predict.{kind}"):
+            return _PREDICTORS[kind](model, series.years, values, horizon_years)
+    except Exception:
+        return baseline
+
+
+def _config() -> Dict[str, Any]:
+    """Model settings a materialized forecast must have been computed with."""
+    return {
+        "kinds": enabled_kinds(),
+        "modelWeights": dict(MODEL_WEIGHTS),
+        "prophet": dict(PROPHET_PARAMS),
+        "arima": list(ARIMA_ORDER),
+        "rf": dict(RF_PARAMS),
+        "band": list(BAND),
+    }
+
 
-    for ind in industry_ids:
-        series = econ[econ["industry_id"].astype(str).str.lower() == ind.lower()].sort_values("year")
-        if series.empty:
-            # if missing, attempt fuzzy match by contains
-            alt = econ[econ["industry_id"].astype(str).str.contains(ind, case=False, na=False)]
-            series = alt.sort_values("year") if not alt.empty else econ.head(0)
-
-        if series.empty:
-            continue
-
-        years = series["year"].astype(int).tolist()
-        values = series["valueAddedCurrentUSD"].astype(float).values
-
-        # Prophet
-        if _ENABLE_PROPHET:
-            try:
-                df_prophet = pd.DataFrame({
-                    "ds": pd.to_datetime(series["year"].astype(str) + "-12-31"),
-                    "y": values,
-                })
-                m = Prophet(yearly_seasonality=True)
-                m.fit(df_prophet)
-                future = m.make_future_dataframe(periods=horizon_years, freq="Y")
-                yhat_prophet = m.predict(future).tail(horizon_years)["yhat"].values
-            except Exception:
-                yhat_prophet = np.repeat(values[-1], horizon_years)
-        else:
-            yhat_prophet = np.repeat(values[-1], horizon_years)
-
-        # ARIMA quick baseline
-        if _ENABLE_ARIMA:
-            try:
-                arima = ARIMA(values, order=(1, 1, 1)).fit()
-                yhat_arima = arima.forecast(horizon_years)
-            except Exception:
-                yhat_arima = np.repeat(values[-1], horizon_years)
-        else:
-            yhat_arima = np.repeat(values[-1], horizon_years)
-
-        # Random Forest with simple features
-        try:
-            years_arr = np.array(years)
-            lag1 = pd.Series(values).shift(1).bfill().values
-            ma3 = pd.Series(values).rolling(3).mean().bfill().values
-            X = np.column_stack([years_arr, lag1, ma3])
-            y = values
-            rf = RandomForestRegressor(n_estimators=200, random_state=42)
-            rf.fit(X, y)
-            last_year = years_arr.max()
-            fut_years = np.arange(last_year + 1, last_year + 1 + horizon_years)
-            Xf = np.column_stack([
-                fut_years,
-                np.repeat(values[-1], horizon_years),
-                np.repeat(pd.Series(values).tail(3).mean(), horizon_years),
-            ])
-            yhat_rf = rf.predict(Xf)
-        except Exception:
-            last_year = int(series["year"].max())
-            fut_years = np.arange(last_year + 1, last_year + 1 + horizon_years)
-            yhat_rf = np.repeat(values[-1], horizon_years)
-
-        # Weighted ensemble
-        ens = 0.4 * yhat_prophet + 0.35 * yhat_rf + 0.25 * yhat_arima
-        lo, hi = ens * 0.85, ens * 1.15
-
-        out.append(
-            {
-                "industry_id": ind,
-                "years": fut_years.astype(int).tolist(),
-                "prediction": ens.astype(float).tolist(),
-                "lower": lo.astype(float).tolist(),
-                "upper": hi.astype(float).tolist(),
-                "modelWeights": {"prophet": 0.4, "rf": 0.35, "arima": 0.25},
-            }
-        )
+def _materialized(series: IndustrySeries, horizon_years: int) -> Optional[Tuple[np.ndarray, ...]]:
+    with span("growth.materialized"):
+        ens = MATERIALIZED.growth(series, horizon_years, _config())
+    if ens is None:
+        return None
+    last_year = int(series.years.max())
+    return np.arange(last_year + 1, last_year + 1 + horizon_years), ens, ens * BAND[0], ens * BAND[1]
 
+
+def _forecast_series(
+    series: IndustrySeries, version: int, horizon_years: int, skip: FrozenSet[str] = frozenset()
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    key = (series.key, horizon_years, version)
+    cached = _FORECAST_CACHE.get(key)
+    if cached is not MISSING:
+        return cached
+
+    yhat_prophet = _predict("prophet", series, version, horizon_years, skip)
+    yhat_arima = _predict("arima", series, version, horizon_years, skip)
+    yhat_rf = _predict("rf", series, version, horizon_years, skip)
+    last_year = int(series.years.max())
+    fut_years = np.arange(last_year + 1, last_year + 1 + horizon_years)
+
+    # Weighted ensemble
+    ens = (
+        MODEL_WEIGHTS["prophet"] * yhat_prophet
+        + MODEL_WEIGHTS["rf"] * yhat_rf
+        + MODEL_WEIGHTS["arima"] * yhat_arima
+    )
+    lo, hi = ens * BAND[0], ens * BAND[1]
+    result = (fut_years, ens, lo, hi)
+    if not skip:
+        # degraded (timed-out) results are not worth remembering
+        _FORECAST_CACHE.set(key, result)
+    return result
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        "models": _MODEL_CACHE.stats(),
+        "forecasts": _FORECAST_CACHE.stats(),
+        "artifacts": ARTIFACTS.stats(),
+        "fast": fast.stats(),
+        "materialized": MATERIALIZED.stats(),
+    }
+
+
+def _forecast_fast(
+    matched: List[Tuple[str, IndustrySeries]], horizon_years: int, index: EconomyIndex
+) -> Dict[str, Any]:
+    with span("growth.fast"):
+        results = fast.forecast_series([s for _, s in matched], index, horizon_years)
+    out: List[Dict[str, Any]] = []
+    with span("growth.serialize"):
+        for (ind, _), (fut_years, ens, lo, hi, weights) in zip(matched, results):
+            out.append(
+                {
+                    "industry_id": ind,
+                    "years": fut_years.astype(int).tolist(),
+                    "prediction": ens.astype(float).tolist(),
+                    "lower": lo.astype(float).tolist(),
+                    "upper": hi.astype(float).tolist(),
+                    "modelWeights": weights,
+                    "tier": "fast",
+                }
+            )
     return {"items": out}
 
 
+def forecast_growth(
+    industry_ids: List[str],
+    horizon_years: int,
+    index: Optional[EconomyIndex] = None,
+    tier: Optional[str] = None,
+) -> Dict[str, Any]:
+    with span("growth.load"):
+        index = index or economy_index()
+    out: List[Dict[str, Any]] = []
+
+    matched: List[Tuple[str, IndustrySeries]] = []
+    with span("growth.match"):
+        for ind in industry_ids:
+            # exact match, or fuzzy match by contains if missing
+            series = index.lookup(ind)
+            if series is None or len(series.years) == 0:
+                continue
+            matched.append((ind, series))
+
+    if (tier or _TIER) == "fast":
+        return _forecast_fast(matched, horizon_years, index)
+
+    stored = {s.key: _materialized(s, horizon_years) for _, s in matched}
+    timed_out: Set[Tuple[str, str]] = set()
+    if _PARALLEL:
+        uncached = [
+            s for _, s in matched
+            if stored[s.key] is None and (s.key, horizon_years, index.version) not in _FORECAST_CACHE
+        ]
+        with span("growth.prefit"):
+            timed_out = _prefit(uncached, index.version)
+
+    for ind, series in matched:
+        skip = frozenset(kind for key, kind in timed_out if key == series.key)
+        fut_years, ens, lo, hi = stored[series.key] or _forecast_series(series, index.version, horizon_years, skip)
+        with span("growth.serialize"):
+            out.append(
+                {
+                    "industry_id": ind,
+                    "years": fut_years.astype(int).tolist(),
+                    "prediction": ens.astype(float).tolist(),
+                    "lower": lo.astype(float).tolist(),
+                    "upper": hi.astype(float).tolist(),
+                    "modelWeights": dict(MODEL_WEIGHTS),
+                }
+            )
+
+    return {"items": out}
@@ -1,7 +1,12 @@
-from typing import List, Dict, Any
+import hashlib
+import json
+from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
-import pandas as pd
+
+from models.economy import EconomyIndex, economy_index
+from models.materialized import MATERIALIZED
+from models.telemetry import span
 
 # Base weights for all 50 states + DC (relative concentration). These are
 # heuristic but plausible; they will be normalized per year and industry and
@@ -14,12 +19,12 @@ STATE_BASE_WEIGHTS: Dict[str, float] = {
     "MD": 0.95, "MA": 0.95, "DC": 0.90, "NY": 0.88, "PA": 0.86, "NC": 0.84,
     "GA": 0.82, "MO": 0.80, "LA": 0.78, "UT": 0.78, "IL": 0.78, "MI": 0.76,
     # Tier 3 broader base
-    "TN": 0.70, "SC": 0.68, "VA": 1.05, "OR": 0.68, "OK": 0.66, "WI": 0.64,
+    "TN": 0.70, "SC": 0.68, "OR": 0.68, "OK": 0.66, "WI": 0.64,
     "MN": 0.66, "IN": 0.64, "NJ": 0.66, "CT": 0.62, "NH": 0.60, "VT": 0.56,
     "ME": 0.56, "RI": 0.56, "DE": 0.58, "KY": 0.60, "AR": 0.58, "MS": 0.56,
     "IA": 0.58, "KS": 0.58, "NE": 0.56, "ND": 0.52, "SD": 0.52, "ID": 0.54,
     "MT": 0.52, "WY": 0.50, "WV": 0.54, "NV": 0.70, "AK": 0.50, "HI": 0.56,
-    "NM": 0.85, "PR": 0.40,  # PR placeholder if needed by future UI
+    "PR": 0.40,  # PR placeholder if needed by future UI
 }
 
 # Industry-specific emphasis factors (multiplicative on base weights)
@@ -43,119 +48,359 @@ INDUSTRY_BIAS: Dict[str, Dict[str, float]] = {
     },
 }
 
-def _normalized_state_weights(industry_id: str, rel_year_index: int) -> Dict[str, float]:
-    """Compute normalized weights for all states with industry bias and drift.
+# Drift: shift ~1% per year toward top hubs for the industry
+DRIFT_STATES: Dict[str, List[str]] = {
+    "space_vehicles": ["FL", "TX", "AL", "NM"],
+    "information": ["CA", "WA", "VA", "CO"],
+    "professional_rd": ["MA", "MD", "DC", "VA"],
+}
+DEFAULT_DRIFT_STATES: List[str] = ["CA", "TX", "AZ", "OH"]
+DRIFT_RATE = 0.01  # 1% per year toward hubs
+
+MULTIPLIERS: Dict[str, float] = {"direct": 1.0, "indirect": 0.4, "induced": 0.3}
+
+
+class Geography:
+    """Array form of the state tables.
 
-    rel_year_index is 0 for first forecast year, 1 for next, etc.
-    We apply modest drift toward relevant hubs over time.
+    Holds the base weights as a vector over ``states`` plus an
+    (industries + 1) x states bias matrix and drift mask; the extra last row
+    is the default used for industries without an entry.
     """
-    # Copy base and apply bias
-    weights = STATE_BASE_WEIGHTS.copy()
-    bias = INDUSTRY_BIAS.get(industry_id, {})
-    for st, b in bias.items():
-        if st in weights:
-            weights[st] *= b
-
-    # Drift: shift ~1% per year toward top hubs for the industry
-    drift_states: List[str]
-    if industry_id == "space_vehicles":
-        drift_states = ["FL", "TX", "AL", "NM"]
-    elif industry_id == "information":
-        drift_states = ["CA", "WA", "VA", "CO"]
-    elif industry_id == "professional_rd":
-        drift_states = ["MA", "MD", "DC", "VA"]
-    else:
-        drift_states = ["CA", "TX", "AZ", "OH"]
-
-    drift_rate = 0.01  # 1% per year toward hubs
-    for st in drift_states:
-        if st in weights:
-            weights[st] *= (1.0 + drift_rate) ** max(0, rel_year_index)
-
-    # Normalize to sum to 1
-    total = float(sum(v for k, v in weights.items() if len(k) <= 2))
-    if total <= 0:
-        n = sum(1 for k in weights.keys() if len(k) <= 2)
-        return {k: 1.0 / max(1, n) for k in weights.keys() if len(k) <= 2}
-    return {k: v / total for k, v in weights.items() if len(k) <= 2}
 
-MULTIPLIERS: Dict[str, float] = {"direct": 1.0, "indirect": 0.4, "induced": 0.3}
+    __slots__ = ("states", "index", "_rows", "base", "bias", "drift_mask", "drift_rate", "digest")
 
+    def __init__(
+        self,
+        base_weights: Dict[str, float],
+        industry_bias: Dict[str, Dict[str, float]],
+        drift_states: Dict[str, List[str]],
+        default_drift_states: List[str],
+        drift_rate: float = DRIFT_RATE,
+    ) -> None:
+        self.states: List[str] = [k for k in base_weights if len(k) <= 2]
+        self.index: Dict[str, int] = {st: j for j, st in enumerate(self.states)}
+        col = self.index
+        names = list(dict.fromkeys(list(industry_bias) + list(drift_states)))
+        self._rows: Dict[str, int] = {ind: i for i, ind in enumerate(names)}
+        self.base = np.array([base_weights[st] for st in self.states], dtype=np.float64)
+        self.bias = np.ones((len(names) + 1, len(self.states)), dtype=np.float64)
+        self.drift_mask = np.zeros((len(names) + 1, len(self.states)), dtype=bool)
+        for ind, i in self._rows.items():
+            for st, b in industry_bias.get(ind, {}).items():
+                if st in col:
+                    self.bias[i, col[st]] = b
+            for st in drift_states.get(ind, default_drift_states):
+                if st in col:
+                    self.drift_mask[i, col[st]] = True
+        for st in default_drift_states:
+            if st in col:
+                self.drift_mask[-1, col[st]] = True
+        self.drift_rate = drift_rate
+        # everything weights() reads, for the materialized staleness check
+        h = hashlib.sha256(json.dumps([self.states, names, drift_rate]).encode("utf-8"))
+        for arr in (self.base, self.bias, self.drift_mask):
+            h.update(arr.tobytes())
+        self.digest = h.hexdigest()
 
-def _load_economy() -> pd.DataFrame:
-    try:
-        return pd.DataFrame(pd.read_json("data/space_economy.json"))
-    except Exception:
-        # fallback aligns with growth._load_economy heuristic to keep API responsive
-        years = list(range(2012, 2024))
-        rows = []
-        for ind in ["manufacturing", "space_vehicles", "information", "professional_rd"]:
-            base = 20000.0 + (hash(ind) % 7000)
-            vals = (np.array(years) - years[0] + 1) * (base / len(years))
-            emp = 10000 + (np.array(years) - years[0]) * 120
-            for y, v, e in zip(years, vals, emp):
-                rows.append({
-                    "year": y,
-                    "industry_id": ind,
-                    "valueAddedCurrentUSD": float(v),
-                    "employment": float(e),
-                })
-        return pd.DataFrame(rows)
+    def rows(self, industry_ids: List[str]) -> np.ndarray:
+        default = len(self._rows)
+        return np.array([self._rows.get(ind, default) for ind in industry_ids], dtype=np.intp)
 
+    def weights(self, industry_ids: List[str], horizon_years: int) -> np.ndarray:
+        """Normalized industries x horizon x states allocation tensor.
 
-def predict_jobs(industry_ids: List[str], horizon_years: int, productivity_growth: float) -> Dict[str, Any]:
-    econ = _load_economy()
-    out: List[Dict[str, Any]] = []
-    geo: List[Dict[str, Any]] = []  # per-state per-year timeseries
+        Year index 0 is the first forecast year; drift compounds from there.
+        Kept in float64: the weights feed the rounding of state counts, so
+        narrowing them would move allocations by a job.
+        """
+        rows = self.rows(industry_ids)
+        growth = (1.0 + self.drift_rate) ** np.arange(horizon_years, dtype=np.float64)
+        drift = np.where(self.drift_mask[rows][:, None, :], growth[None, :, None], 1.0)
+        w = (self.base * self.bias[rows])[:, None, :] * drift
+        # cumsum keeps the left-to-right summation order of the scalar version
+        total = np.cumsum(w, axis=-1)[..., -1:]
+        n = max(1, w.shape[-1])
+        return np.where(total > 0, w / np.where(total > 0, total, 1.0), 1.0 / n)
 
-    for ind in industry_ids:
-        s = econ[econ["industry_id"].astype(str).str.lower() == ind.lower()].sort_values("year")
-        if s.empty:
-            continue
 
-        last_year = int(s["year"].max())
-        baseline_emp = float(s["employment"].iloc[-1]) if "employment" in s else 10000.0
-        value0 = float(s["valueAddedCurrentUSD"].iloc[-1])
+_GEOGRAPHY = Geography(STATE_BASE_WEIGHTS, INDUSTRY_BIAS, DRIFT_STATES, DEFAULT_DRIFT_STATES)
+
 
-        # Simulate value-added growth ratio per year as a placeholder; could consume cached growth
-        growth_ratios = np.linspace(1.05, 1.25, horizon_years)
+def _dumps(value: str) -> str:
+    # the encoding JSONResponse uses
+    return json.dumps(value, ensure_ascii=False)
 
-        totals_industry: List[Dict[str, Any]] = []
-        for i in range(horizon_years):
-            year = last_year + 1 + i
-            value_ratio = growth_ratios[i]
-            productivity = (1.0 + productivity_growth) ** (i + 1)
-            direct = (baseline_emp * value_ratio) / productivity
-            indirect = direct * MULTIPLIERS["indirect"]
-            induced = (direct + indirect) * MULTIPLIERS["induced"]
-            total = direct + indirect + induced
 
-            totals_industry.append(
+def _narrow(counts: np.ndarray) -> np.ndarray:
+    """int32 copy of an int64 count array when every value fits."""
+    if counts.size == 0 or (counts.min() >= -(2**31) and counts.max() < 2**31):
+        return counts.astype(np.int32)
+    return counts
+
+
+class JobsProjection:
+    """Columnar jobs result: one row per industry, one column per forecast year.
+
+    ``geo`` is the industries x years x states employment tensor, its last
+    axis indexed like ``states``; records are only materialized by ``to_dict``.
+    """
+
+    __slots__ = ("industry_ids", "years", "direct", "indirect", "induced", "total", "states", "geo")
+
+    def __init__(
+        self,
+        industry_ids: List[str],
+        years: np.ndarray,
+        direct: np.ndarray,
+        indirect: np.ndarray,
+        induced: np.ndarray,
+        total: np.ndarray,
+        states: List[str],
+        geo: np.ndarray,
+    ) -> None:
+        self.industry_ids = industry_ids
+        self.years = years
+        self.direct = direct
+        self.indirect = indirect
+        self.induced = induced
+        self.total = total
+        self.states = states
+        self.geo = geo
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: List[Dict[str, Any]] = []
+        geo: List[Dict[str, Any]] = []  # per-state per-year timeseries
+        states = self.states
+        for i, ind in enumerate(self.industry_ids):
+            years = self.years[i].tolist()
+            out += [
                 {
                     "industry_id": ind,
-                    "year": year,
-                    "employment_direct": int(direct),
-                    "employment_indirect": int(indirect),
-                    "employment_induced": int(induced),
-                    "employment_total": int(total),
+                    "year": y,
+                    "employment_direct": d,
+                    "employment_indirect": di,
+                    "employment_induced": du,
+                    "employment_total": t,
                 }
-            )
-
-        out += totals_industry
-
-        # allocate every forecast year to all states to form a timeseries
-        for idx, row in enumerate(totals_industry):
-            year = row["year"]
-            total = float(row["employment_total"])
-            sw = _normalized_state_weights(ind, idx)
-            for st, w in sw.items():
-                geo.append({
-                    "state": st,
-                    "industry_id": ind,
-                    "year": int(year),
-                    "employment_total": int(round(total * w)),
-                })
+                for y, d, di, du, t in zip(
+                    years,
+                    self.direct[i].tolist(),
+                    self.indirect[i].tolist(),
+                    self.induced[i].tolist(),
+                    self.total[i].tolist(),
+                )
+            ]
+            for y, alloc in zip(years, self.geo[i].tolist()):
+                geo += [
+                    {"state": st, "industry_id": ind, "year": y, "employment_total": v}
+                    for st, v in zip(states, alloc)
+                ]
+        return {"items": out, "geo": geo}
+
+    def to_json(self) -> bytes:
+        """``to_dict`` as compact JSON, written straight from the arrays.
+
+        Byte-for-byte what ``JSONResponse(self.to_dict())`` sends, without
+        allocating a dict per row; each name is escaped once.
+        """
+        states = ['{"state":' + _dumps(st) for st in self.states]
+        items: List[str] = []
+        geo: List[str] = []
+        for i, ind in enumerate(self.industry_ids):
+            name = _dumps(ind)
+            years = self.years[i].tolist()
+            items += [
+                f'{{"industry_id":{name},"year":{y},"employment_direct":{d},'
+                f'"employment_indirect":{di},"employment_induced":{du},"employment_total":{t}}}'
+                for y, d, di, du, t in zip(
+                    years,
+                    self.direct[i].tolist(),
+                    self.indirect[i].tolist(),
+                    self.induced[i].tolist(),
+                    self.total[i].tolist(),
+                )
+            ]
+            for y, alloc in zip(years, self.geo[i].tolist()):
+                tail = f',"industry_id":{name},"year":{y},"employment_total":'
+                geo += [f"{st}{tail}{v}}}" for st, v in zip(states, alloc)]
+        return f'{{"items":[{",".join(items)}],"geo":[{",".join(geo)}]}}'.encode("utf-8")
+
+    def to_columnar(self) -> Dict[str, Any]:
+        """Parallel-array JSON shape; industry/year/state are dictionary codes."""
+        n_ind, horizon = self.total.shape
+        n_states = len(self.states)
+        year_dict = np.unique(self.years)
+        year_codes = np.searchsorted(year_dict, self.years).ravel()
+        return {
+            "format": "columnar",
+            "industries": list(self.industry_ids),
+            "years": year_dict.tolist(),
+            "states": list(self.states),
+            "items": {
+                "industry": np.repeat(np.arange(n_ind), horizon).tolist(),
+                "year": year_codes.tolist(),
+                "employment_direct": self.direct.ravel().tolist(),
+                "employment_indirect": self.indirect.ravel().tolist(),
+                "employment_induced": self.induced.ravel().tolist(),
+                "employment_total": self.total.ravel().tolist(),
+            },
+            "geo": {
+                "industry": np.repeat(np.arange(n_ind), horizon * n_states).tolist(),
+                "year": np.repeat(year_codes, n_states).tolist(),
+                "state": np.tile(np.arange(n_states), n_ind * horizon).tolist(),
+                "employment_total": self.geo.ravel().tolist(),
+            },
+        }
+
+    def to_arrow(self) -> bytes:
+        """Two concatenated Arrow IPC streams: ``items`` then ``geo``.
+
+        Requires pyarrow; raises ImportError otherwise.
+        """
+        import pyarrow as pa
+
+        n_ind, horizon = self.total.shape
+        n_states = len(self.states)
+        industries = pa.array(list(self.industry_ids), pa.string())
+        states = pa.array(list(self.states), pa.string())
+
+        def _ints(arr: np.ndarray) -> pa.Array:
+            return pa.array(_narrow(arr).ravel())
+
+        ind_items = np.repeat(np.arange(n_ind, dtype=np.int32), horizon)
+        items = pa.table(
+            {
+                "industry_id": pa.DictionaryArray.from_arrays(pa.array(ind_items), industries),
+                "year": pa.array(self.years.ravel().astype(np.int16)),
+                "employment_direct": _ints(self.direct),
+                "employment_indirect": _ints(self.indirect),
+                "employment_induced": _ints(self.induced),
+                "employment_total": _ints(self.total),
+            }
+        ).replace_schema_metadata({"table": "items"})
+        geo = pa.table(
+            {
+                "state": pa.DictionaryArray.from_arrays(
+                    pa.array(np.tile(np.arange(n_states, dtype=np.int32), n_ind * horizon)), states
+                ),
+                "industry_id": pa.DictionaryArray.from_arrays(
+                    pa.array(np.repeat(ind_items, n_states)), industries
+                ),
+                "year": pa.array(np.repeat(self.years.ravel(), n_states).astype(np.int16)),
+                "employment_total": _ints(self.geo),
+            }
+        ).replace_schema_metadata({"table": "geo"})
+
+        sink = pa.BufferOutputStream()
+        for table in (items, geo):
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+
+def _baselines(industry_ids: List[str], index: EconomyIndex) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Matched industries with their last observed year and employment."""
+    found: List[str] = []
+    last_years: List[int] = []
+    baselines: List[float] = []
+    for ind in industry_ids:
+        s = index.get(ind)
+        if s is None or len(s.years) == 0:
+            continue
+        found.append(ind)
+        last_years.append(int(s.years[-1]))
+        baselines.append(float(s.employment[-1]) if s.employment is not None else 10000.0)
+    return found, np.array(last_years, dtype=np.int64), np.array(baselines, dtype=np.float64)
+
+
+def _ratios(
+    found: List[str], horizon_years: int, growth_ratios: Optional[Dict[str, np.ndarray]]
+) -> np.ndarray:
+    # Simulated value-added growth ratio per year unless forecast ratios are supplied
+    placeholder = np.linspace(1.05, 1.25, horizon_years)
+    return np.array(
+        [(growth_ratios or {}).get(ind, placeholder) for ind in found], dtype=np.float64
+    ).reshape(len(found), horizon_years)
+
+
+def project_jobs(
+    industry_ids: List[str],
+    horizon_years: int,
+    productivity_growth: float,
+    growth_ratios: Optional[Dict[str, np.ndarray]] = None,
+    index: Optional[EconomyIndex] = None,
+) -> JobsProjection:
+    """Employment projection per industry, year and state.
+
+    ``growth_ratios`` maps an industry to its forecast value added over the
+    last observed value, one ratio per forecast year. Industries without
+    one use the placeholder growth path. Without forecast ratios the
+    result is sliced from the materialized store when it is current.
+    """
+    with span("jobs.load"):
+        index = index or economy_index()
+    with span("jobs.match"):
+        found, last_years, baselines = _baselines(industry_ids, index)
+    series = [index.get(ind) for ind in found]
+    # rows are stored under the series key, and geography bias looks up the
+    # id exactly as requested, so only exact ids can be served from the store
+    if growth_ratios is None and all(s.key == ind for s, ind in zip(series, found)):
+        with span("jobs.materialized"):
+            stored = MATERIALIZED.jobs(series, horizon_years, productivity_growth, _config())
+        if stored is not None:
+            years = last_years[:, None] + 1 + np.arange(horizon_years)[None, :]
+            return JobsProjection(found, years.astype(np.int16), *stored[:4], _GEOGRAPHY.states, stored[4])
+    return _project(found, last_years, baselines, horizon_years, productivity_growth, growth_ratios)
+
+
+def _config() -> Dict[str, Any]:
+    """Model settings a materialized projection must have been computed with."""
+    return {"states": list(_GEOGRAPHY.states), "geography": _GEOGRAPHY.digest, "multipliers": dict(MULTIPLIERS)}
+
+
+def _project(
+    found: List[str],
+    last_years: np.ndarray,
+    baselines: np.ndarray,
+    horizon_years: int,
+    productivity_growth: float,
+    growth_ratios: Optional[Dict[str, np.ndarray]] = None,
+) -> JobsProjection:
+    steps = np.arange(horizon_years)
+    years = last_years[:, None] + 1 + steps[None, :]
+    ratios = _ratios(found, horizon_years, growth_ratios)
+    productivity = (1.0 + productivity_growth) ** (steps + 1).astype(np.float64)
+    baseline = baselines[:, None]
+    direct = (baseline * ratios) / productivity[None, :]
+    indirect = direct * MULTIPLIERS["indirect"]
+    induced = (direct + indirect) * MULTIPLIERS["induced"]
+    total = (direct + indirect + induced).astype(np.int64)
+
+    # allocate every forecast year to all states to form a timeseries
+    with span("jobs.geography"):
+        weights = _GEOGRAPHY.weights(found, horizon_years)
+        geo = np.rint(total[:, :, None].astype(np.float64) * weights).astype(np.int64)
 
-    return {"items": out, "geo": geo}
+    # counts are stored as int32 when they fit, halving the geo tensor
+    return JobsProjection(
+        found,
+        years.reshape(len(found), horizon_years).astype(np.int16),
+        _narrow(direct.astype(np.int64)),
+        _narrow(indirect.astype(np.int64)),
+        _narrow(induced.astype(np.int64)),
+        _narrow(total),
+        _GEOGRAPHY.states,
+        _narrow(geo.reshape(len(found), horizon_years, len(_GEOGRAPHY.states))),
+    )
 
 
+def predict_jobs(
+    industry_ids: List[str],
+    horizon_years: int,
+    productivity_growth: float,
+    growth_ratios: Optional[Dict[str, np.ndarray]] = None,
+) -> Dict[str, Any]:
+    projection = project_jobs(industry_ids, horizon_years, productivity_growth, growth_ratios)
+    with span("jobs.serialize"):
+        return projection.to_dict()
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from models.economy import DATA_DIR, IndustrySeries
+
+MATERIALIZED_DIR = Path(os.getenv("MATERIALIZED_DIR", str(DATA_DIR / "materialized")))
+LATEST = "LATEST"
+MANIFEST = "manifest.json"
+SCHEMA_VERSION = 1
+# Longest horizon precomputed by default
+H_MAX = int(os.getenv("MATERIALIZE_HORIZON", "20"))
+# /jobs default; other productivity assumptions are computed live
+DEFAULT_PRODUCTIVITY = 0.02
+
+# growth.npy: industries x H_MAX ensemble forecasts; every shorter horizon is a prefix.
+# jobs_items.npy / jobs_geo.npy: the placeholder growth path depends on the horizon, so
+# jobs are stored for every horizon 1..H_MAX back to back along the year axis
+# (horizon h starts at h * (h - 1) / 2), with direct/indirect/induced/total and
+# per-state totals respectively.
+_ARRAYS = ("growth", "jobs_items", "jobs_geo")
+
+
+def series_digest(series: IndustrySeries) -> str:
+    """Digest of everything a materialized row depends on, employment included."""
+    h = hashlib.sha256(series.digest().encode("ascii"))
+    if series.employment is not None:
+        h.update(np.ascontiguousarray(series.employment, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def _offset(horizon_years: int) -> int:
+    return horizon_years * (horizon_years - 1) // 2
+
+
+def _atomic_save(path: Path, arr: np.ndarray) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, arr)
+    os.replace(tmp, path)
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class MaterializedStore:
+    """Read side of the directory written by ``util/materialize.py``.
+
+    Arrays are memory-mapped and re-opened when LATEST changes. A row is
+    only served while the industry's current series digest matches the one
+    it was computed from and the model settings (enabled kinds, weights,
+    hyperparameters, band factors, geography tables, multipliers) are
+    unchanged, so stale rows fall back to live computation.
+    """
+
+    def __init__(self, root: Path = MATERIALIZED_DIR) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._state: Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]] = None
+        self.hits = 0
+        self.stale = 0
+
+    def _load(self) -> Optional[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+        latest = self.root / LATEST
+        try:
+            st = latest.stat()
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self._state = None
+                try:
+                    version = latest.read_text(encoding="utf-8").strip()
+                    with open(self.root / version / MANIFEST, "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    if manifest.get("schemaVersion") == SCHEMA_VERSION:
+                        arrays = {
+                            name: np.load(self.root / version / f"{name}.npy", mmap_mode="r") for name in _ARRAYS
+                        }
+                        self._state = manifest, arrays
+                except (OSError, ValueError):
+                    pass
+            return self._state
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        state = self._load()
+        return None if state is None else state[0]
+
+    def _rows(self, manifest: Dict[str, Any], series_list: List[Optional[IndustrySeries]]) -> Optional[List[int]]:
+        rows: List[int] = []
+        industries = manifest["industries"]
+        for series in series_list:
+            entry = None if series is None else industries.get(series.key)
+            if entry is None:
+                return None
+            if entry["digest"] != series_digest(series):
+                self.stale += 1
+                return None
+            rows.append(entry["row"])
+        return rows
+
+    def growth(self, series: IndustrySeries, horizon_years: int, config: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Stored ensemble forecast for ``series``, or None if absent or stale."""
+        state = self._load()
+        if state is None:
+            return None
+        manifest, arrays = state
+        if not 0 < horizon_years <= manifest["horizon"] or manifest["growth"] != config:
+            return None
+        rows = self._rows(manifest, [series])
+        if rows is None:
+            return None
+        self.hits += 1
+        return np.array(arrays["growth"][rows[0], :horizon_years])
+
+    def jobs(
+        self,
+        series_list: List[Optional[IndustrySeries]],
+        horizon_years: int,
+        productivity_growth: float,
+        config: Dict[str, Any],
+    ) -> Optional[Tuple[np.ndarray, ...]]:
+        """(direct, indirect, induced, total, geo) for these industries, or None unless all are current."""
+        state = self._load()
+        if state is None or not series_list:
+            return None
+        manifest, arrays = state
+        if (
+            not 0 < horizon_years <= manifest["horizon"]
+            or productivity_growth != manifest["productivityGrowth"]
+            or manifest["jobs"] != config
+        ):
+            return None
+        rows = self._rows(manifest, series_list)
+        if rows is None:
+            return None
+        years = slice(_offset(horizon_years), _offset(horizon_years) + horizon_years)
+        items = np.asarray(arrays["jobs_items"][rows, years])
+        geo = np.asarray(arrays["jobs_geo"][rows, years])
+        self.hits += 1
+        return items[..., 0], items[..., 1], items[..., 2], items[..., 3], geo
+
+    def stats(self) -> Dict[str, Any]:
+        manifest = self.manifest()
+        return {
+            "root": str(self.root),
+            "version": None if manifest is None else manifest["version"],
+            "horizon": None if manifest is None else manifest["horizon"],
+            "industries": 0 if manifest is None else len(manifest["industries"]),
+            "hits": self.hits,
+            "stale": self.stale,
+        }
+
+
+MATERIALIZED = MaterializedStore()
+
+
+def materialize(
+    changed: Optional[Set[str]] = None,
+    horizon_years: int = H_MAX,
+    productivity_growth: float = DEFAULT_PRODUCTIVITY,
+    root: Path = MATERIALIZED_DIR,
+    full: bool = False,
+) -> Tuple[Path, List[str]]:
+    """Precompute growth and jobs for every industry and point LATEST at the result.
+
+    Rows of the current materialization are reused when the industry's
+    series digest is unchanged, it is not in ``changed`` (e.g. the
+    industries an ingest reported) and the settings match; ``full``
+    recomputes everything. Returns the output directory and the industries
+    that were recomputed.
+    """
+    from models import growth, jobs
+    from models.economy import economy_index
+
+    index = economy_index()
+    growth_config, jobs_config = growth._config(), jobs._config()
+    keys = [k for k in index.keys if len(index.get(k).years) > 0]
+    digests = {k: series_digest(index.get(k)) for k in keys}
+    n_states = len(jobs._GEOGRAPHY.states)
+    t = _offset(horizon_years + 1)
+
+    store = MaterializedStore(root)
+    state = None if full else store._load()
+    previous: Dict[str, Dict[str, Any]] = {}
+    if state is not None:
+        manifest, old = state
+        if (
+            manifest["horizon"] == horizon_years
+            and manifest["productivityGrowth"] == productivity_growth
+            and manifest["growth"] == growth_config
+            and manifest["jobs"] == jobs_config
+        ):
+            previous = manifest["industries"]
+
+    forecasts = np.empty((len(keys), horizon_years), dtype=np.float64)
+    items = np.empty((len(keys), t, 4), dtype=np.int64)
+    geo = np.empty((len(keys), t, n_states), dtype=np.int64)
+    todo: List[int] = []
+    for row, key in enumerate(keys):
+        entry = previous.get(key)
+        if entry is None or entry["digest"] != digests[key] or key in (changed or ()):
+            todo.append(row)
+            continue
+        forecasts[row] = old["growth"][entry["row"]]
+        items[row] = old["jobs_items"][entry["row"]]
+        geo[row] = old["jobs_geo"][entry["row"]]
+
+    if todo:
+        found = [keys[row] for row in todo]
+        if growth._PARALLEL:
+            growth._prefit([index.get(key) for key in found], index.version)
+        for row, key in zip(todo, found):
+            forecasts[row] = growth._forecast_series(index.get(key), index.version, horizon_years)[1]
+        _, last_years, baselines = jobs._baselines(found, index)
+        for h in range(1, horizon_years + 1):
+            p = jobs._project(found, last_years, baselines, h, productivity_growth)
+            years = slice(_offset(h), _offset(h) + h)
+            items[todo, years] = np.stack([p.direct, p.indirect, p.induced, p.total], axis=-1)
+            geo[todo, years] = p.geo
+
+    version = f"{index.digest[:16]}-h{horizon_years}"
+    out_dir = Path(root) / version
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _atomic_save(out_dir / "growth.npy", forecasts)
+    _atomic_save(out_dir / "jobs_items.npy", jobs._narrow(items))
+    _atomic_save(out_dir / "jobs_geo.npy", jobs._narrow(geo))
+    manifest = {
+        "schemaVersion": SCHEMA_VERSION,
+        "version": version,
+        "dataDigest": index.digest,
+        "createdAt": time.time(),
+        "horizon": horizon_years,
+        "productivityGrowth": productivity_growth,
+        "growth": growth_config,
+        "jobs": jobs_config,
+        "industries": {
+            key: {"row": row, "digest": digests[key], "lastYear": int(index.get(key).years[-1])}
+            for row, key in enumerate(keys)
+        },
+    }
+    _atomic_write(out_dir / MANIFEST, json.dumps(manifest, indent=2, sort_keys=True))
+    _atomic_write(Path(root) / LATEST, version)
+    return out_dir, [keys[row] for row in todo]
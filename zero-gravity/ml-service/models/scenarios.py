@@ -0,0 +1,134 @@
+import os
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from models import jobs
+from models.economy import EconomyIndex, economy_index
+from models.telemetry import span
+
+# Upper bound on the samples x industries x years working set of one chunk
+_CHUNK_BYTES = int(float(os.getenv("SCENARIO_CHUNK_MB", "64")) * 1024 * 1024)
+# float64 arrays of that shape alive at once while a chunk is evaluated
+_LIVE_ARRAYS = 4
+
+
+class ScenarioSpec(NamedTuple):
+    """Sampling distributions for a jobs scenario run.
+
+    Productivity growth and the two multipliers are drawn once per sample
+    and shared by every industry (an economy-wide scenario). Value-added
+    ratios follow a per-industry log random walk with ``ratio_sd`` yearly
+    steps around the central growth path.
+    """
+
+    samples: int = 2000
+    seed: int = 0
+    productivity_growth: float = 0.02
+    productivity_sd: float = 0.01
+    ratio_sd: float = 0.03
+    indirect_sd: float = 0.05
+    induced_sd: float = 0.05
+    quantiles: tuple = (0.05, 0.5, 0.95)
+
+
+def _band_key(q: float) -> str:
+    return f"p{q * 100:g}"
+
+
+def _ratio_shocks(industries: List[str], spec: ScenarioSpec, horizon_years: int) -> np.ndarray:
+    """samples x industries x years multiplicative ratio noise.
+
+    Each industry draws from its own stream, so its band does not depend on
+    which other industries are in the request or on the chunk size.
+    """
+    steps = np.empty((spec.samples, len(industries), horizon_years), dtype=np.float64)
+    for j, ind in enumerate(industries):
+        rng = np.random.default_rng([spec.seed, zlib.crc32(ind.encode("utf-8"))])
+        steps[:, j, :] = rng.normal(0.0, spec.ratio_sd, (spec.samples, horizon_years))
+    return np.exp(np.cumsum(steps, axis=-1, out=steps), out=steps)
+
+
+def simulate_jobs(
+    industry_ids: List[str],
+    horizon_years: int,
+    spec: ScenarioSpec = ScenarioSpec(),
+    growth_ratios: Optional[Dict[str, np.ndarray]] = None,
+    index: Optional[EconomyIndex] = None,
+) -> Dict[str, Any]:
+    """Monte Carlo employment bands per industry, year and state.
+
+    Evaluates the ``project_jobs`` model for ``spec.samples`` draws at once,
+    a chunk of industries at a time, and returns the requested quantiles of
+    direct and total employment. State bands are the total bands times the
+    (deterministic) allocation weights, which is exact for quantiles since
+    the weights are non-negative.
+
+    The result uses the ``JobsProjection.to_columnar`` layout, with each
+    employment column replaced by one flat array per quantile band.
+    """
+    with span("scenario.load"):
+        index = index or economy_index()
+    with span("jobs.match"):
+        found, last_years, baselines = jobs._baselines(industry_ids, index)
+    geography = jobs._GEOGRAPHY
+    qs = np.array(spec.quantiles, dtype=np.float64)
+    n, h = len(found), horizon_years
+    steps = np.arange(h)
+    years = last_years[:, None] + 1 + steps[None, :]
+    ratios = jobs._ratios(found, h, growth_ratios)
+
+    with span("scenario.sample"):
+        rng = np.random.default_rng(spec.seed)
+        growth = rng.normal(spec.productivity_growth, spec.productivity_sd, spec.samples)
+        indirect = np.maximum(rng.normal(jobs.MULTIPLIERS["indirect"], spec.indirect_sd, spec.samples), 0.0)
+        induced = np.maximum(rng.normal(jobs.MULTIPLIERS["induced"], spec.induced_sd, spec.samples), 0.0)
+        # samples x years divisor, and the total/direct factor per sample
+        productivity = (1.0 + growth)[:, None] ** (steps + 1).astype(np.float64)[None, :]
+        multiplier = (1.0 + indirect) * (1.0 + induced)
+
+    direct_q = np.empty((len(qs), n, h), dtype=np.float64)
+    total_q = np.empty((len(qs), n, h), dtype=np.float64)
+    chunk = max(1, _CHUNK_BYTES // (_LIVE_ARRAYS * 8 * max(1, spec.samples * h)))
+    with span("scenario.simulate"):
+        for lo in range(0, n, chunk):
+            hi = min(n, lo + chunk)
+            direct = _ratio_shocks(found[lo:hi], spec, h)
+            direct *= (baselines[lo:hi, None] * ratios[lo:hi])[None, :, :]
+            direct /= productivity[:, None, :]
+            direct_q[:, lo:hi] = np.quantile(direct, qs, axis=0)
+            direct *= multiplier[:, None, None]
+            total_q[:, lo:hi] = np.quantile(direct, qs, axis=0)
+
+    with span("jobs.geography"):
+        weights = geography.weights(found, h)
+        geo_q = np.rint(total_q[..., None] * weights[None]).astype(np.int64)
+
+    with span("scenario.serialize"):
+        keys = [_band_key(q) for q in spec.quantiles]
+        n_states = len(geography.states)
+        year_dict = np.unique(years)
+        year_codes = np.searchsorted(year_dict, years).ravel()
+        direct_i = np.rint(direct_q).astype(np.int64)
+        total_i = np.rint(total_q).astype(np.int64)
+        return {
+            "format": "columnar",
+            "samples": spec.samples,
+            "quantiles": list(spec.quantiles),
+            "industries": list(found),
+            "years": year_dict.tolist(),
+            "states": list(geography.states),
+            "items": {
+                "industry": np.repeat(np.arange(n), h).tolist(),
+                "year": year_codes.tolist(),
+                "employment_direct": {k: direct_i[b].ravel().tolist() for b, k in enumerate(keys)},
+                "employment_total": {k: total_i[b].ravel().tolist() for b, k in enumerate(keys)},
+            },
+            "geo": {
+                "industry": np.repeat(np.arange(n), h * n_states).tolist(),
+                "year": np.repeat(year_codes, n_states).tolist(),
+                "state": np.tile(np.arange(n_states), n * h).tolist(),
+                "employment_total": {k: geo_q[b].ravel().tolist() for b, k in enumerate(keys)},
+            },
+        }
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.cache import MISSING, LRUCache
+from models.economy import DATA_DIR
+
+# Empty string disables the on-disk tier
+_DB_PATH = os.getenv("SENTIMENT_CACHE_PATH", str(DATA_DIR / "sentiment_scores.sqlite"))
+_MEMORY_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "100000"))
+_SQLITE_VARS = 500
+
+
+def text_digest(text: str) -> bytes:
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+class ScoreCache:
+    """Per-model text score cache keyed by (model id, sha256(text)).
+
+    Lookups go to an in-memory LRU first, then to a SQLite table that
+    survives restarts and is shared by every worker process (WAL mode).
+    """
+
+    def __init__(self, db_path: Optional[str] = _DB_PATH, memory_size: int = _MEMORY_SIZE) -> None:
+        self.memory = LRUCache(maxsize=memory_size)
+        self.db_path = db_path or None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " model TEXT NOT NULL, digest BLOB NOT NULL, value REAL NOT NULL,"
+                " PRIMARY KEY (model, digest)) WITHOUT ROWID"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, model_id: str, texts: List[str]) -> Tuple[np.ndarray, List[int]]:
+        """Cached values (NaN where missing) and the indices still to score."""
+        values = np.full(len(texts), np.nan, dtype=np.float64)
+        digests = [text_digest(t) for t in texts]
+        pending: Dict[bytes, List[int]] = {}
+        for i, d in enumerate(digests):
+            hit = self.memory.get((model_id, d))
+            if hit is MISSING:
+                pending.setdefault(d, []).append(i)
+            else:
+                values[i] = hit
+
+        if pending:
+            with self._lock:
+                db = self._db()
+                if db is not None:
+                    keys = list(pending)
+                    for start in range(0, len(keys), _SQLITE_VARS):
+                        chunk = keys[start:start + _SQLITE_VARS]
+                        marks = ",".join("?" * len(chunk))
+                        rows = db.execute(
+                            f"SELECT digest, value FROM scores WHERE model = ? AND digest IN ({marks})",
+                            [model_id, *chunk],
+                        ).fetchall()
+                        for d, v in rows:
+                            idx = pending.pop(d)
+                            values[idx] = v
+                            self.memory.set((model_id, d), v)
+                            self.disk_hits += len(idx)
+
+        missing = sorted(i for idx in pending.values() for i in idx)
+        self.misses += len(missing)
+        return values, missing
+
+    def put_many(self, model_id: str, texts: List[str], values: np.ndarray) -> None:
+        rows = [(model_id, text_digest(t), float(v)) for t, v in zip(texts, values)]
+        for model, d, v in rows:
+            self.memory.set((model, d), v)
+        with self._lock:
+            db = self._db()
+            if db is not None:
+                db.executemany("INSERT OR REPLACE INTO scores (model, digest, value) VALUES (?, ?, ?)", rows)
+                db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        memory = self.memory.stats()
+        lookups = memory["hits"] + self.disk_hits + self.misses
+        return {
+            "memory": memory,
+            "diskPath": self.db_path,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRatio": ((memory["hits"] + self.disk_hits) / lookups) if lookups else 0.0,
+        }
+
+
+SCORE_CACHE = ScoreCache()
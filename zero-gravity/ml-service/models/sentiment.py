@@ -1,109 +1,146 @@
-from typing import List, Dict, Any
-import os
+from typing import List, Dict, Any, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
-try:
-    from transformers import pipeline  # noqa: F401
-    _transformers_available = True
-except Exception:
-    _transformers_available = False
-_ENABLE_HF = bool(os.getenv("ENABLE_HF", "")) and _transformers_available
+from models.backends import available
+from models.corpus import Corpus, corpus
+from models.economy import EconomyIndex, economy_index
+from models.sentiment_engine import ENGINE
+from models.telemetry import span
+from models.xcorr import correlation_interval, correlation_pvalues, lagged_correlations
 
 
-def _load_economy() -> pd.DataFrame:
-    try:
-        return pd.DataFrame(pd.read_json("data/space_economy.json"))
-    except Exception:
-        years = list(range(2012, 2024))
-        rows = []
-        for ind in ["manufacturing", "space_vehicles", "information", "professional_rd"]:
-            base = 20000.0 + (hash(ind) % 7000)
-            vals = (np.array(years) - years[0] + 1) * (base / len(years))
-            emp = 10000 + (np.array(years) - years[0]) * 120
-            for y, v, e in zip(years, vals, emp):
-                rows.append(
-                    {
-                        "year": y,
-                        "industry_id": ind,
-                        "valueAddedCurrentUSD": float(v),
-                        "employment": float(e),
-                    }
-                )
-        return pd.DataFrame(rows)
-
-
-def _sentiment_score_texts(texts: List[str]) -> float:
-    if not _ENABLE_HF:
+def _sentiment_score_batches(batches: List[List[str]]) -> List[float]:
+    """Mean sentiment per batch of texts, scoring all batches in one engine pass."""
+    # transformers/torch are only imported once the engine scores something
+    if not available("transformers"):
         # Heuristic fallback: average of simple lexicon-based proxies
         rng = np.random.default_rng(42)
-        return float(np.clip(rng.normal(0.2, 0.25), -1, 1))
+        return [float(np.clip(rng.normal(0.2, 0.25), -1, 1))] * len(batches)
     try:
-        finbert = pipeline("sentiment-analysis", model="ProsusAI/finbert")
-        tw = pipeline(
-            "sentiment-analysis",
-            model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-        )
-        scores = []
-        for t in texts:
-            s1 = finbert(t)[0]
-            s2 = tw(t)[0]
-            v1 = 1.0 if s1["label"].lower() == "positive" else (-1.0 if s1["label"].lower() == "negative" else 0.0)
-            v2 = 1.0 if s2["label"].lower() == "positive" else (-1.0 if s2["label"].lower() == "negative" else 0.0)
-            scores.append(0.6 * v1 + 0.4 * v2)
-        return float(np.clip(np.mean(scores), -1, 1)) if scores else 0.0
+        flat = [t for texts in batches for t in texts]
+        scores = ENGINE.score(flat)
+        out: List[float] = []
+        pos = 0
+        for texts in batches:
+            chunk = scores[pos:pos + len(texts)]
+            pos += len(texts)
+            out.append(float(np.clip(np.mean(chunk), -1, 1)) if len(chunk) else 0.0)
+        return out
     except Exception:
         rng = np.random.default_rng(7)
-        return float(np.clip(rng.normal(0.1, 0.3), -1, 1))
+        return [float(np.clip(rng.normal(0.1, 0.3), -1, 1))] * len(batches)
 
 
-def analyze_sentiment(industry_ids: List[str], window: str, lag_max: int) -> Dict[str, Any]:
+def _template_sentiment(industry_ids: List[str], window: str) -> Tuple[List[str], List[float], List[Dict[str, Any]]]:
     # Placeholder periods
     if window == "monthly":
         periods = pd.period_range("2022-01", "2023-12", freq="M").astype(str).tolist()
     else:
         periods = pd.period_range("2021Q1", "2023Q4", freq="Q").astype(str).tolist()
 
-    # In absence of provided texts, simulate per-industry text batches
-    out: List[Dict[str, Any]] = []
+    # Without SENTIMENT_CORPUS, simulate per-industry text batches
+    batches: List[List[str]] = []
     for ind in industry_ids:
-        scores = []
         for _ in periods:
-            # Replace with real texts ingestion per period
-            score = _sentiment_score_texts([
+            batches.append([
                 f"{ind} expansion and funding milestone",
                 f"{ind} launch cadence and supply chain",
             ])
-            scores.append(score)
-        for p, s in zip(periods, scores):
+    with span("sentiment.score"):
+        scores = _sentiment_score_batches(batches)
+
+    out: List[Dict[str, Any]] = []
+    for k, ind in enumerate(industry_ids):
+        for p, s in zip(periods, scores[k * len(periods):(k + 1) * len(periods)]):
             out.append({"industry_id": ind, "period": p, "sentiment": float(s)})
+    return periods, scores, out
+
 
-    # Correlate with value-added series
-    econ = _load_economy()
-    correlations: Dict[str, Dict[str, float]] = {}
+def _corpus_sentiment(
+    source: Corpus, industry_ids: List[str], window: str
+) -> Tuple[List[str], List[float], List[Dict[str, Any]]]:
+    """Period means from the corpus aggregates.
+
+    Periods without documents carry the previous period's mean forward
+    (neutral before the first one) and report ``documents: 0``.
+    """
+    window = "monthly" if window == "monthly" else "quarterly"
+    periods = source.periods(industry_ids, window)
+    scores: List[float] = []
+    out: List[Dict[str, Any]] = []
     for ind in industry_ids:
-        s = econ[econ["industry_id"].astype(str).str.lower() == ind.lower()].sort_values("year")
-        if s.empty:
+        mean, std, count = source.series(ind, window, periods)
+        filled = pd.Series(mean).ffill().fillna(0.0).tolist()
+        scores += filled
+        out += [
+            {"industry_id": ind, "period": p, "sentiment": s, "stdev": d, "documents": c}
+            for p, s, d, c in zip(periods, filled, std.tolist(), count.tolist())
+        ]
+    return periods, scores, out
+
+
+def analyze_sentiment(
+    industry_ids: List[str], window: str, lag_max: int, index: Optional[EconomyIndex] = None
+) -> Dict[str, Any]:
+    source = corpus()
+    if source is not None:
+        periods, scores, out = _corpus_sentiment(source, industry_ids, window)
+    else:
+        periods, scores, out = _template_sentiment(industry_ids, window)
+    if not periods:
+        return {"items": out, "correlations": {}}
+
+    # Correlate with value-added series: all industries and lags in one batch
+    with span("sentiment.load"):
+        index = index or economy_index()
+    n = len(periods)
+    names: List[str] = []
+    rows_x: List[np.ndarray] = []
+    rows_z: List[np.ndarray] = []
+    for k, ind in enumerate(industry_ids):
+        s = index.get(ind)
+        if s is None or len(s.years) == 0 or ind in names:
             continue
-        y = s["valueAddedCurrentUSD"].astype(float).values
-        x = np.interp(np.linspace(0, len(y) - 1, len(periods)), np.arange(len(y)), y)
-        z = np.array([r["sentiment"] for r in out if r["industry_id"] == ind], dtype=float)
-        cur = float(np.corrcoef(x, z)[0, 1]) if len(z) > 2 else 0.0
+        y = s.value_added
+        names.append(ind)
+        rows_x.append(np.interp(np.linspace(0, len(y) - 1, n), np.arange(len(y)), y))
+        rows_z.append(np.asarray(scores[k * n:(k + 1) * n], dtype=float))
+
+    correlations: Dict[str, Dict[str, Any]] = {}
+    if not names:
+        return {"items": out, "correlations": correlations}
+
+    lag_end = min(lag_max, max(1, n - 2))  # lags 1 .. lag_end - 1 are searched
+    with span("sentiment.correlate"):
+        corr, counts = lagged_correlations(np.array(rows_x), np.array(rows_z), max(0, lag_end - 1))
+        pvals = correlation_pvalues(corr, counts)
+        ci_lo, ci_hi = correlation_interval(corr, counts)
+    for i, ind in enumerate(names):
+        cur = float(corr[i, 0]) if n > 2 else 0.0
         best, k = cur, 0
-        for lag in range(1, min(lag_max, max(1, len(z) - 2))):
-            try:
-                lagcorr = float(np.corrcoef(x[:-lag], z[lag:])[0, 1])
-                if np.isfinite(lagcorr) and abs(lagcorr) > abs(best):
-                    best, k = lagcorr, lag
-            except Exception:
-                break
+        if np.isfinite(cur) and corr.shape[1] > 1:
+            lagged = np.abs(np.where(np.isfinite(corr[i, 1:]), corr[i, 1:], 0.0))
+            j = int(np.argmax(lagged))
+            if lagged[j] > abs(cur):
+                best, k = float(corr[i, j + 1]), j + 1
         correlations[ind] = {
             "current": cur,
             "bestLag": float(k),
             "corrAtBestLag": best,
+            "pValue": float(pvals[i, 0]),
+            "pValueAtBestLag": float(pvals[i, k]),
+            "lags": [
+                {
+                    "lag": lag,
+                    "corr": float(corr[i, lag]),
+                    "pValue": float(pvals[i, lag]),
+                    "ciLower": float(ci_lo[i, lag]),
+                    "ciUpper": float(ci_hi[i, lag]),
+                }
+                for lag in range(corr.shape[1])
+            ],
         }
 
     return {"items": out, "correlations": correlations}
-
-
@@ -0,0 +1,118 @@
+import os
+import threading
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from models.backends import backend
+from models.score_cache import SCORE_CACHE, ScoreCache
+
+# (model id, ensemble weight) - FinBERT for filings/news, roberta for social text
+SENTIMENT_MODELS: List[Tuple[str, float]] = [
+    ("ProsusAI/finbert", 0.6),
+    ("cardiffnlp/twitter-roberta-base-sentiment-latest", 0.4),
+]
+
+_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "32"))
+_MAX_LENGTH = int(os.getenv("SENTIMENT_MAX_LENGTH", "256"))
+_THREADS = int(os.getenv("SENTIMENT_THREADS", "0"))
+
+
+def _label_value(label: str) -> float:
+    label = label.lower()
+    return 1.0 if label == "positive" else (-1.0 if label == "negative" else 0.0)
+
+
+class _Classifier:
+    """One sequence-classification model, loaded once and run in padded batches."""
+
+    def __init__(self, model_id: str) -> None:
+        transformers = backend("transformers")
+
+        self.model_id = model_id
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_id)
+        self.model = transformers.AutoModelForSequenceClassification.from_pretrained(model_id)
+        self.model.eval()
+        id2label = self.model.config.id2label
+        self.values = np.array([_label_value(id2label[i]) for i in range(len(id2label))], dtype=np.float64)
+
+    def label_values(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """+1/0/-1 for the top label of each text, like the pipeline's argmax."""
+        torch = backend("torch")
+
+        out = np.empty(len(texts), dtype=np.float64)
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            enc = self.tokenizer(
+                chunk, padding=True, truncation=True, max_length=_MAX_LENGTH, return_tensors="pt"
+            )
+            with torch.inference_mode():
+                logits = self.model(**enc).logits
+            out[start:start + len(chunk)] = self.values[logits.argmax(dim=-1).cpu().numpy()]
+        return out
+
+
+class SentimentEngine:
+    """Process-wide FinBERT + roberta scorer.
+
+    Models load on first use and are kept for the life of the process. Each
+    call dedupes its texts, serves what it can from the score cache, sorts
+    the misses by length so padded batches stay tight, and scores them per
+    model in one pass.
+    """
+
+    def __init__(self, batch_size: int = _BATCH_SIZE, cache: ScoreCache = SCORE_CACHE) -> None:
+        self.batch_size = max(1, batch_size)
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._classifiers: Dict[str, _Classifier] = {}
+
+    def _classifier(self, model_id: str) -> _Classifier:
+        with self._lock:
+            clf = self._classifiers.get(model_id)
+            if clf is None:
+                if _THREADS > 0:
+                    backend("torch").set_num_threads(_THREADS)
+                clf = _Classifier(model_id)
+                self._classifiers[model_id] = clf
+            return clf
+
+    def model_scores(self, model_id: str, texts: List[str]) -> np.ndarray:
+        """Label values from a single model for already-deduplicated texts."""
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        values = self._classifier(model_id).label_values([texts[i] for i in order], self.batch_size)
+        out = np.empty(len(texts), dtype=np.float64)
+        out[order] = values
+        return out
+
+    def cached_model_scores(self, model_id: str, texts: List[str]) -> np.ndarray:
+        # truncation length changes the score, so it is part of the cache namespace
+        namespace = f"{model_id}@{_MAX_LENGTH}"
+        values, missing = self.cache.get_many(namespace, texts)
+        if missing:
+            todo = [texts[i] for i in missing]
+            fresh = self.model_scores(model_id, todo)
+            values[missing] = fresh
+            self.cache.put_many(namespace, todo, fresh)
+        return values
+
+    def score(self, texts: List[str]) -> np.ndarray:
+        """Weighted ensemble score in [-1, 1] for every text (duplicates scored once)."""
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return np.zeros(0, dtype=np.float64)
+        combined = np.zeros(len(unique), dtype=np.float64)
+        for model_id, weight in SENTIMENT_MODELS:
+            combined += weight * self.cached_model_scores(model_id, unique)
+        pos = {t: i for i, t in enumerate(unique)}
+        return combined[[pos[t] for t in texts]]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": sorted(self._classifiers),
+            "batchSize": self.batch_size,
+            "scoreCache": self.cache.stats(),
+        }
+
+
+ENGINE = SentimentEngine()
@@ -0,0 +1,194 @@
+import bisect
+import contextlib
+import contextvars
+import cProfile
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+Span = Tuple[str, float]
+
+# Sampled profiling of request work: a fraction PROFILE_SAMPLE_RATE of calls run
+# under cProfile and the profile is kept if the call took PROFILE_THRESHOLD_MS or
+# more. 0 disables it. Dumps are pstats files for snakeviz / `python -m pstats`.
+_PROFILE_THRESHOLD = float(os.getenv("PROFILE_THRESHOLD_MS", "0")) / 1000.0
+_PROFILE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+_PROFILE_DIR = Path(
+    os.getenv("PROFILE_DIR", str(Path(__file__).resolve().parent.parent / "data" / "profiles"))
+)
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histograms:
+    """Prometheus-style cumulative histograms, one per label value."""
+
+    def __init__(self, name: str, help_text: str, label: str, buckets: Tuple[float, ...] = BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.label = label
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: Dict[str, List[float]] = {}  # counts per bucket + [+Inf, sum]
+
+    def observe(self, value: str, seconds: float) -> None:
+        with self._lock:
+            row = self._series.get(value)
+            if row is None:
+                row = self._series[value] = [0.0] * (len(self.buckets) + 2)
+            row[bisect.bisect_left(self.buckets, seconds)] += 1
+            row[-1] += seconds
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {k: {"count": sum(row[:-1]), "seconds": row[-1]} for k, row in self._series.items()}
+
+    def exposition(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for value, row in sorted(self._series.items()):
+                label = f'{self.label}="{_escape(value)}"'
+                cumulative = 0.0
+                for le, n in zip(self.buckets, row):
+                    cumulative += n
+                    lines.append(f'{self.name}_bucket{{{label},le="{le}"}} {cumulative:g}')
+                cumulative += row[len(self.buckets)]
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative:g}')
+                lines.append(f"{self.name}_sum{{{label}}} {row[-1]:.6f}")
+                lines.append(f"{self.name}_count{{{label}}} {cumulative:g}")
+        return lines
+
+
+STAGES = Histograms("zg_stage_seconds", "Time spent per processing stage.", "stage")
+REQUESTS = Histograms("zg_request_seconds", "HTTP request latency per route.", "route")
+
+
+class _Sink:
+    def __init__(self, observe: bool) -> None:
+        self.observe = observe
+        self.spans: List[Span] = []
+
+
+_SINK: contextvars.ContextVar[Optional[_Sink]] = contextvars.ContextVar("zg_spans", default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a stage into the stage histogram and the current request's spans."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        sink = _SINK.get()
+        if sink is None or sink.observe:
+            STAGES.observe(name, elapsed)
+        if sink is not None:
+            sink.spans.append((name, elapsed))
+
+
+@contextlib.contextmanager
+def request_spans() -> Iterator[List[Span]]:
+    """Collect the spans of everything run in this context (one HTTP request)."""
+    sink = _Sink(observe=True)
+    token = _SINK.set(sink)
+    try:
+        yield sink.spans
+    finally:
+        _SINK.reset(token)
+
+
+def observe(spans: List[Span]) -> None:
+    """Record spans that were collected elsewhere (e.g. in a pool worker)."""
+    for name, seconds in spans:
+        STAGES.observe(name, seconds)
+
+
+def attach(spans: List[Span]) -> None:
+    """Add already-observed spans to the current request."""
+    sink = _SINK.get()
+    if sink is not None:
+        sink.spans.extend(spans)
+
+
+def _dump_profile(profiler: cProfile.Profile, label: str, elapsed: float) -> None:
+    try:
+        _PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        profiler.dump_stats(str(_PROFILE_DIR / f"{stamp}-{os.getpid()}-{label}-{elapsed * 1000:.0f}ms.prof"))
+    except OSError:
+        pass
+
+
+def collect(fn: Callable[..., Any], *args: Any) -> Tuple[Any, List[Span]]:
+    """Run ``fn(*args)`` and return its result with the spans it recorded.
+
+    Spans are not observed here; the caller observes them once, so work run
+    in a pool worker still lands in the server's histograms. Sampled calls
+    are profiled (see PROFILE_THRESHOLD_MS).
+    """
+    sink = _Sink(observe=False)
+    token = _SINK.set(sink)
+    profiler = None
+    if _PROFILE_THRESHOLD > 0 and random.random() < _PROFILE_RATE:
+        profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        if profiler is None:
+            result = fn(*args)
+        else:
+            try:
+                profiler.enable()
+            except ValueError:  # another profiler is active in this thread
+                profiler = None
+            try:
+                result = fn(*args)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+    finally:
+        _SINK.reset(token)
+    elapsed = time.perf_counter() - started
+    if profiler is not None and elapsed >= _PROFILE_THRESHOLD:
+        _dump_profile(profiler, getattr(fn, "__name__", "call"), elapsed)
+    return result, sink.spans
+
+
+def server_timing(spans: List[Span], total: Optional[float] = None) -> str:
+    """``Server-Timing`` header value; repeated stages are summed."""
+    merged: Dict[str, List[float]] = {}
+    for name, seconds in spans:
+        entry = merged.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+    parts = [
+        f'{name.replace(" ", "_")};dur={seconds * 1000:.2f}' + (f';desc="x{count}"' if count > 1 else "")
+        for name, (seconds, count) in merged.items()
+    ]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def exposition(
+    gauges: List[Tuple[str, str, Dict[str, str], float]],
+    counters: List[Tuple[str, str, Dict[str, str], float]] = (),
+) -> str:
+    """Prometheus text format: the histograms plus ``(name, help, labels, value)`` gauges and counters."""
+    lines = STAGES.exposition() + REQUESTS.exposition()
+    seen = set()
+    for kind, series in (("gauge", gauges), ("counter", counters)):
+        for name, help_text, labels, value in series:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            label = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+            lines.append(f"{name}{{{label}}} {float(value):g}" if label else f"{name} {float(value):g}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,104 @@
+from typing import Tuple
+
+import numpy as np
+
+# Below this series length the masked direct computation beats the FFT path
+FFT_MIN_LENGTH = 256
+# Window variance below (tolerance * series scale)^2 counts as constant -> NaN,
+# matching np.corrcoef on a constant input
+_CONST_TOL = 1e-10
+
+
+def _direct(x: np.ndarray, z: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    m, n = x.shape
+    lags = np.arange(max_lag + 1)
+    pos = np.arange(n)
+    valid = pos[None, :] < (n - lags)[:, None]  # (L, n): i < n - k
+    zi = np.minimum(pos[None, :] + lags[:, None], n - 1)
+    counts = valid.sum(axis=1).astype(np.float64)
+
+    xw = np.where(valid[None], x[:, None, :], 0.0)  # x[i] for i < n - k
+    zw = np.where(valid[None], z[:, zi], 0.0)  # z[i + k]
+    safe = np.maximum(counts, 1.0)[None, :, None]
+    xc = np.where(valid[None], xw - xw.sum(axis=2, keepdims=True) / safe, 0.0)
+    zc = np.where(valid[None], zw - zw.sum(axis=2, keepdims=True) / safe, 0.0)
+    return (xc * zc).sum(axis=2), (xc * xc).sum(axis=2), (zc * zc).sum(axis=2)
+
+
+def _fft(x: np.ndarray, z: np.ndarray, max_lag: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    m, n = x.shape
+    lags = np.arange(max_lag + 1)
+    counts = (n - lags).astype(np.float64)
+    nfft = 1 << int(np.ceil(np.log2(max(2, 2 * n))))
+    # sum_i x[i] * z[i + k] for every k at once
+    cross = np.fft.irfft(np.conj(np.fft.rfft(x, nfft, axis=1)) * np.fft.rfft(z, nfft, axis=1), nfft, axis=1)
+    sxz = cross[:, : max_lag + 1]
+
+    zeros = np.zeros((m, 1))
+    cx = np.concatenate([zeros, np.cumsum(x, axis=1)], axis=1)
+    cxx = np.concatenate([zeros, np.cumsum(x * x, axis=1)], axis=1)
+    cz = np.concatenate([zeros, np.cumsum(z, axis=1)], axis=1)
+    czz = np.concatenate([zeros, np.cumsum(z * z, axis=1)], axis=1)
+    sx, sxx = cx[:, n - lags], cxx[:, n - lags]  # window x[0 : n - k]
+    sz, szz = cz[:, -1:] - cz[:, lags], czz[:, -1:] - czz[:, lags]  # window z[k : n]
+
+    safe = np.maximum(counts, 1.0)[None, :]
+    return sxz - sx * sz / safe, sxx - sx * sx / safe, szz - sz * sz / safe
+
+
+def lagged_correlations(
+    x: np.ndarray, z: np.ndarray, max_lag: int, method: str = "auto"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Pearson correlation of ``x[:, :n-k]`` with ``z[:, k:]`` for k = 0..max_lag.
+
+    ``x`` and ``z`` are (series, n) arrays correlated row by row. Returns the
+    (series, max_lag + 1) correlation matrix (NaN where a window is constant
+    or shorter than two points) and the per-lag sample counts.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    z = np.atleast_2d(np.asarray(z, dtype=np.float64))
+    m, n = x.shape
+    max_lag = int(max(0, min(max_lag, n - 1)))
+    counts = (n - np.arange(max_lag + 1)).astype(np.float64)
+    if m == 0 or n == 0:
+        return np.full((m, max_lag + 1), np.nan), counts
+
+    # global centering/scaling keeps the raw-moment (FFT) path well conditioned
+    scale_x = np.abs(x).max(axis=1, keepdims=True)
+    scale_z = np.abs(z).max(axis=1, keepdims=True)
+    x = x - x.mean(axis=1, keepdims=True)
+    z = z - z.mean(axis=1, keepdims=True)
+
+    if method == "direct" or (method == "auto" and n < FFT_MIN_LENGTH):
+        cov, var_x, var_z = _direct(x, z, max_lag)
+    else:
+        cov, var_x, var_z = _fft(x, z, max_lag)
+
+    tol_x = counts[None, :] * (_CONST_TOL * scale_x) ** 2
+    tol_z = counts[None, :] * (_CONST_TOL * scale_z) ** 2
+    ok = (var_x > tol_x) & (var_z > tol_z) & (counts[None, :] >= 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.where(ok, cov / np.sqrt(np.where(ok, var_x * var_z, 1.0)), np.nan)
+    return np.clip(corr, -1.0, 1.0), counts
+
+
+def correlation_pvalues(corr: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Two-sided p-values of H0: rho = 0 (Student t with n - 2 dof)."""
+    from scipy.special import betainc
+
+    df = np.broadcast_to(counts - 2.0, corr.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r2 = np.minimum(corr * corr, 1.0)
+        # P(|T| > t) = I_{df / (df + t^2)}(df / 2, 1 / 2) and df / (df + t^2) = 1 - r^2
+        p = betainc(df / 2.0, 0.5, 1.0 - r2)
+    return np.where((df > 0) & np.isfinite(corr), p, np.nan)
+
+
+def correlation_interval(corr: np.ndarray, counts: np.ndarray, z_crit: float = 1.959963984540054) -> Tuple[np.ndarray, np.ndarray]:
+    """Fisher-z confidence interval (95% by default) for each correlation."""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fz = np.arctanh(np.clip(corr, -1 + 1e-15, 1 - 1e-15))
+        se = 1.0 / np.sqrt(np.broadcast_to(counts - 3.0, corr.shape))
+        lo, hi = np.tanh(fz - z_crit * se), np.tanh(fz + z_crit * se)
+    valid = np.broadcast_to(counts > 3, corr.shape) & np.isfinite(corr)
+    return np.where(valid, lo, np.nan), np.where(valid, hi, np.nan)
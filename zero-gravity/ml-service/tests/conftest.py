@@ -0,0 +1,13 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings are read at import time, so they are pinned before any model module loads:
+# everything runs in-process, and no on-disk store from a local run leaks in.
+os.environ.setdefault("COMPUTE_WORKERS", "0")
+os.environ.setdefault("BACKEND_WARMUP", "0")
+os.environ.setdefault("SENTIMENT_CACHE_PATH", "")
+os.environ.setdefault("MATERIALIZED_DIR", str(Path(__file__).resolve().parent / ".no-materialized"))
+os.environ.setdefault("MODEL_ARTIFACT_DIR", str(Path(__file__).resolve().parent / ".no-artifacts"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
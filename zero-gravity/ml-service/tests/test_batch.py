@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from models import dashboard, fast
+from models.economy import EconomyIndex
+from models.growth import forecast_growth
+from models.jobs import project_jobs
+
+
+@pytest.fixture
+def index(monkeypatch):
+    rows = []
+    for j, ind in enumerate(["manufacturing", "information", "dormant"]):
+        for t, y in enumerate(range(2010, 2022)):
+            va = 0.0 if ind == "dormant" and y == 2021 else 1e9 * (j + 1) * 1.06**t
+            rows.append((y, ind, va, 1000.0 * (j + 1) + 25 * t))
+    frame = pd.DataFrame(rows, columns=["year", "industry_id", "valueAddedCurrentUSD", "employment"])
+    index = EconomyIndex(frame, version=-7)
+    monkeypatch.setattr(dashboard, "economy_index", lambda: index)
+    monkeypatch.setattr(fast, "_CURRENT", None)
+    return index
+
+
+def test_batch_jobs_follow_the_growth_forecast(index):
+    ids = ["manufacturing", "information", "dormant"]
+    body = {
+        "growth": {"industry_ids": ids[:1], "horizon_years": 5, "tier": "fast"},
+        "jobs": {"industry_ids": ids, "horizon_years": 5, "productivity_growth": 0.02},
+    }
+    with TestClient(main.app) as client:
+        out = client.post("/batch", json=body).json()
+
+    # industries outside the growth section are forecast for the jobs section
+    items = forecast_growth(ids, 5, index, "fast")["items"]
+    ratios = {}
+    for item in items:
+        series = index.get(item["industry_id"])
+        if series.value_added[-1] > 0:
+            ratios[item["industry_id"]] = np.asarray(item["prediction"]) / series.value_added[-1]
+    assert set(ratios) == {"manufacturing", "information"}
+    assert out["jobs"] == project_jobs(ids, 5, 0.02, ratios, index).to_dict()
+
+    # forecast-driven rows differ from the placeholder path; the zero-VA industry falls back to it
+    placeholder = project_jobs(ids, 5, 0.02, None, index).to_dict()["items"]
+    by_industry = lambda rows, ind: [r for r in rows if r["industry_id"] == ind]  # noqa: E731
+    assert by_industry(out["jobs"]["items"], "manufacturing") != by_industry(placeholder, "manufacturing")
+    assert by_industry(out["jobs"]["items"], "dormant") == by_industry(placeholder, "dormant")
+
+
+def test_batch_rejects_arrow():
+    with TestClient(main.app) as client:
+        res = client.post(
+            "/batch", json={"jobs": {"industry_ids": ["manufacturing"], "horizon_years": 3, "format": "arrow"}}
+        )
+    assert res.status_code == 422
@@ -0,0 +1,114 @@
+import json
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from models.corpus import Corpus, _lexicon_score
+
+
+def _jsonl(rows: List[dict]) -> str:
+    return "".join(json.dumps(r) + "\n" for r in rows)
+
+
+_ROWS = [
+    {"industry": "Space Manufacturing", "date": "2023-01-15", "text": "record growth and a new contract"},
+    {"industry": "space_manufacturing", "date": "2023-02-03", "text": "launch delayed after anomaly"},
+    {"industry": " Space Manufacturing ", "date": "2023-02-20", "text": "strong profit"},
+    {"industry": "launch", "date": "2023-04-01", "text": "cancelled"},
+]
+
+
+class _Counting:
+    def __init__(self, fail_on: int = -1) -> None:
+        self.texts: List[str] = []
+        self.calls = 0
+        self.fail_on = fail_on
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("scorer down")
+        self.texts += texts
+        return np.array([_lexicon_score(t) for t in texts])
+
+
+def test_last_jsonl_record_without_newline_is_read(tmp_path):
+    path = tmp_path / "news.jsonl"
+    path.write_text(_jsonl(_ROWS).rstrip("\n"), encoding="utf-8")
+    assert Corpus(path).refresh() == len(_ROWS)
+
+
+def test_partial_jsonl_line_waits_for_the_rest(tmp_path):
+    path = tmp_path / "news.jsonl"
+    line = json.dumps(_ROWS[3])
+    path.write_text(_jsonl(_ROWS[:3]) + line[:10], encoding="utf-8")
+    c = Corpus(path)
+    assert c.refresh() == 3
+    with path.open("a", encoding="utf-8") as f:
+        f.write(line[10:] + "\n")
+    assert c.refresh() == 1
+    assert c.stats()["documents"] == 4
+
+
+def test_unterminated_csv_record_is_read_once_the_file_is_idle(tmp_path):
+    path = tmp_path / "news.csv"
+    path.write_text('industry,date,text\nlaunch,2023-01-02,"strong, record"\nlaunch,2023-01-09,loss', encoding="utf-8")
+    c = Corpus(path)
+    assert c.refresh() == 1
+    assert c.refresh() == 1
+    assert c.refresh() == 0
+    mean, _, count = c.series("launch", "monthly", ["2023-01"])
+    assert count.tolist() == [2]
+    assert mean[0] == pytest.approx(0.0)
+
+
+def test_industry_ids_are_normalized_like_ingest(tmp_path):
+    path = tmp_path / "news.jsonl"
+    path.write_text(_jsonl(_ROWS), encoding="utf-8")
+    c = Corpus(path)
+    c.refresh()
+    assert c.periods(["Space Manufacturing"], "monthly") == ["2023-01", "2023-02"]
+    texts = [r["text"] for r in _ROWS[:3]]
+    for name in ("space_manufacturing", "Space Manufacturing"):
+        mean, std, count = c.series(name, "quarterly", ["2023Q1"])
+        scores = np.array([_lexicon_score(t) for t in texts])
+        assert count.tolist() == [3]
+        assert mean[0] == pytest.approx(scores.mean())
+        assert std[0] == pytest.approx(scores.std(ddof=1))
+
+
+def test_resume_reads_only_appended_documents(tmp_path):
+    path = tmp_path / "news.jsonl"
+    path.write_text(_jsonl(_ROWS[:2]), encoding="utf-8")
+    scorer = _Counting()
+    c = Corpus(path, batch_size=1, scorer=scorer)
+    assert c.refresh() == 2
+    with path.open("a", encoding="utf-8") as f:
+        f.write(_jsonl(_ROWS[2:]))
+    assert c.refresh() == 2
+    assert scorer.texts == [r["text"] for r in _ROWS]
+
+
+def test_documents_are_not_lost_when_the_scorer_fails(tmp_path):
+    path = tmp_path / "news.jsonl"
+    path.write_text(_jsonl(_ROWS), encoding="utf-8")
+    # the second batch fails: the first stays folded, the second is read again
+    scorer = _Counting(fail_on=2)
+    c = Corpus(path, batch_size=2, scorer=scorer)
+    with pytest.raises(RuntimeError):
+        c.refresh()
+    assert c.stats()["documents"] == 2
+    assert c.refresh() == 2
+    assert scorer.texts == [r["text"] for r in _ROWS]
+
+
+def test_truncated_file_is_reread(tmp_path: Path):
+    path = tmp_path / "news.jsonl"
+    path.write_text(_jsonl(_ROWS), encoding="utf-8")
+    c = Corpus(path)
+    c.refresh()
+    path.write_text(_jsonl(_ROWS[:1]), encoding="utf-8")
+    assert c.refresh() == 1
+    assert c.stats()["rebuilds"] == 1
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from models.economy import EconomyIndex
+
+
+def _shuffled_frame(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    rows = [
+        (int(y), ind, float(rng.normal()), float(rng.normal()))
+        for ind in ("space_a", "space_b", "other", "space_c")
+        for y in rng.permutation(np.arange(2000, 2030))
+    ]
+    rng.shuffle(rows)
+    return pd.DataFrame(rows, columns=["year", "industry_id", "valueAddedCurrentUSD", "employment"])
+
+
+def test_exact_lookup_matches_frame_filter():
+    df = _shuffled_frame()
+    series = EconomyIndex(df).get("Space_B")
+    expected = df[df["industry_id"] == "space_b"].sort_values("year")
+    np.testing.assert_array_equal(series.years, expected["year"].to_numpy())
+    np.testing.assert_array_equal(series.value_added, expected["valueAddedCurrentUSD"].to_numpy())
+
+
+def test_fuzzy_lookup_matches_contains_then_sort_values():
+    df = _shuffled_frame()
+    series = EconomyIndex(df).lookup("space")
+    expected = df[df["industry_id"].str.contains("space", case=False)].sort_values("year")
+    np.testing.assert_array_equal(series.years, expected["year"].to_numpy())
+    np.testing.assert_array_equal(series.value_added, expected["valueAddedCurrentUSD"].to_numpy())
+    np.testing.assert_array_equal(series.employment, expected["employment"].to_numpy())
+
+
+def test_unknown_industry():
+    index = EconomyIndex(_shuffled_frame())
+    assert index.lookup("nope") is None
+    assert index.containing("nope") == ()
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from models.economy import SCHEMA_KEY, EconomyIndex, _read_arrow, _read_economy, write_economy_arrow  # noqa: E402
+
+
+def _frame() -> pd.DataFrame:
+    rows = [
+        (y, ind, 1e6 * (j + 1) + y, 100.0 * j + y)
+        for j, ind in enumerate(["space_b", "Space_B", "other", "space_a"])
+        for y in (2021, 2019, 2020)
+    ]
+    return pd.DataFrame(rows, columns=["year", "industry_id", "valueAddedCurrentUSD", "employment"])
+
+
+def test_arrow_round_trip_builds_the_same_index(tmp_path):
+    frame = _frame()
+    path = write_economy_arrow(frame, tmp_path / "economy.arrow")
+    loaded = _read_arrow(path)
+    assert isinstance(loaded["industry_id"].dtype, pd.CategoricalDtype)
+    # numeric columns are read-only views of the mapped file, not copies
+    assert not loaded["valueAddedCurrentUSD"].to_numpy().flags.writeable
+    assert EconomyIndex(loaded).digest == EconomyIndex(frame).digest
+    series = EconomyIndex(loaded).get("SPACE_B")
+    np.testing.assert_array_equal(series.years, [2019, 2019, 2020, 2020, 2021, 2021])
+
+
+def test_unversioned_feather_is_migrated(tmp_path):
+    frame = _frame()
+    path = tmp_path / "economy.arrow"
+    frame.to_feather(path)
+    assert pa.ipc.open_file(str(path)).schema.metadata.get(SCHEMA_KEY) is None
+    loaded = _read_arrow(path)
+    assert loaded["year"].dtype == np.int16
+    assert EconomyIndex(loaded).digest == EconomyIndex(frame).digest
+
+
+def test_newer_schema_is_rejected_and_json_is_used(tmp_path):
+    frame = _frame()
+    json_path = tmp_path / "economy.json"
+    json_path.write_text(json.dumps(frame.to_dict(orient="records")), encoding="utf-8")
+    path = tmp_path / "economy.arrow"
+    table = pa.Table.from_pandas(frame, preserve_index=False).replace_schema_metadata({SCHEMA_KEY: b"99"})
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    with pytest.raises(ValueError, match="schema version 99"):
+        _read_arrow(path)
+    loaded, source = _read_economy(path, json_path, tmp_path / "missing.xlsx")
+    assert source == "json"
+    assert EconomyIndex(loaded).digest == EconomyIndex(frame).digest
@@ -0,0 +1,89 @@
+import asyncio
+import os
+
+import pytest
+
+from models.execution import ComputeExecutor
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def test_in_process_snapshot_is_this_process():
+    executor = ComputeExecutor(workers=0)
+    (snapshot,) = executor.snapshots()
+    assert snapshot["pid"] == os.getpid()
+    assert {"economy", "cache", "backends"} <= snapshot.keys()
+
+
+def test_pool_snapshots_come_from_workers_and_reset_on_recycle():
+    executor = ComputeExecutor(workers=1)
+    try:
+        worker = asyncio.run(executor.run("pid", _pid))
+        assert worker != os.getpid()
+        assert [s["pid"] for s in executor.snapshots()] == [worker]
+
+        executor.recycle()
+        assert executor.snapshots() == []
+        assert asyncio.run(executor.run("pid", _pid)) != worker
+    finally:
+        executor.shutdown()
+
+
+def test_warmup_reaches_every_worker():
+    executor = ComputeExecutor(workers=2, warm=False)
+    try:
+        reports = asyncio.run(executor.warmup())
+        assert len({r["pid"] for r in reports}) == 2
+        assert sorted(s["pid"] for s in executor.snapshots()) == sorted(r["pid"] for r in reports)
+    finally:
+        executor.shutdown()
+
+
+def test_reload_with_workers_does_not_load_in_the_parent(monkeypatch):
+    import main
+
+    executor = ComputeExecutor(workers=2, warm=False)
+    monkeypatch.setattr(main, "EXECUTOR", executor)
+    monkeypatch.setattr(main.STORE, "reload", lambda: pytest.fail("parent process reloaded the dataset"))
+    recycled = []
+    monkeypatch.setattr(executor, "recycle", lambda: recycled.append(True))
+    assert main.economy_reload() == {"recycled": True, "workers": 2}
+    assert recycled == [True]
+
+
+def test_metrics_expose_compute_totals_as_counters():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    text = TestClient(main.app).get("/metrics").text
+    assert "# TYPE zg_compute_coalesced_total counter" in text
+    assert "# TYPE zg_compute_rejected_total counter" in text
+    assert "# TYPE zg_compute_active gauge" in text
+    assert "zg_compute_coalesced " not in text
+
+
+def test_warmup_scores_the_corpus_before_the_first_request(tmp_path, monkeypatch):
+    from models import backends, corpus, execution
+    from models.corpus import Corpus, _lexicon_score
+
+    path = tmp_path / "news.jsonl"
+    path.write_text(
+        '{"industry": "launch", "date": "2023-01-15", "text": "record growth"}\n'
+        '{"industry": "launch", "date": "2023-04-02", "text": "launch delayed"}\n',
+        encoding="utf-8",
+    )
+    scored = []
+
+    def scorer(texts):
+        scored.append(len(texts))
+        return [_lexicon_score(t) for t in texts]
+
+    monkeypatch.setattr(corpus, "_CORPUS", Corpus(path, scorer=scorer))
+    monkeypatch.setattr(backends, "warmup", lambda: {})
+    assert execution._warm()["corpusDocuments"] == 2
+    # the request path only folds in what was appended since
+    assert corpus.corpus().documents == 2
+    assert scored == [2]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from models import fast
+from models.economy import IndustrySeries
+from models.fast import FastModels
+
+
+def _series(key: str, n: int, seed: int, start: int = 2000) -> IndustrySeries:
+    rng = np.random.default_rng(seed)
+    values = 100.0 * np.exp(np.cumsum(rng.normal(0.03, 0.05, n)))
+    return IndustrySeries(key, np.arange(start, start + n), values, None)
+
+
+def _head(s: IndustrySeries, n: int) -> IndustrySeries:
+    return IndustrySeries(s.key, s.years[:n], s.value_added[:n], None)
+
+
+@pytest.fixture
+def fixed_holt(monkeypatch):
+    # the grid search runs at fit time only; pin it so both paths share parameters
+    monkeypatch.setattr(fast, "_holt_params", lambda values: np.tile(np.array(fast._DEFAULT_HOLT)[:, None], (1, len(values))))
+
+
+def _assert_same_forecast(a: FastModels, b: FastModels, keys, horizon: int = 6) -> None:
+    for x, y in zip(a.forecast(keys, horizon), b.forecast(keys, horizon)):
+        np.testing.assert_allclose(x, y, rtol=1e-12, atol=1e-9)
+
+
+def test_appended_years_match_refit(fixed_holt):
+    full = [_series("a", 14, 0), _series("b", 12, 1), _series("c", 5, 2), _series("d", 4, 3)]
+    keys = [s.key for s in full]
+    advanced = FastModels.fit([_head(s, len(s.years) - 3) for s in full]).advance(full)
+    refit = FastModels.fit(full)
+    assert advanced.updates == 3 * len(full)
+    for name in fast._STATE_FIELDS:
+        np.testing.assert_allclose(
+            advanced.state[name][[advanced.rows[k] for k in keys]],
+            refit.state[name][[refit.rows[k] for k in keys]],
+            rtol=1e-12,
+            atol=1e-9,
+            err_msg=name,
+        )
+    _assert_same_forecast(advanced, refit, keys)
+
+
+def test_revised_history_is_refit():
+    old = [_series("a", 10, 0), _series("b", 10, 1)]
+    revised = IndustrySeries("b", old[1].years, old[1].value_added * 1.1, None)
+    advanced = FastModels.fit(old).advance([old[0], revised])
+    assert advanced.updates == 0
+    _assert_same_forecast(advanced, FastModels.fit([old[0], revised]), ["a", "b"])
+
+
+def test_intervals_bracket_prediction_and_widen():
+    models = FastModels.fit([_series("a", 16, 4), _series("b", 3, 5)])
+    years, ens, lo, hi, w = models.forecast(["a", "b"], 5)
+    np.testing.assert_array_equal(years[0], np.arange(2016, 2021))
+    assert np.all(lo <= ens) and np.all(ens <= hi)
+    np.testing.assert_allclose(w.sum(axis=1), 1.0)
+    # empirical band grows with the horizon; short series keep the fixed band
+    assert np.all(np.diff(hi[0] - lo[0]) > 0)
+    np.testing.assert_allclose((hi[1] - ens[1]) / np.abs(ens[1]), fast._FALLBACK_BAND)
@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from models import growth
+from models.cache import MISSING
+from models.economy import IndustrySeries
+
+
+def _series(key: str) -> IndustrySeries:
+    years = np.arange(2010, 2024)
+    return IndustrySeries(key, years, np.linspace(1.0, 2.0, len(years)), None)
+
+
+@pytest.fixture
+def slow_pool(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fit(kind, years, values):
+        calls.append(kind)
+        release.wait(5)
+        return ("model", kind)
+
+    pool = ThreadPoolExecutor(max_workers=8)
+    monkeypatch.setattr(growth, "fit_model", fit)
+    monkeypatch.setattr(growth, "_fit_pool", lambda: pool)
+    monkeypatch.setattr(growth, "_FIT_TIMEOUT", 0.2)
+    monkeypatch.setattr(growth, "enabled_kinds", lambda: ["rf"])
+    monkeypatch.setattr(growth.ARTIFACTS, "load", lambda *a: MISSING)
+    growth._MODEL_CACHE.clear()
+    yield calls, release
+    release.set()
+    pool.shutdown(wait=True)
+    growth._INFLIGHT.clear()
+    growth._MODEL_CACHE.clear()
+
+
+def test_timeout_is_one_deadline_for_all_fits(slow_pool):
+    series = [_series(f"ind{i}") for i in range(4)]
+    started = time.perf_counter()
+    timed_out = growth._prefit(series, 0)
+    assert time.perf_counter() - started < 0.6
+    assert timed_out == {(s.key, "rf") for s in series}
+
+
+def test_running_fits_are_joined_not_resubmitted(slow_pool):
+    calls, release = slow_pool
+    series = [_series(f"ind{i}") for i in range(3)]
+    growth._prefit(series, 0)
+    growth._prefit(series, 0)
+    assert len(calls) == 3
+    release.set()
+    assert growth._prefit(series, 0) == set()
+    assert all((s.key, "rf", 0) in growth._MODEL_CACHE for s in series)
+    assert not growth._INFLIGHT
+
+
+def test_matching_artifacts_are_not_refit(slow_pool, monkeypatch):
+    calls, _ = slow_pool
+    monkeypatch.setattr(growth.ARTIFACTS, "load", lambda key, kind, digest: ("artifact", key))
+    series = [_series(f"ind{i}") for i in range(3)]
+    assert growth._prefit(series, 0) == set()
+    assert calls == []
+    assert growth._MODEL_CACHE.get(("ind0", "rf", 0)) == ("artifact", "ind0")
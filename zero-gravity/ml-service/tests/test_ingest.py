@@ -0,0 +1,80 @@
+from pathlib import Path
+from typing import Any, List
+
+import pandas as pd
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+
+from util.ingest import ingest_streaming, ingest_workbook  # noqa: E402
+
+
+def _write(path: Path, sheets: dict) -> Path:
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+_HEADER = ["Year", "Industry", "Value Added (USD)", "Employment"]
+_SHEETS = {
+    "a": [
+        _HEADER,
+        [2020, "Space Manufacturing", 10.0, 100],
+        [2020, "Space Manufacturing", 10.0, 100],  # exact duplicate: dropped
+        [2020, "space_manufacturing", 5.0, 50],  # same key, different values: summed
+        [2021, " Space Manufacturing ", 12.5, None],
+        [2021, "Launch", 3.0, 30],
+        [None, "Launch", 1.0, 1],
+    ],
+    "b": [
+        _HEADER,
+        [2020, "Launch", 2.0, 20],
+        [2020, "Launch", 2.0, 20],
+        [2022, "Launch", 4.0, 40],
+    ],
+}
+
+
+def _rows(records: List[Any]) -> List[tuple]:
+    return [(int(r["year"]), r["industry_id"], float(r["valueAddedCurrentUSD"]), float(r["employment"])) for r in records]
+
+
+def test_streaming_matches_pandas_ingest(tmp_path):
+    xlsx = _write(tmp_path / "Business.xlsx", _SHEETS)
+    records, changed = ingest_streaming([xlsx], state_path=tmp_path / "state.json")
+    expected = ingest_workbook(xlsx).to_dict(orient="records")
+    assert _rows(records) == _rows(expected)
+    assert changed == {"space_manufacturing", "launch"}
+
+
+def test_streaming_only_reports_changed_industries(tmp_path):
+    state = tmp_path / "state.json"
+    xlsx = _write(tmp_path / "Business.xlsx", _SHEETS)
+    ingest_streaming([xlsx], state_path=state)
+    assert ingest_streaming([xlsx], state_path=state)[1] == set()
+
+    sheets = dict(_SHEETS, b=_SHEETS["b"] + [[2023, "Launch", 1.0, 10]])
+    _write(xlsx, sheets)
+    records, changed = ingest_streaming([xlsx], state_path=state)
+    assert changed == {"launch"}
+    assert _rows(records) == _rows(ingest_workbook(xlsx).to_dict(orient="records"))
+
+
+def test_same_named_drops_from_different_directories_accumulate(tmp_path):
+    state = tmp_path / "state.json"
+    (tmp_path / "drop1").mkdir()
+    (tmp_path / "drop2").mkdir()
+    first = _write(tmp_path / "drop1" / "Business.xlsx", _SHEETS)
+    second = _write(tmp_path / "drop2" / "Business.xlsx", {"c": [_HEADER, [2024, "Launch", 5.0, 50]]})
+    ingest_streaming([first], state_path=state)
+    records, changed = ingest_streaming([second], state_path=state)
+    assert changed == {"launch"}
+
+    both = pd.concat([ingest_workbook(first), ingest_workbook(second)], ignore_index=True)
+    expected = both.groupby(["year", "industry_id"]).sum().reset_index().sort_values(["industry_id", "year"])
+    assert _rows(records) == _rows(expected.to_dict(orient="records"))
@@ -0,0 +1,84 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import main
+from models.economy import EconomyIndex
+from models.jobs import project_jobs
+
+
+@pytest.fixture
+def projection():
+    rows = [
+        (y, ind, 1e9 * (j + 1) * 1.05 ** (y - 2010), 1500.0 * (j + 1) + 10 * (y - 2010))
+        for j, ind in enumerate(["manufacturing", 'café "ops"', "information"])
+        for y in range(2010, 2022 - j)
+    ]
+    frame = pd.DataFrame(rows, columns=["year", "industry_id", "valueAddedCurrentUSD", "employment"])
+    return project_jobs(["manufacturing", 'café "ops"', "information"], 5, 0.02, index=EconomyIndex(frame))
+
+
+def _from_columnar(body):
+    inds, years, states = body["industries"], body["years"], body["states"]
+    it, geo = body["items"], body["geo"]
+    items = [
+        {
+            "industry_id": inds[it["industry"][k]],
+            "year": years[it["year"][k]],
+            **{c: it[c][k] for c in ("employment_direct", "employment_indirect", "employment_induced", "employment_total")},
+        }
+        for k in range(len(it["industry"]))
+    ]
+    geo_rows = [
+        {
+            "state": states[geo["state"][k]],
+            "industry_id": inds[geo["industry"][k]],
+            "year": years[geo["year"][k]],
+            "employment_total": geo["employment_total"][k],
+        }
+        for k in range(len(geo["industry"]))
+    ]
+    return {"items": items, "geo": geo_rows}
+
+
+def test_records_are_byte_identical_to_json_response(projection):
+    assert projection.to_json() == JSONResponse(projection.to_dict()).body
+
+
+def test_columnar_round_trips_to_records(projection):
+    assert _from_columnar(projection.to_columnar()) == projection.to_dict()
+
+
+def test_arrow_is_two_streams_that_round_trip_to_records(projection):
+    pa = pytest.importorskip("pyarrow")
+    reader = pa.BufferReader(projection.to_arrow())
+    items = pa.ipc.open_stream(reader).read_all()
+    geo = pa.ipc.open_stream(reader).read_all()
+    assert items.schema.metadata[b"table"] == b"items"
+    assert geo.schema.metadata[b"table"] == b"geo"
+    records = projection.to_dict()
+
+    def rows(table, columns):
+        data = {c: table.column(c).to_pylist() for c in columns}
+        return [dict(zip(columns, values)) for values in zip(*data.values())]
+
+    assert rows(items, list(records["items"][0])) == records["items"]
+    assert rows(geo, list(records["geo"][0])) == records["geo"]
+
+
+def test_endpoint_formats_share_one_projection(monkeypatch, projection):
+    monkeypatch.setattr(main, "project_jobs", lambda *args: projection)
+    body = {"industry_ids": ["manufacturing"], "horizon_years": 5}
+    with TestClient(main.app) as client:
+        records = client.post("/jobs", json=body)
+        columnar = client.post("/jobs", json=body, headers={"accept": main.COLUMNAR_JSON})
+        arrow = client.post("/jobs", json={**body, "format": "arrow"})
+    assert records.content == projection.to_json()
+    assert _from_columnar(columnar.json()) == records.json()
+    if arrow.status_code != 406:
+        assert arrow.headers["content-type"] == main.ARROW_STREAM
+        assert arrow.content == projection.to_arrow()
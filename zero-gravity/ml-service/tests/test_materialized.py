@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from models import economy, growth, jobs
+from models.cache import LRUCache
+from models.economy import EconomyIndex
+from models.materialized import MaterializedStore, materialize
+
+_HORIZON = 4
+_KEYS = ("manufacturing", "space_vehicles", "information", "ground_ops")
+
+
+def _frame(scale: float = 1.0) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    rows = []
+    for j, ind in enumerate(_KEYS):
+        va = 1e9 * (j + 1) * np.exp(np.cumsum(rng.normal(0.04, 0.03, 12)))
+        emp = 2000.0 * (j + 1) * np.exp(np.cumsum(rng.normal(0.02, 0.02, 12)))
+        for t, y in enumerate(range(2010, 2022)):
+            rows.append((y, ind, va[t] * (scale if ind == "information" else 1.0), emp[t]))
+    return pd.DataFrame(rows, columns=["year", "industry_id", "valueAddedCurrentUSD", "employment"])
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    holder = {"index": EconomyIndex(_frame(), version=1)}
+    store = MaterializedStore(tmp_path / "materialized")
+    monkeypatch.setattr(economy, "economy_index", lambda: holder["index"])
+    monkeypatch.setattr(growth, "_PARALLEL", False)
+    monkeypatch.setattr(jobs, "MATERIALIZED", store)
+    monkeypatch.setattr(growth, "MATERIALIZED", store)
+    return holder, store, tmp_path / "materialized"
+
+
+def _live(monkeypatch, tmp_path, fn, *args):
+    # same call against an empty store and cold forecast cache
+    with monkeypatch.context() as m:
+        empty = MaterializedStore(tmp_path / "empty")
+        m.setattr(jobs, "MATERIALIZED", empty)
+        m.setattr(growth, "MATERIALIZED", empty)
+        m.setattr(growth, "_FORECAST_CACHE", LRUCache(maxsize=64))
+        return fn(*args)
+
+
+@pytest.mark.parametrize(
+    "ids",
+    [list(_KEYS), ["information", "manufacturing"], ["Manufacturing"], ["manufacturing", "Space Vehicles", "ground"]],
+)
+def test_materialized_jobs_match_live(env, monkeypatch, tmp_path, ids):
+    holder, store, root = env
+    materialize(horizon_years=_HORIZON, productivity_growth=0.02, root=root)
+    index = holder["index"]
+    for h in (1, _HORIZON):
+        served = jobs.project_jobs(ids, h, 0.02, index=index).to_json()
+        assert served == _live(monkeypatch, tmp_path, jobs.project_jobs, ids, h, 0.02, None, index).to_json()
+    # only exact ids can come from the store; unmatched ids are dropped either way
+    exact = all(index.get(i).key == i for i in ids if index.get(i) is not None)
+    assert store.hits == (2 if exact else 0)
+
+
+def test_materialized_growth_matches_live(env, monkeypatch, tmp_path):
+    holder, store, root = env
+    materialize(horizon_years=_HORIZON, root=root)
+    ids = list(_KEYS) + ["Manufacturing"]
+    served = growth.forecast_growth(ids, 3, holder["index"])
+    assert store.hits == len(ids)
+    assert served == _live(monkeypatch, tmp_path, growth.forecast_growth, ids, 3, holder["index"])
+
+
+def test_delta_refresh_recomputes_only_changed_rows(env, monkeypatch, tmp_path):
+    holder, store, root = env
+    _, recomputed = materialize(horizon_years=_HORIZON, root=root)
+    assert sorted(recomputed) == sorted(_KEYS)
+    assert materialize(horizon_years=_HORIZON, root=root)[1] == []
+    assert materialize({"ground_ops"}, horizon_years=_HORIZON, root=root)[1] == ["ground_ops"]
+
+    holder["index"] = EconomyIndex(_frame(scale=1.5), version=2)
+    assert materialize(horizon_years=_HORIZON, root=root)[1] == ["information"]
+    ids = list(_KEYS)
+    served = jobs.project_jobs(ids, _HORIZON, 0.02, index=holder["index"]).to_json()
+    assert store.hits == 1
+    assert served == _live(monkeypatch, tmp_path, jobs.project_jobs, ids, _HORIZON, 0.02, None, holder["index"]).to_json()
+    assert growth.forecast_growth(ids, 2, holder["index"]) == _live(
+        monkeypatch, tmp_path, growth.forecast_growth, ids, 2, holder["index"]
+    )
+
+
+@pytest.mark.parametrize(
+    "tables",
+    [
+        {"industry_bias": {**jobs.INDUSTRY_BIAS, "manufacturing": {"OH": 1.3, "MI": 1.2}}},
+        {"drift_states": {**jobs.DRIFT_STATES, "information": ["TX", "FL"]}},
+        {"default_drift_states": ["NY", "WA"]},
+        {"drift_rate": 0.03},
+    ],
+)
+def test_changed_geography_tables_force_a_live_recompute(env, monkeypatch, tmp_path, tables):
+    holder, store, root = env
+    materialize(horizon_years=_HORIZON, productivity_growth=0.02, root=root)
+    args = {
+        "base_weights": jobs.STATE_BASE_WEIGHTS,
+        "industry_bias": jobs.INDUSTRY_BIAS,
+        "drift_states": jobs.DRIFT_STATES,
+        "default_drift_states": jobs.DEFAULT_DRIFT_STATES,
+        **tables,
+    }
+    monkeypatch.setattr(jobs, "_GEOGRAPHY", jobs.Geography(**args))
+    ids, index = list(_KEYS), holder["index"]
+    served = jobs.project_jobs(ids, _HORIZON, 0.02, index=index).to_json()
+    assert store.hits == 0
+    assert served == _live(monkeypatch, tmp_path, jobs.project_jobs, ids, _HORIZON, 0.02, None, index).to_json()
+
+
+def test_changed_growth_settings_force_a_live_recompute(env, monkeypatch, tmp_path):
+    holder, store, root = env
+    materialize(horizon_years=_HORIZON, root=root)
+    monkeypatch.setattr(growth, "RF_PARAMS", {**growth.RF_PARAMS, "n_estimators": 50})
+    monkeypatch.setattr(growth, "_FORECAST_CACHE", LRUCache(maxsize=64))
+    growth.forecast_growth(list(_KEYS), 3, holder["index"])
+    assert store.hits == 0
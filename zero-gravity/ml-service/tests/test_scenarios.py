@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from models import scenarios
+from models.economy import EconomyIndex
+from models.jobs import project_jobs
+from models.scenarios import ScenarioSpec, simulate_jobs
+
+INDUSTRIES = ["manufacturing", "information", "utilities", "construction"]
+
+
+@pytest.fixture
+def index():
+    rows = [
+        (y, ind, 1e9 * (j + 1) * 1.05 ** (y - 2010), 1500.0 * (j + 1) + 10 * (y - 2010))
+        for j, ind in enumerate(INDUSTRIES)
+        for y in range(2010, 2022 - j)
+    ]
+    frame = pd.DataFrame(rows, columns=["year", "industry_id", "valueAddedCurrentUSD", "employment"])
+    return EconomyIndex(frame)
+
+
+def test_degenerate_distributions_match_the_point_projection(index):
+    spec = ScenarioSpec(samples=3, productivity_sd=0.0, ratio_sd=0.0, indirect_sd=0.0, induced_sd=0.0)
+    body = simulate_jobs(INDUSTRIES, 5, spec, index=index)
+    point = project_jobs(INDUSTRIES, 5, spec.productivity_growth, index=index)
+
+    assert body["industries"] == point.industry_ids
+    assert body["states"] == list(point.states)
+    years = np.array(body["years"])[body["items"]["year"]].reshape(point.years.shape)
+    np.testing.assert_array_equal(years, point.years)
+    # the point projection truncates where the bands round, so allow one job either way
+    for band in body["items"]["employment_direct"].values():
+        np.testing.assert_allclose(np.reshape(band, point.direct.shape), point.direct, atol=1)
+    for band in body["items"]["employment_total"].values():
+        np.testing.assert_allclose(np.reshape(band, point.total.shape), point.total, atol=1)
+    for band in body["geo"]["employment_total"].values():
+        np.testing.assert_allclose(np.reshape(band, point.geo.shape), point.geo, atol=1)
+
+
+def test_bands_do_not_depend_on_the_chunk_size(index, monkeypatch):
+    spec = ScenarioSpec(samples=200, seed=7)
+    monkeypatch.setattr(scenarios, "_CHUNK_BYTES", 1 << 30)
+    whole = simulate_jobs(INDUSTRIES, 6, spec, index=index)
+    # one industry per chunk
+    monkeypatch.setattr(scenarios, "_CHUNK_BYTES", 1)
+    chunked = simulate_jobs(INDUSTRIES, 6, spec, index=index)
+    assert chunked == whole
+
+
+def test_band_layout_is_one_array_per_quantile(index):
+    spec = ScenarioSpec(samples=50, quantiles=(0.1, 0.9))
+    body = simulate_jobs(INDUSTRIES[:2], 3, spec, index=index)
+    assert body["format"] == "columnar"
+    assert set(body["items"]["employment_total"]) == {"p10", "p90"}
+    assert len(body["items"]["employment_total"]["p10"]) == len(body["items"]["industry"]) == 2 * 3
+    assert len(body["geo"]["employment_total"]["p90"]) == len(body["geo"]["state"]) == 2 * 3 * len(body["states"])
+    low, high = (np.array(body["items"]["employment_total"][k]) for k in ("p10", "p90"))
+    assert (low <= high).all()
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"samples": 0},
+        {"samples": main._MAX_SCENARIO_SAMPLES + 1},
+        {"quantiles": []},
+        {"quantiles": [0.5, 1.5]},
+        {"quantiles": [-0.1]},
+        {"ratio_sd": -0.01},
+        {"productivity_sd": -1.0},
+        {"induced_sd": -0.5},
+    ],
+)
+def test_endpoint_rejects_invalid_specs(override):
+    res = TestClient(main.app).post("/jobs/scenarios", json={"industry_ids": ["manufacturing"], **override})
+    assert res.status_code == 422
@@ -0,0 +1,62 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from models import sentiment_engine
+from models.score_cache import ScoreCache
+from models.sentiment_engine import SentimentEngine
+
+
+def test_memory_then_disk_then_miss(tmp_path):
+    db = str(tmp_path / "scores.sqlite")
+    cache = ScoreCache(db, memory_size=2)
+    cache.put_many("m", ["a", "b", "c"], np.array([0.1, 0.2, 0.3]))
+    # the LRU only holds the last two; "a" comes back from SQLite
+    values, missing = cache.get_many("m", ["c", "a", "z", "c"])
+    np.testing.assert_array_equal(values[[0, 1, 3]], [0.3, 0.1, 0.3])
+    assert np.isnan(values[2]) and missing == [2]
+    stats = cache.stats()
+    assert (stats["memory"]["hits"], stats["diskHits"], stats["misses"]) == (2, 1, 1)
+    assert stats["hitRatio"] == pytest.approx(3 / 4)
+
+
+def test_scores_persist_across_instances(tmp_path):
+    db = str(tmp_path / "scores.sqlite")
+    ScoreCache(db).put_many("m", ["kept"], np.array([0.5]))
+    fresh = ScoreCache(db)
+    values, missing = fresh.get_many("m", ["kept", "kept"])
+    np.testing.assert_array_equal(values, [0.5, 0.5])
+    assert missing == [] and fresh.stats()["diskHits"] == 2
+    # promoted to memory: the next lookup does not touch the disk tier
+    fresh.get_many("m", ["kept"])
+    assert fresh.stats()["diskHits"] == 2 and fresh.stats()["memory"]["hits"] == 1
+
+
+def test_memory_only_when_disabled():
+    cache = ScoreCache("", memory_size=1)
+    cache.put_many("m", ["a", "b"], np.array([1.0, -1.0]))
+    values, missing = cache.get_many("m", ["a", "b"])
+    assert missing == [0] and values[1] == -1.0
+    assert cache.stats()["diskPath"] is None
+
+
+def test_namespaces_keep_models_and_truncation_apart(tmp_path, monkeypatch):
+    cache = ScoreCache(str(tmp_path / "scores.sqlite"))
+    engine = SentimentEngine(cache=cache)
+    scored: List[str] = []
+
+    def fake(model_id: str, texts: List[str]) -> np.ndarray:
+        scored.extend(f"{model_id}:{t}" for t in texts)
+        return np.full(len(texts), 1.0 if model_id == "pos" else -1.0)
+
+    monkeypatch.setattr(engine, "model_scores", fake)
+    assert engine.cached_model_scores("pos", ["x"])[0] == 1.0
+    assert engine.cached_model_scores("neg", ["x"])[0] == -1.0
+    assert engine.cached_model_scores("pos", ["x"])[0] == 1.0
+    assert scored == ["pos:x", "neg:x"]
+
+    # a different truncation length is a different score
+    monkeypatch.setattr(sentiment_engine, "_MAX_LENGTH", sentiment_engine._MAX_LENGTH + 1)
+    engine.cached_model_scores("pos", ["x"])
+    assert scored == ["pos:x", "neg:x", "pos:x"]
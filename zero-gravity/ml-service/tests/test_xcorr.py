@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from models.xcorr import correlation_pvalues, lagged_correlations
+
+
+def _reference(x: np.ndarray, z: np.ndarray, max_lag: int) -> np.ndarray:
+    n = x.shape[1]
+    out = np.full((x.shape[0], max_lag + 1), np.nan)
+    for i in range(x.shape[0]):
+        for k in range(max_lag + 1):
+            a, b = x[i, : n - k], z[i, k:]
+            if len(a) >= 2 and np.ptp(a) > 0 and np.ptp(b) > 0:
+                out[i, k] = np.corrcoef(a, b)[0, 1]
+    return out
+
+
+@pytest.mark.parametrize("method,n", [("direct", 40), ("fft", 40), ("auto", 600)])
+def test_lagged_correlations_match_corrcoef(method, n):
+    rng = np.random.default_rng(7)
+    x = rng.normal(size=(3, n)).cumsum(axis=1) + 1e4
+    z = 0.5 * np.roll(x, 2, axis=1) + rng.normal(size=(3, n))
+    corr, counts = lagged_correlations(x, z, 12, method=method)
+    np.testing.assert_allclose(corr, _reference(x, z, 12), rtol=0, atol=1e-9)
+    np.testing.assert_array_equal(counts, n - np.arange(13))
+
+
+def test_constant_window_is_nan():
+    x = np.array([[1.0, 2.0, 3.0, 4.0, 5.0]])
+    z = np.array([[7.0, 3.0, 3.0, 3.0, 3.0]])
+    corr, _ = lagged_correlations(x, z, 2, method="direct")
+    assert np.isfinite(corr[0, 0])
+    assert np.isnan(corr[0, 1]) and np.isnan(corr[0, 2])
+
+
+def test_pvalues_match_pearsonr():
+    stats = pytest.importorskip("scipy.stats")
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=(1, 30))
+    z = 0.3 * x + rng.normal(size=(1, 30))
+    corr, counts = lagged_correlations(x, z, 4)
+    pvalues = correlation_pvalues(corr, counts)
+    for k in range(5):
+        expected = stats.pearsonr(x[0, : 30 - k], z[0, k:])
+        assert corr[0, k] == pytest.approx(expected[0], abs=1e-12)
+        assert pvalues[0, k] == pytest.approx(expected[1], rel=1e-9)
@@ -0,0 +1,243 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import shutil
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore
+
+BENCH_DIR = Path(__file__).resolve().parent.parent / "data" / "bench"
+
+
+def synthetic_industries(n: int, base: List[str]) -> List[str]:
+    """The fallback industries first, then numbered synthetic ones."""
+    names = base[:n]
+    return names + [f"industry_{i:04d}" for i in range(len(names), n)]
+
+
+def synthetic_states(n: int, real: List[str]) -> List[str]:
+    """Real state codes first, then unused two-letter codes (Geography only keeps <= 2 chars)."""
+    extra = (a + b for a, b in itertools.product(string.ascii_uppercase, repeat=2))
+    codes = list(real[:n])
+    taken = set(codes)
+    for code in extra:
+        if len(codes) >= n:
+            break
+        if code not in taken:
+            codes.append(code)
+    return codes
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KiB elsewhere
+
+
+def _measure(fn: Callable[[int], Any], iterations: int) -> Dict[str, Any]:
+    """Cold first call, warm latency percentiles, then one traced call for allocations.
+
+    Memory is reported per case as the tracemalloc peak of that call; RSS is a
+    process-lifetime high-water mark, so it is only recorded once for the run.
+    """
+    started = time.perf_counter()
+    fn(0)
+    cold = time.perf_counter() - started
+
+    latencies = []
+    wall = time.perf_counter()
+    for i in range(1, iterations + 1):
+        t0 = time.perf_counter()
+        fn(i)
+        latencies.append(time.perf_counter() - t0)
+    wall = time.perf_counter() - wall
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn(iterations + 1)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(max(0, s.count_diff) for s in after.compare_to(before, "lineno"))
+
+    ms = np.array(latencies) * 1000.0
+    return {
+        "iterations": iterations,
+        "coldMs": cold * 1000.0,
+        "meanMs": float(ms.mean()) if len(ms) else None,
+        "p50Ms": float(np.percentile(ms, 50)) if len(ms) else None,
+        "p95Ms": float(np.percentile(ms, 95)) if len(ms) else None,
+        "p99Ms": float(np.percentile(ms, 99)) if len(ms) else None,
+        "throughputPerSec": iterations / wall if wall > 0 else None,
+        "tracedPeakBytes": peak,
+        "allocatedBlocks": blocks,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    workdir = Path(tempfile.mkdtemp(prefix="zg-bench-"))
+    json_path = workdir / "space_economy.json"
+    # point the service at the generated dataset before any model module is imported
+    os.environ["ECONOMY_PATH"] = str(json_path)
+    os.environ["ECONOMY_ARROW_PATH"] = str(workdir / "space_economy.arrow")
+    os.environ["MODEL_ARTIFACT_DIR"] = str(workdir / "models")
+    os.environ["MATERIALIZED_DIR"] = str(workdir / "materialized")
+    os.environ["SENTIMENT_CACHE_PATH"] = ""
+    # no backend preloading: cold latency should include whatever the first call loads
+    os.environ["BACKEND_WARMUP"] = "0"
+    # in-process so the generated geography applies and RSS/allocations are ours
+    os.environ["COMPUTE_WORKERS"] = "0"
+
+    from models.economy import SYNTHETIC_INDUSTRIES, _synthetic_economy
+
+    t0 = time.perf_counter()
+    industries = synthetic_industries(args.industries, SYNTHETIC_INDUSTRIES)
+    frame = _synthetic_economy(industries, list(range(2024 - args.years, 2024)))
+    frame.to_json(json_path, orient="records")
+    generate_seconds = time.perf_counter() - t0
+
+    from fastapi.testclient import TestClient
+
+    import main
+    from models import jobs
+    from models.growth import forecast_growth
+    from models.jobs import predict_jobs
+    from models.sentiment import analyze_sentiment
+
+    states = synthetic_states(args.states, jobs._GEOGRAPHY.states)
+    weights = {st: jobs.STATE_BASE_WEIGHTS.get(st, 0.5) for st in states}
+    jobs._GEOGRAPHY = jobs.Geography(weights, jobs.INDUSTRY_BIAS, jobs.DRIFT_STATES, jobs.DEFAULT_DRIFT_STATES)
+
+    rng = np.random.default_rng(args.seed)
+    size = min(args.request_size, len(industries))
+    # one industry sample per iteration, shared by every case so caches behave alike
+    samples = [
+        [str(x) for x in rng.choice(industries, size=size, replace=False)]
+        for _ in range(args.iterations + 2)
+    ]
+    h = args.horizon
+    client = TestClient(main.app)
+
+    def _post(path: str, body: Dict[str, Any]) -> None:
+        res = client.post(path, json=body)
+        res.raise_for_status()
+
+    cases: Dict[str, Callable[[int], Any]] = {
+        "forecast_growth": lambda i: forecast_growth(samples[i], h),
+        "predict_jobs": lambda i: predict_jobs(samples[i], h, 0.02),
+        "analyze_sentiment": lambda i: analyze_sentiment(samples[i], "quarterly", 8),
+        "http_growth": lambda i: _post("/forecast/growth", {"industry_ids": samples[i], "horizon_years": h}),
+        "http_jobs": lambda i: _post("/jobs", {"industry_ids": samples[i], "horizon_years": h}),
+        "http_jobs_columnar": lambda i: _post(
+            "/jobs", {"industry_ids": samples[i], "horizon_years": h, "format": "columnar"}
+        ),
+        "http_sentiment": lambda i: _post("/sentiment", {"industry_ids": samples[i]}),
+        "http_batch": lambda i: _post(
+            "/batch",
+            {
+                "growth": {"industry_ids": samples[i], "horizon_years": h},
+                "jobs": {"industry_ids": samples[i], "horizon_years": h},
+                "sentiment": {"industry_ids": samples[i]},
+            },
+        ),
+    }
+    selected = args.cases or list(cases)
+    results: Dict[str, Any] = {}
+    for name in selected:
+        results[name] = _measure(cases[name], args.iterations)
+        print(
+            f"{name:20s} cold {results[name]['coldMs']:9.1f} ms  "
+            f"p50 {results[name]['p50Ms'] or 0:9.2f}  p95 {results[name]['p95Ms'] or 0:9.2f}  "
+            f"p99 {results[name]['p99Ms'] or 0:9.2f} ms  {results[name]['throughputPerSec'] or 0:8.1f}/s"
+        )
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "createdAt": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("out", "compare")},
+        "dataset": {
+            "industries": len(industries),
+            "years": args.years,
+            "states": len(states),
+            "rows": len(frame),
+            "generateSeconds": generate_seconds,
+        },
+        "cases": results,
+        # whole run, not per case
+        "peakRssKb": _peak_rss_kb(),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print per-case ratios against a baseline run; returns the regressed metrics."""
+    regressions: List[str] = []
+    if baseline.get("dataset", {}).get("rows") != current["dataset"]["rows"]:
+        print("note: baseline was run on a different dataset size")
+    for name, cur in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            continue
+        for metric in ("p50Ms", "p95Ms", "p99Ms", "tracedPeakBytes"):
+            if not base.get(metric) or cur.get(metric) is None:
+                continue
+            ratio = cur[metric] / base[metric]
+            flag = "  REGRESSION" if ratio > 1.0 + threshold else ""
+            print(f"{name:20s} {metric:16s} {base[metric]:14.2f} -> {cur[metric]:14.2f}  x{ratio:5.2f}{flag}")
+            if flag:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the ML service on a synthetic scaled-up dataset")
+    parser.add_argument("--industries", type=int, default=64)
+    parser.add_argument("--years", type=int, default=24)
+    parser.add_argument("--states", type=int, default=52, help="up to 676 (two-letter codes)")
+    parser.add_argument("--horizon", type=int, default=7)
+    parser.add_argument("--request-size", type=int, default=8, help="industries per request")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", nargs="+", help="subset of cases to run (default: all)")
+    parser.add_argument("--out", type=Path, help="results JSON (default: data/bench/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    result = run(args)
+    out = args.out or BENCH_DIR / time.strftime("%Y%m%d-%H%M%S.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Wrote {out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
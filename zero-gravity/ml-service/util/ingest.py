@@ -1,30 +1,59 @@
+import argparse
+import hashlib
 import json
+import math
+import os
+import posixpath
+import sys
+import zipfile
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Set, Tuple
+from xml.etree import ElementTree
 
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.economy import write_economy_arrow  # noqa: E402
+from models.materialized import materialize  # noqa: E402
+from models.telemetry import STAGES, span  # noqa: E402
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 XLSX_PATH = DATA_DIR / "Business.xlsx"
 OUT_JSON = DATA_DIR / "space_economy.json"
+OUT_ARROW = DATA_DIR / "space_economy.arrow"
+STATE_JSON = DATA_DIR / "ingest_state.json"
+STATE_VERSION = 2
 
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_CHUNK = 1 << 20
 
-def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    colmap = {str(c).strip().lower(): c for c in df.columns}
-    df = df.rename(columns=colmap)
-    # Try to map expected columns
-    candidates = {}
-    for key in df.columns:
+# (year, industry_id) -> [valueAddedCurrentUSD, employment]
+_Partial = Dict[Tuple[int, str], List[float]]
+
+
+def _match_columns(headers: Sequence[Any]) -> Dict[str, int]:
+    """Positions of the year/industry/value/employment columns among ``headers``."""
+    candidates: Dict[str, int] = {}
+    for pos, key in enumerate(headers):
         low = str(key).lower()
         if low in ("year", "time", "date"):
-            candidates["year"] = key
+            candidates["year"] = pos
         if "industry" in low or "sector" in low or "category" in low:
-            candidates["industry_id"] = key
+            candidates["industry_id"] = pos
         if "value" in low and ("added" in low or "current" in low or "usd" in low or "nominal" in low):
-            candidates["valueAddedCurrentUSD"] = key
+            candidates["valueAddedCurrentUSD"] = pos
         if "employment" in low or "jobs" in low:
-            candidates["employment"] = key
+            candidates["employment"] = pos
+    return candidates
+
+
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    colmap = {str(c).strip().lower(): c for c in df.columns}
+    df = df.rename(columns=colmap)
+    # Try to map expected columns
+    candidates = {target: df.columns[pos] for target, pos in _match_columns(list(df.columns)).items()}
 
     cols = [candidates.get("year"), candidates.get("industry_id"), candidates.get("valueAddedCurrentUSD"), candidates.get("employment")]
     cols = [c for c in cols if c is not None]
@@ -56,36 +85,269 @@ def ingest_workbook(xlsx_path: Path) -> pd.DataFrame:
     frames: List[pd.DataFrame] = []
     for sheet in book.sheet_names:
         try:
-            df = book.parse(sheet)
-            norm = _normalize_columns(df)
+            with span("ingest.read_sheet"):
+                df = book.parse(sheet)
+                norm = _normalize_columns(df)
             if not norm.empty:
                 frames.append(norm)
         except Exception:
             continue
     if not frames:
         raise RuntimeError("No usable sheets found in Business.xlsx")
-    merged = pd.concat(frames, ignore_index=True)
-    # Collapse duplicates by summing values where appropriate
-    agg: Dict[str, Any] = {"valueAddedCurrentUSD": "sum"}
-    if "employment" in merged:
-        agg["employment"] = "sum"
-    grouped = merged.groupby(["year", "industry_id"], dropna=True).agg(agg).reset_index()
+    with span("ingest.combine"):
+        merged = pd.concat(frames, ignore_index=True)
+        # Collapse duplicates by summing values where appropriate
+        agg: Dict[str, Any] = {"valueAddedCurrentUSD": "sum"}
+        if "employment" in merged:
+            agg["employment"] = "sum"
+        grouped = merged.groupby(["year", "industry_id"], dropna=True).agg(agg).reset_index()
     return grouped.sort_values(["industry_id", "year"])  # canonical ordering
 
 
-def main() -> None:
+def sheet_digests(xlsx_path: Path) -> Dict[str, str]:
+    """Content hash per sheet, read from the raw worksheet XML inside the xlsx.
+
+    Shared strings are folded into every digest since cells reference them by
+    index. Members are hashed in chunks, so memory stays flat.
+    """
+    digests: Dict[str, str] = {}
+    with zipfile.ZipFile(xlsx_path) as zf:
+        names = set(zf.namelist())
+
+        def _member_hash(member: str, h: Any) -> None:
+            with zf.open(member) as f:
+                for chunk in iter(lambda: f.read(_CHUNK), b""):
+                    h.update(chunk)
+
+        shared = hashlib.sha256()
+        if "xl/sharedStrings.xml" in names:
+            _member_hash("xl/sharedStrings.xml", shared)
+        rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target", "") for rel in rels}
+        workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+        for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+            target = targets.get(sheet.get(f"{_NS_REL}id"), "")
+            member = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+            h = hashlib.sha256(shared.digest())
+            if member in names:
+                _member_hash(member, h)
+            digests[sheet.get("name", "")] = h.hexdigest()
+    return digests
+
+
+def _number(v: Any) -> Optional[float]:
+    if v is None or isinstance(v, bool):
+        return None
+    try:
+        f = float(v)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(f) else f
+
+
+def _cell(row: Sequence[Any], i: Optional[int]) -> Any:
+    return row[i] if i is not None and i < len(row) else None
+
+
+def _stream_sheet(rows: Iterator[Sequence[Any]]) -> Tuple[_Partial, bool]:
+    """Aggregate one sheet row by row; mirrors _normalize_columns + groupby sum.
+
+    Returns the partial sums and whether the sheet had an employment column.
+    """
+    header: Optional[Sequence[Any]] = None
+    for row in rows:
+        if any(c is not None for c in row):
+            header = row
+            break
+    if header is None:
+        return {}, False
+    cols = _match_columns(header)
+    if "year" not in cols or "industry_id" not in cols:
+        return {}, False
+    yi, ii = cols["year"], cols["industry_id"]
+    vi, ei = cols.get("valueAddedCurrentUSD"), cols.get("employment")
+
+    partial: _Partial = {}
+    # (value, employment) pairs already summed per (year, industry): duplicate
+    # rows are dropped like drop_duplicates(), compared exactly, and memory
+    # follows the distinct rows of each key rather than every row read
+    summed: Dict[Tuple[int, str], Set[Tuple[Optional[float], Optional[float]]]] = {}
+    for row in rows:
+        year = _number(_cell(row, yi))
+        ind = _cell(row, ii)
+        if year is None or not year.is_integer() or ind is None:
+            continue
+        key = (int(year), str(ind).strip().replace(" ", "_").lower())
+        va, emp = _number(_cell(row, vi)), _number(_cell(row, ei))
+        pairs = summed.setdefault(key, set())
+        if (va, emp) in pairs:
+            continue
+        pairs.add((va, emp))
+        acc = partial.setdefault(key, [0.0, 0.0])
+        if va is not None:
+            acc[0] += va
+        if emp is not None:
+            acc[1] += emp
+    return partial, ei is not None
+
+
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+        # v1 keyed sheets by bare file name, which cannot be mapped to paths
+        print(f"Ignoring {path} (state version {state.get('version')}); rebuilding from the given workbooks")
+    except (OSError, ValueError):
+        pass
+    return {"version": STATE_VERSION, "sheets": {}}
+
+
+def _save_state(path: Path, state: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _combine(sheets: Dict[str, Any]) -> List[Dict[str, Any]]:
+    totals: _Partial = {}
+    with_employment = False
+    for entry in sheets.values():
+        with_employment = with_employment or entry["hasEmployment"]
+        for year, ind, va, emp in entry["rows"]:
+            acc = totals.setdefault((year, ind), [0.0, 0.0])
+            acc[0] += va
+            acc[1] += emp
+    records: List[Dict[str, Any]] = []
+    for (year, ind), (va, emp) in sorted(totals.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        rec: Dict[str, Any] = {"year": year, "industry_id": ind, "valueAddedCurrentUSD": va}
+        if with_employment:
+            rec["employment"] = emp
+        records.append(rec)
+    return records
+
+
+def ingest_streaming(
+    xlsx_paths: List[Path], state_path: Path = STATE_JSON, reset: bool = False
+) -> Tuple[List[Dict[str, Any]], Set[str]]:
+    """Incrementally ingest workbooks with openpyxl's read-only row streaming.
+
+    Each sheet's partial (year, industry) sums are kept in ``state_path``
+    keyed by the workbook's resolved path and sheet, alongside a content
+    digest, so same-named drops from different directories stay apart.
+    Unchanged sheets are skipped and a new workbook drop only adds its own
+    sheets, so history is never re-read. Returns the merged records and the
+    industries whose rows changed.
+    """
+    from openpyxl import load_workbook
+
+    state = {"version": STATE_VERSION, "sheets": {}} if reset else _load_state(state_path)
+    sheets: Dict[str, Any] = state["sheets"]
+    before = _combine(sheets)
+
+    for xlsx_path in xlsx_paths:
+        book_key = str(Path(xlsx_path).resolve())
+        with span("ingest.digest"):
+            digests = sheet_digests(xlsx_path)
+        # drop sheets that disappeared from a re-delivered workbook
+        for key in [k for k in sheets if k.rsplit("::", 1)[0] == book_key]:
+            if key.rsplit("::", 1)[1] not in digests:
+                del sheets[key]
+        changed = [name for name, d in digests.items() if sheets.get(f"{book_key}::{name}", {}).get("digest") != d]
+        if not changed:
+            continue
+        wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+        try:
+            for name in changed:
+                try:
+                    with span("ingest.read_sheet"):
+                        partial, has_emp = _stream_sheet(wb[name].iter_rows(values_only=True))
+                except Exception:
+                    partial, has_emp = {}, False
+                sheets[f"{book_key}::{name}"] = {
+                    "digest": digests[name],
+                    "hasEmployment": has_emp,
+                    "rows": [[y, ind, va, emp] for (y, ind), (va, emp) in partial.items()],
+                }
+        finally:
+            wb.close()
+
+    with span("ingest.combine"):
+        records = _combine(sheets)
+    if not records:
+        raise RuntimeError("No usable sheets found in the ingested workbooks")
+    old = {(r["industry_id"], r["year"]): r for r in before}
+    new = {(r["industry_id"], r["year"]): r for r in records}
+    changed_industries = {k[0] for k in old.keys() ^ new.keys()}
+    changed_industries |= {k[0] for k in old.keys() & new.keys() if old[k] != new[k]}
+    _save_state(state_path, state)
+    return records, changed_industries
+
+
+def _write_outputs(records: List[Dict[str, Any]]) -> None:
+    # Save as row-oriented JSON list
+    tmp = OUT_JSON.with_name(OUT_JSON.name + ".tmp")
+    with span("ingest.write_json"):
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp, OUT_JSON)
+    # Typed columnar copy preferred by the service loader; written second so
+    # its mtime is never older than the JSON's
+    try:
+        with span("ingest.write_arrow"):
+            write_economy_arrow(pd.DataFrame(records), OUT_ARROW)
+    except ImportError:
+        print("pyarrow not installed; skipped space_economy.arrow")
+
+
+def _materialize(changed: Set[str]) -> None:
+    # industries whose series are unchanged keep their rows (digest check)
+    with span("ingest.materialize"):
+        out_dir, recomputed = materialize(changed)
+    print(f"Wrote {out_dir} ({len(recomputed)} industries recomputed)")
+
+
+def _run(args: argparse.Namespace) -> None:
     DATA_DIR.mkdir(parents=True, exist_ok=True)
+    if args.stream or args.append:
+        paths = list(args.append) or [XLSX_PATH]
+        for p in paths:
+            if not p.exists():
+                raise FileNotFoundError(f"Missing {p}")
+        records, changed = ingest_streaming(paths, reset=args.reset)
+        _write_outputs(records)
+        print(f"Wrote {OUT_JSON} with {len(records)} records ({len(changed)} industries changed)")
+        if args.materialize:
+            _materialize(changed)
+        return
+
     if not XLSX_PATH.exists():
         raise FileNotFoundError(f"Missing {XLSX_PATH}")
     df = ingest_workbook(XLSX_PATH)
-    # Save as row-oriented JSON list
     records = df.to_dict(orient="records")
-    with open(OUT_JSON, "w", encoding="utf-8") as f:
-        json.dump(records, f, ensure_ascii=False)
+    _write_outputs(records)
     print(f"Wrote {OUT_JSON} with {len(records)} records")
+    if args.materialize:
+        _materialize(set())
 
 
-if __name__ == "__main__":
-    main()
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest Business.xlsx into data/space_economy.json")
+    parser.add_argument("--stream", action="store_true", help="row-streaming, incremental ingest")
+    parser.add_argument("--append", nargs="+", type=Path, default=[], help="new workbook drops to add (implies --stream)")
+    parser.add_argument("--reset", action="store_true", help="forget recorded sheets and rebuild from scratch")
+    parser.add_argument("--materialize", action="store_true", help="refresh the precomputed forecasts afterwards")
+    parser.add_argument("--timings", action="store_true", help="print time spent per stage")
+    args = parser.parse_args()
+    try:
+        _run(args)
+    finally:
+        if args.timings:
+            for stage, t in sorted(STAGES.summary().items()):
+                print(f"{stage:20s} {t['seconds'] * 1000:10.1f} ms  ({t['count']:.0f}x)")
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.materialized import DEFAULT_PRODUCTIVITY, H_MAX, MATERIALIZED_DIR, materialize  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute growth and jobs forecasts into data/materialized/")
+    parser.add_argument("--horizon", type=int, default=H_MAX, help=f"longest horizon served from the store (default {H_MAX})")
+    parser.add_argument(
+        "--productivity", type=float, default=DEFAULT_PRODUCTIVITY, help="productivity growth the jobs rows assume"
+    )
+    parser.add_argument("--industries", nargs="+", default=[], help="recompute these even if their data is unchanged")
+    parser.add_argument("--full", action="store_true", help="ignore the current store and recompute every industry")
+    parser.add_argument("--out", type=Path, default=MATERIALIZED_DIR)
+    args = parser.parse_args()
+    out_dir, recomputed = materialize(set(args.industries), args.horizon, args.productivity, args.out, args.full)
+    print(f"Wrote {out_dir} ({len(recomputed)} industries recomputed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import growth  # noqa: E402
+from models.artifacts import ARTIFACT_DIR, write_artifacts  # noqa: E402
+from models.economy import economy_index  # noqa: E402
+
+
+def train(kinds: Optional[List[str]] = None, root: Path = ARTIFACT_DIR) -> Path:
+    """Fit every industry's growth models ahead of time and persist them."""
+    kinds = kinds or growth.enabled_kinds()
+    index = economy_index()
+    models: Dict[Tuple[str, str], Any] = {}
+    digests: Dict[str, str] = {}
+    for key in index.keys:
+        series = index.get(key)
+        if series is None or len(series.years) == 0:
+            continue
+        digests[key] = series.digest()
+        for kind in kinds:
+            model = growth.fit_model(kind, series.years, series.value_added)
+            if model is not None:
+                models[(key, kind)] = model
+    return write_artifacts(models, digests, index.digest, root)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Train growth models into data/models/")
+    parser.add_argument(
+        "--kinds",
+        nargs="+",
+        choices=sorted(growth.MODEL_WEIGHTS),
+        help="model kinds to fit (default: those enabled via ENABLE_PROPHET/ENABLE_ARIMA, plus rf)",
+    )
+    args = parser.parse_args()
+    out_dir = train(args.kinds)
+    print(f"Wrote model artifacts to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
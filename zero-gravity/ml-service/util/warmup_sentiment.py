@@ -0,0 +1,67 @@
+import argparse
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import Iterator, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models.backends import available  # noqa: E402
+from models.sentiment_engine import ENGINE  # noqa: E402
+
+
+def iter_texts(path: Path, field: str) -> Iterator[str]:
+    """Texts from a .jsonl (``field`` key), .csv (``field`` column) or plain-text file (one per line)."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.suffix == ".jsonl":
+            for line in f:
+                line = line.strip()
+                if line:
+                    text = json.loads(line).get(field)
+                    if text:
+                        yield str(text)
+        elif path.suffix == ".csv":
+            for row in csv.DictReader(f):
+                if row.get(field):
+                    yield row[field]
+        else:
+            for line in f:
+                if line.strip():
+                    yield line.rstrip("\n")
+
+
+def warmup(paths: List[Path], field: str = "text", chunk: int = 1024) -> int:
+    """Pre-score every text so later requests are served from the score cache."""
+    total = 0
+    batch: List[str] = []
+    for path in paths:
+        for text in iter_texts(path, field):
+            batch.append(text)
+            if len(batch) >= chunk:
+                ENGINE.score(batch)
+                total += len(batch)
+                batch = []
+    if batch:
+        ENGINE.score(batch)
+        total += len(batch)
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-score a text corpus into the sentiment score cache")
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("--field", default="text", help="JSONL key / CSV column holding the text")
+    parser.add_argument("--chunk", type=int, default=1024, help="texts handed to the engine per call")
+    args = parser.parse_args()
+    if not available("transformers"):
+        # the service scores with the lexicon then, so there is nothing to pre-score
+        print("transformers backend is disabled or not installed; nothing to warm")
+        return
+    n = warmup(args.paths, args.field, args.chunk)
+    stats = ENGINE.cache.stats()
+    print(f"Scored {n} texts ({stats['misses']} new, hit ratio {stats['hitRatio']:.2%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,17 @@ import { ML_URL } from '@/lib/config';
 export async function POST(req: NextRequest) {
   const body = await req.json();
   try {
+    const accept = req.headers.get('accept');
     const res = await fetch(`${ML_URL}/jobs`, {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers: { 'Content-Type': 'application/json', ...(accept ? { Accept: accept } : {}) },
       body: JSON.stringify(body),
       cache: 'no-store'
     });
     if (!res.ok) throw new Error(`Upstream status ${res.status}`);
-    const json = await res.json();
-    return NextResponse.json(json);
+    // Columnar JSON and Arrow bodies are relayed untouched instead of re-parsed
+    const contentType = res.headers.get('content-type') || 'application/json';
+    return new NextResponse(res.body, { headers: { 'Content-Type': contentType } });
   } catch (e) {
     const inds: string[] = Array.isArray(body?.industry_ids) && body.industry_ids.length ? body.industry_ids : ['manufacturing'];
     const now = 2023; const horizon: number = Number(body?.horizon_years) || 5;
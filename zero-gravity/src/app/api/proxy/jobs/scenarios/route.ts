@@ -0,0 +1,26 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { ML_URL } from '@/lib/config';
+
+export async function POST(req: NextRequest) {
+  const body = await req.json();
+  try {
+    const res = await fetch(`${ML_URL}/jobs/scenarios`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body),
+      cache: 'no-store'
+    });
+    // No synthetic fallback: bands are only meaningful from the real model, so
+    // upstream errors (including 429 + Retry-After) are relayed as-is
+    const retryAfter = res.headers.get('retry-after');
+    return new NextResponse(res.body, {
+      status: res.status,
+      headers: {
+        'Content-Type': res.headers.get('content-type') || 'application/json',
+        ...(retryAfter ? { 'Retry-After': retryAfter } : {}),
+      },
+    });
+  } catch (e) {
+    return NextResponse.json({ detail: 'ML service unavailable' }, { status: 502 });
+  }
+}
@@ -20,7 +20,7 @@ export default function JobsPage() {
     setLoading(true); setError(null);
     try {
       const res = await fetch('/api/proxy/jobs', { method: 'POST', headers: {'Content-Type':'application/json'}, body: JSON.stringify({ industry_ids: industries, horizon_years: horizon, productivity_growth: prod }) });
-      const json = await res.json();
+      const json: JobsResponse = await res.json();
       setData(json);
     } catch (e: any) {
       setError(e?.message || 'Failed');
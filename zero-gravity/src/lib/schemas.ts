@@ -5,6 +5,7 @@ export type GrowthItem = {
   lower: number[];
   upper: number[];
   modelWeights: Record<string, number>;
+  tier?: 'fast';
 };
 
 export type GrowthResponse = { items: GrowthItem[] };
@@ -21,8 +22,73 @@ export type JobsItem = {
 export type JobsGeo = { state: string; industry_id: string; year: number; employment_total: number };
 export type JobsResponse = { items: JobsItem[]; geo: JobsGeo[] };
 
-export type SentimentItem = { industry_id: string; period: string; sentiment: number };
-export type SentimentCorrelations = Record<string, { current: number; bestLag: number; corrAtBestLag: number }>;
+// Opt-in `format: 'columnar'` shape of /jobs: parallel arrays whose
+// industry/year/state entries index into the dictionaries at the top level.
+export type JobsColumnarResponse = {
+  format: 'columnar';
+  industries: string[];
+  years: number[];
+  states: string[];
+  items: {
+    industry: number[];
+    year: number[];
+    employment_direct: number[];
+    employment_indirect: number[];
+    employment_induced: number[];
+    employment_total: number[];
+  };
+  geo: { industry: number[]; year: number[]; state: number[]; employment_total: number[] };
+};
+
+// stdev/documents are only present when the service reads a real corpus (SENTIMENT_CORPUS)
+export type SentimentItem = { industry_id: string; period: string; sentiment: number; stdev?: number; documents?: number };
+export type SentimentLag = { lag: number; corr: number | null; pValue: number | null; ciLower: number | null; ciUpper: number | null };
+export type SentimentCorrelations = Record<string, {
+  current: number;
+  bestLag: number;
+  corrAtBestLag: number;
+  pValue?: number | null;
+  pValueAtBestLag?: number | null;
+  lags?: SentimentLag[];
+}>;
 export type SentimentResponse = { items: SentimentItem[]; correlations: SentimentCorrelations };
 
 
+
+// POST /batch: each section is optional and takes its endpoint's request fields
+export type BatchRequest = {
+  growth?: { industry_ids: string[]; horizon_years?: number; tier?: 'full' | 'fast' };
+  jobs?: { industry_ids: string[]; horizon_years?: number; productivity_growth?: number; format?: 'records' | 'columnar' };
+  sentiment?: { industry_ids: string[]; window?: string; lag_max?: number };
+};
+export type BatchResponse = {
+  growth?: GrowthResponse;
+  jobs?: JobsResponse | JobsColumnarResponse;
+  sentiment?: SentimentResponse;
+};
+
+// POST /jobs/scenarios: Monte Carlo bands keyed by quantile ("p5", "p50", "p95" by default)
+export type ScenarioRequest = {
+  industry_ids: string[];
+  horizon_years?: number;
+  samples?: number;
+  seed?: number;
+  productivity_growth?: number;
+  productivity_sd?: number;
+  ratio_sd?: number;
+  indirect_sd?: number;
+  induced_sd?: number;
+  quantiles?: number[];
+};
+// Same dictionary-coded layout as JobsColumnarResponse, one array per band
+export type Bands = Record<string, number[]>;
+export type ScenarioResponse = {
+  format: 'columnar';
+  samples: number;
+  quantiles: number[];
+  industries: string[];
+  years: number[];
+  states: string[];
+  items: { industry: number[]; year: number[]; employment_direct: Bands; employment_total: Bands };
+  geo: { industry: number[]; year: number[]; state: number[]; employment_total: Bands };
+};